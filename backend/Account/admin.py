@@ -4,7 +4,8 @@ from django.contrib.auth.forms import ReadOnlyPasswordHashField
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group
-from .models import User
+from django.utils import timezone
+from .models import OutboxEmail, User
 
 
 class UserCreationForm(forms.ModelForm):
@@ -80,6 +81,24 @@ class UserAdmin(BaseUserAdmin):
     # list_filter = ["is_active", "is_staff"]
 
 
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ["subject", "to", "status", "attempts", "next_attempt_at"]
+    list_filter = ["status"]
+    search_fields = ["subject", "to"]
+    readonly_fields = ["attempts", "last_error", "sent_date"]
+    actions = ["requeue"]
+
+    @admin.action(description="Requeue selected emails")
+    def requeue(self, request, queryset):
+        queryset.exclude(status=OutboxEmail.Status.SENT).update(
+            status=OutboxEmail.Status.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+            claim="",
+        )
+
+
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
 # Now register the new UserAdmin...
 admin.site.register(User, UserAdmin)
 # ... and, since we're not using Django's built-in permissions,
@@ -1,11 +1,15 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import authenticate
 from drf_recaptcha.fields import ReCaptchaV2Field
 
-
 User = get_user_model()
 
 
@@ -75,6 +79,18 @@ class CustomAuthTokenSerializer(serializers.Serializer):
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     email = serializers.EmailField()
 
+    @classmethod
+    def get_token(cls, user):
+        """
+        Add the claims `StatelessJWTAuthentication` authenticates with.
+        """
+        token = super().get_token(user)
+        token["email"] = user.email
+        token["is_active"] = user.is_active
+        token["is_verified"] = user.is_verified
+        token["token_version"] = user.token_version
+        return token
+
     def validate(self, attrs):
         data = super().validate(attrs)
 
@@ -84,6 +100,39 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Issue access tokens with the user's current claims.
+
+    The default serializer copies the claims of the refresh token, which
+    may be outdated. Refresh tokens issued before the user's current
+    `token_version` are rejected.
+    """
+
+    default_error_messages = {
+        "no_active_account": "No active account found for the given token.",
+        "token_revoked": "Token has been revoked.",
+    }
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.get(api_settings.USER_ID_CLAIM)
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+        version = refresh.get("token_version")
+        if version is not None and version != user.token_version:
+            raise AuthenticationFailed(
+                self.error_messages["token_revoked"], "token_revoked"
+            )
+        token = CustomTokenObtainPairSerializer.get_token(user)
+        return {"access": str(token.access_token)}
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     """
     Serializer for changing user password.
@@ -1,10 +1,30 @@
+import re
+import threading
 import pytest
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+from django.core import mail
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import Client
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory
 from rest_framework.response import Response
-from Account.models import User
+from django.template import Engine, Template, loader
+from Account.forms import CustomPasswordResetForm
+from Account.mail import PASSWORD_RESET_EMAIL, VERIFICATION_EMAIL
+from Account.api.v1.throttles import IPSlidingWindowThrottle
+from Account.models import OutboxEmail, User
+from Account.outbox import claim_emails, enqueue_email, send_queued_emails
+from Account.tokens import TokenGenerator
 from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.tokens import AccessToken
+from jwt.exceptions import ExpiredSignatureError
 
 
 @pytest.fixture
@@ -124,3 +144,591 @@ class TestAccount:
         data = {"email": "test@example.com"}
         response: Response = api_client.post(url, data=data)
         assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestCachedAuthentication:
+    @pytest.fixture
+    def token(self, verified_user: User) -> Token:
+        return Token.objects.create(user=verified_user)
+
+    def user_queries(self, captured) -> int:
+        return sum(
+            '"Account_user"' in query["sql"] or "authtoken" in query["sql"]
+            for query in captured
+        )
+
+    def test_token_lookups_are_cached(
+        self,
+        api_client: APIClient,
+        token: Token,
+        django_assert_max_num_queries,
+    ):
+        url = reverse("ToDo:tasks-list")
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+        with django_assert_max_num_queries(10) as captured:
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert self.user_queries(captured) == 0
+
+    def test_logout_invalidates_token(
+        self, api_client: APIClient, token: Token
+    ):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        response = api_client.get(reverse("ToDo:tasks-list"))
+        assert response.status_code == status.HTTP_200_OK
+        response = api_client.post(reverse("Account:API:token-logout"))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        response = api_client.get(reverse("ToDo:tasks-list"))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_user_changes_invalidate_cached_user(
+        self, api_client: APIClient, token: Token, verified_user: User
+    ):
+        url = reverse("ToDo:tasks-list")
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+        verified_user.is_verified = False
+        verified_user.save()
+        assert api_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+        verified_user.is_active = False
+        verified_user.save()
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.data["detail"] == "User inactive or deleted."
+
+    def test_session_user_is_cached(
+        self, api_client: APIClient, verified_user: User
+    ):
+        url = reverse("ToDo:tasks-list")
+        api_client.force_login(verified_user)
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+        with CaptureQueriesContext(connection) as captured:
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(captured.captured_queries) == 0
+
+    def test_password_change_ends_sessions(
+        self, api_client: APIClient, verified_user: User
+    ):
+        url = reverse("ToDo:tasks-list")
+        api_client.force_login(verified_user)
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+        verified_user.set_password("new_pass@1234*")
+        verified_user.save()
+        assert api_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestStatelessJWTAuthentication:
+    def obtain(self, api_client: APIClient) -> dict:
+        url = reverse("Account:API:jwt-create")
+        data = {"email": "test@example.com", "password": "pass@1234*"}
+        response = api_client.post(url, data=data)
+        assert response.status_code == status.HTTP_200_OK
+        return response.data
+
+    def authenticate(self, api_client: APIClient, access: str):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_requests_run_without_auth_queries(
+        self,
+        api_client: APIClient,
+        verified_user: User,
+        django_assert_num_queries,
+    ):
+        self.authenticate(api_client, self.obtain(api_client)["access"])
+        url = reverse("ToDo:tasks-list")
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+        with django_assert_num_queries(0):
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_lazy_user_loads_the_user_when_needed(
+        self, api_client: APIClient, verified_user: User
+    ):
+        self.authenticate(api_client, self.obtain(api_client)["access"])
+        url = reverse("Account:API:change-password")
+        data = {
+            "old_password": "pass@1234*",
+            "new_password": "new_pass@1234*",
+            "new_password1": "new_pass@1234*",
+        }
+        response = api_client.post(url, data=data)
+        assert response.status_code == status.HTTP_200_OK
+        verified_user.refresh_from_db()
+        assert verified_user.check_password("new_pass@1234*")
+
+    def test_password_change_revokes_tokens(
+        self, api_client: APIClient, verified_user: User
+    ):
+        tokens = self.obtain(api_client)
+        self.authenticate(api_client, tokens["access"])
+        verified_user.set_password("new_pass@1234*")
+        verified_user.save()
+        response = api_client.get(reverse("ToDo:tasks-list"))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        api_client.credentials()
+        url = reverse("Account:API:jwt-refresh")
+        response = api_client.post(url, {"refresh": tokens["refresh"]})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_verification_change_revokes_tokens(
+        self, api_client: APIClient, verified_user: User
+    ):
+        self.authenticate(api_client, self.obtain(api_client)["access"])
+        verified_user.is_verified = False
+        verified_user.save()
+        response = api_client.get(reverse("ToDo:tasks-list"))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_unrelated_changes_keep_tokens(
+        self, api_client: APIClient, verified_user: User
+    ):
+        self.authenticate(api_client, self.obtain(api_client)["access"])
+        user = User.objects.get(pk=verified_user.pk)
+        user.email = "changed@example.com"
+        user.save()
+        user.save(update_fields=["last_login"])
+        response = api_client.get(reverse("ToDo:tasks-list"))
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_refresh_issues_current_claims(
+        self, api_client: APIClient, verified_user: User
+    ):
+        tokens = self.obtain(api_client)
+        verified_user.email = "changed@example.com"
+        verified_user.save()
+        url = reverse("Account:API:jwt-refresh")
+        response = api_client.post(url, {"refresh": tokens["refresh"]})
+        assert response.status_code == status.HTTP_200_OK
+        access = AccessToken(response.data["access"])
+        assert access["email"] == "changed@example.com"
+        assert access["is_verified"] is True
+        assert access["token_version"] == verified_user.token_version
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+    def test_views_only_enqueue(
+        self, api_client: APIClient, unverified_user: User
+    ):
+        url = reverse("Account:API:verification-resend")
+        response = api_client.post(url, {"email": "test@example.com"})
+        assert response.status_code == status.HTTP_200_OK
+        assert mail.outbox == []
+        email = OutboxEmail.objects.get()
+        assert email.to == ["test@example.com"]
+        assert email.status == OutboxEmail.Status.PENDING
+
+    def test_worker_sends_over_one_connection(self, monkeypatch):
+        for i in range(3):
+            enqueue_email(f"Subject {i}", "Body", [f"user{i}@example.com"])
+        opened = []
+        monkeypatch.setattr(
+            "django.core.mail.backends.locmem.EmailBackend.open",
+            lambda backend: opened.append(backend),
+        )
+        call_command("send_queued_emails", stdout=StringIO())
+        assert len(mail.outbox) == 3
+        assert len(opened) == 1
+        assert not OutboxEmail.objects.exclude(
+            status=OutboxEmail.Status.SENT
+        ).exists()
+
+    def test_failures_are_retried_then_dead_lettered(self, monkeypatch):
+        email = enqueue_email("Subject", "Body", ["user@example.com"])
+
+        def fail(backend, messages):
+            raise ConnectionRefusedError("smtp down")
+
+        monkeypatch.setattr(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            fail,
+        )
+        assert send_queued_emails(max_attempts=2) == (0, 1)
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Status.PENDING
+        assert email.attempts == 1
+        assert "smtp down" in email.last_error
+        assert email.next_attempt_at > timezone.now()
+
+        assert send_queued_emails(max_attempts=2) == (0, 0)
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        assert send_queued_emails(max_attempts=2) == (0, 1)
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Status.FAILED
+        assert email.attempts == 2
+
+    def test_outcome_is_only_recorded_under_the_claim(self, monkeypatch):
+        enqueue_email("Subject", "Body", ["user@example.com"])
+        send_messages = mail.backends.locmem.EmailBackend.send_messages
+
+        def reclaimed(backend, messages):
+            # Another worker claimed the email after this one's claim
+            # expired.
+            OutboxEmail.objects.update(claim="other")
+            return send_messages(backend, messages)
+
+        monkeypatch.setattr(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            reclaimed,
+        )
+        assert send_queued_emails() == (1, 0)
+        email = OutboxEmail.objects.get()
+        assert email.status == OutboxEmail.Status.PENDING
+        assert email.claim == "other"
+
+    def test_expired_claims_are_not_sent(self, settings):
+        settings.EMAIL_OUTBOX_CLAIM_TIMEOUT = timedelta(seconds=-1)
+        enqueue_email("Subject", "Body", ["user@example.com"])
+        assert send_queued_emails() == (0, 0)
+        assert mail.outbox == []
+        email = OutboxEmail.objects.get()
+        assert email.status == OutboxEmail.Status.PENDING
+        assert email.attempts == 0
+
+    def test_claimed_emails_are_skipped(self):
+        enqueue_email("Subject", "Body", ["user@example.com"])
+        assert len(claim_emails(10)) == 1
+        assert claim_emails(10) == []
+
+    def test_password_reset_form_enqueues(self, verified_user: User):
+        form = CustomPasswordResetForm({"email": "test@example.com"})
+        assert form.is_valid()
+        form.save(
+            domain_override="example.com",
+            email_template_name="Account/password_reset_email.html",
+            subject_template_name="Account/password_reset_subject.txt",
+        )
+        assert mail.outbox == []
+        assert OutboxEmail.objects.get().to == ["test@example.com"]
+
+
+@pytest.mark.django_db
+class TestAccountEmails:
+    @pytest.fixture(autouse=True)
+    def fixed_token(self, monkeypatch):
+        monkeypatch.setattr(
+            "Account.mail.TokenGenerator.make_token",
+            lambda user, purpose: "token",
+        )
+
+    def test_render_matches_template(self, verified_user: User):
+        context = {
+            "domain": "example.com",
+            "site_name": "example.com",
+            "protocol": "http",
+            "token": "token",
+            "using_api": True,
+        }
+        expected = loader.render_to_string(
+            "Account/password_reset_email.html", context
+        )
+        body = PASSWORD_RESET_EMAIL.render(
+            verified_user, ("example.com", "example.com"), using_api=True
+        )
+        assert body == expected
+        assert "/token/" in body
+
+    def test_templates_are_compiled_once(self, monkeypatch, verified_user):
+        for template_loader in Engine.get_default().template_loaders:
+            template_loader.reset()
+        compiled = []
+        compile_nodelist = Template.compile_nodelist
+
+        def compile_and_record(template):
+            compiled.append(template.origin.template_name)
+            return compile_nodelist(template)
+
+        monkeypatch.setattr(Template, "compile_nodelist", compile_and_record)
+        site = ("example.com", "example.com")
+        VERIFICATION_EMAIL.render(verified_user, site)
+        VERIFICATION_EMAIL.render_many([verified_user] * 3, site)
+        assert compiled == ["Account/verification_email.html"]
+
+    def test_send_many_enqueues_in_one_query(self):
+        users = [
+            User.objects.create_user(
+                email=f"user{i}@example.com", password="pass@1234*"
+            )
+            for i in range(3)
+        ]
+        site = ("example.com", "example.com")
+        with CaptureQueriesContext(connection) as queries:
+            VERIFICATION_EMAIL.send_many(users, site)
+        assert len(queries) == 1
+        emails = OutboxEmail.objects.order_by("pk")
+        assert [email.to for email in emails] == [
+            [user.email] for user in users
+        ]
+        assert all(
+            email.subject == VERIFICATION_EMAIL.subject for email in emails
+        )
+
+
+@pytest.mark.django_db
+class TestAccountTokens:
+    def test_signed_token(self, verified_user: User):
+        token = TokenGenerator.make_token(verified_user, "password_reset")
+        assert token.startswith(f"{verified_user.pk}.password_reset.0:")
+        user_id = TokenGenerator.check_token(token, "password_reset")
+        assert user_id == verified_user.pk
+
+    def test_reset_token_only_works_once(self, verified_user: User):
+        token = TokenGenerator.make_token(verified_user, "password_reset")
+        verification = TokenGenerator.make_token(verified_user)
+        verified_user.set_password("new@pass1234*")
+        verified_user.save()
+        with pytest.raises(ValueError):
+            TokenGenerator.check_token(token, "password_reset")
+        assert TokenGenerator.check_token(verification) == verified_user.pk
+
+    def test_signed_token_is_bound_to_its_purpose(
+        self, api_client: APIClient, unverified_user: User
+    ):
+        token = TokenGenerator.make_token(unverified_user, "password_reset")
+        with pytest.raises(ValueError):
+            TokenGenerator.check_token(token, "verification")
+
+        url = reverse("Account:API:verification-confirm", args=[token])
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        unverified_user.refresh_from_db()
+        assert not unverified_user.is_verified
+
+    def test_html_password_reset_flow(self, unverified_user: User):
+        browser = Client()
+        response = browser.post(
+            reverse("Account:reset-password"), {"email": unverified_user.email}
+        )
+        assert response.status_code == 302
+        body = OutboxEmail.objects.get().body
+        token = re.search(r"/reset-password/confirm/([^/]+)/", body)[1]
+        url = reverse("Account:reset-password-confirm", args=[token])
+
+        # The link only works for resetting the password.
+        verify_url = reverse("Account:verification-confirm", args=[token])
+        assert "error" in browser.get(verify_url).context
+        unverified_user.refresh_from_db()
+        assert not unverified_user.is_verified
+
+        response = browser.get(url)
+        assert "error" not in response.context
+        assert response.context["user_id"] == unverified_user.pk
+
+        data = {
+            "user_id": unverified_user.pk,
+            "new_password1": "new@pass1234*",
+            "new_password2": "new@pass1234*",
+        }
+        other = User.objects.create_user(
+            email="other@example.com", password="pass@1234*"
+        )
+        response = browser.post(url, {**data, "user_id": other.pk})
+        assert response.status_code == 200
+        other.refresh_from_db()
+        assert other.check_password("pass@1234*")
+
+        response = browser.post(url, data)
+        assert response.status_code == 302
+        assert response.url == reverse("Account:reset-password-complete")
+        unverified_user.refresh_from_db()
+        assert unverified_user.check_password("new@pass1234*")
+
+        # The link cannot be used again.
+        assert "error" in browser.get(url).context
+        response = browser.post(
+            url,
+            {
+                **data,
+                "new_password1": "other@pass1234*",
+                "new_password2": "other@pass1234*",
+            },
+        )
+        assert response.status_code == 200
+        unverified_user.refresh_from_db()
+        assert unverified_user.check_password("new@pass1234*")
+
+    def test_tampered_and_expired_tokens(self, settings, verified_user):
+        token = TokenGenerator.make_token(verified_user)
+        user_id, rest = token.split(".", 1)
+        with pytest.raises(ValueError):
+            TokenGenerator.check_token(f"{int(user_id) + 1}.{rest}")
+
+        settings.ACCOUNT_TOKEN_MAX_AGE = timedelta(seconds=-1)
+        with pytest.raises(ExpiredSignatureError):
+            TokenGenerator.check_token(token)
+
+    def test_jwe_tokens_are_accepted_during_migration(
+        self, settings, api_client: APIClient, unverified_user: User
+    ):
+        settings.ACCOUNT_TOKEN_FORMAT = "jwe"
+        token = TokenGenerator.make_token(unverified_user)
+        settings.ACCOUNT_TOKEN_FORMAT = "signed"
+
+        url = reverse("Account:API:verification-confirm", args=[token])
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        unverified_user.refresh_from_db()
+        assert unverified_user.is_verified
+
+        settings.ACCOUNT_TOKEN_ACCEPT_JWE = False
+        with pytest.raises(ValueError):
+            TokenGenerator.check_token(token)
+
+
+@pytest.mark.django_db
+class TestAuthThrottling:
+    def test_password_reset_is_throttled_per_email(
+        self, api_client: APIClient, verified_user: User
+    ):
+        url = reverse("Account:API:reset-password")
+        for _ in range(5):
+            response = api_client.post(url, {"email": "test@example.com"})
+            assert response.status_code == status.HTTP_200_OK
+
+        response = api_client.post(url, {"email": " Test@example.com"})
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response.headers["Retry-After"]) > 0
+        assert OutboxEmail.objects.count() == 5
+
+        # Other addresses are counted separately.
+        response = api_client.post(url, {"email": "other@example.com"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_login_is_rejected_before_hashing(
+        self, api_client: APIClient, verified_user: User, monkeypatch
+    ):
+        checked = []
+        check_password = User.check_password
+        monkeypatch.setattr(
+            User,
+            "check_password",
+            lambda user, raw: checked.append(raw) or check_password(user, raw),
+        )
+        # Slow hashing must not let the window slide between requests.
+        monkeypatch.setattr(
+            "Account.api.v1.throttles.SlidingWindowThrottle.timer",
+            lambda throttle: 1000.0,
+        )
+        url = reverse("Account:API:token-login")
+        data = {"email": "test@example.com", "password": "wrong"}
+        for _ in range(10):
+            response = api_client.post(url, data)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = api_client.post(url, data)
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert len(checked) == 10
+
+    def test_window_slides(self, settings, api_client: APIClient, monkeypatch):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"registration.ip": "2/min"},
+        }
+        now = [1020.0]
+        monkeypatch.setattr(
+            "Account.api.v1.throttles.SlidingWindowThrottle.timer",
+            lambda throttle: now[0],
+        )
+        url = reverse("Account:API:token-registeration")
+        for _ in range(2):
+            response = api_client.post(url, {})
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = api_client.post(url, {})
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.headers["Retry-After"] == "90"
+
+        # Half of the previous window is still weighted in.
+        now[0] += 90
+        response = api_client.post(url, {})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = api_client.post(url, {})
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_concurrent_requests_share_the_limit(self, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"login.ip": "5/min"},
+        }
+        request = APIRequestFactory().post("/", REMOTE_ADDR="10.0.0.1")
+        view = SimpleNamespace(throttle_scope="login")
+        barrier = threading.Barrier(20)
+        allowed = []
+
+        def attempt():
+            throttle = IPSlidingWindowThrottle()
+            barrier.wait()
+            allowed.append(throttle.allow_request(request, view))
+
+        threads = [threading.Thread(target=attempt) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert allowed.count(True) == 5
+
+    def test_forwarded_for_is_not_trusted(self, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"login.ip": "2/min"},
+        }
+        view = SimpleNamespace(throttle_scope="login")
+        allowed = []
+        for i in range(3):
+            request = APIRequestFactory().post(
+                "/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=f"1.2.3.{i}"
+            )
+            throttle = IPSlidingWindowThrottle()
+            allowed.append(throttle.allow_request(request, view))
+        assert allowed == [True, True, False]
+
+    def test_zero_rate_is_rejected(self, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"login.ip": "0/min"},
+        }
+        request = APIRequestFactory().post("/")
+        view = SimpleNamespace(throttle_scope="login")
+        with pytest.raises(ImproperlyConfigured):
+            IPSlidingWindowThrottle().allow_request(request, view)
+
+
+@pytest.mark.django_db
+class TestPasswordHashing:
+    def test_login_upgrades_hash_without_revoking_tokens(
+        self, settings, api_client: APIClient
+    ):
+        settings.PASSWORD_PBKDF2_ITERATIONS = 1000
+        user = User.objects.create_user(
+            email="test@example.com", password="pass@1234*", is_verified=True
+        )
+        assert user.password.startswith("pbkdf2_sha256$1000$")
+        token_version = user.token_version
+
+        settings.PASSWORD_PBKDF2_ITERATIONS = 2000
+        url = reverse("Account:API:token-login")
+        data = {"email": "test@example.com", "password": "pass@1234*"}
+        response = api_client.post(url, data)
+        assert response.status_code == status.HTTP_200_OK
+
+        user.refresh_from_db()
+        assert user.password.startswith("pbkdf2_sha256$2000$")
+        assert user.token_version == token_version
+        assert user.check_password("pass@1234*")
+
+    def test_scrypt_hasher(self, settings):
+        settings.PASSWORD_HASHERS = [
+            "Account.hashers.TunedScryptPasswordHasher",
+            "Account.hashers.TunedPBKDF2PasswordHasher",
+        ]
+        settings.PASSWORD_SCRYPT_WORK_FACTOR = 2**10
+        user = User.objects.create_user(
+            email="test@example.com", password="pass@1234*"
+        )
+        assert user.password.startswith("scrypt$1024$")
+        assert user.check_password("pass@1234*")
+        assert not user.check_password("wrong")
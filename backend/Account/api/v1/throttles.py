@@ -0,0 +1,170 @@
+import math
+from hashlib import sha256
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Sliding window throttle configured per view.
+
+    Views set `throttle_scope` and the rate is looked up in
+    `DEFAULT_THROTTLE_RATES` under `<throttle_scope>.<kind>`, for example
+    `"password_reset.email": "5/hour"`. Views or kinds without a rate are
+    not throttled.
+
+    Requests are counted per fixed window of the rate's period with
+    atomic cache increments, so concurrent requests cannot all pass on
+    the same count. A request is allowed while the count of the current
+    window plus the count of the previous one, weighted by how much of
+    it still overlaps the sliding window, stays within the limit. This
+    avoids the double burst of plain fixed windows at their boundaries.
+    Rejected requests are not counted.
+
+    This replaces a token bucket: refilling a bucket reads and writes its
+    state in one step, which Django's cache API, lacking compare-and-set,
+    cannot do atomically on every backend. The sliding window only needs
+    `incr()`, and like a bucket it spreads the allowance over the period
+    instead of resetting it at once.
+
+    Throttles run before the view handler, so throttled requests are
+    rejected with 429 before any password hashing or email rendering.
+    """
+
+    scope_attr = "throttle_scope"
+    kind = None
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def __init__(self):
+        # The rate depends on the view, see allow_request().
+        self.wait_time = None
+
+    def parse_rate(self, rate):
+        num_requests, duration = super().parse_rate(rate)
+        if num_requests < 1:
+            raise ImproperlyConfigured(
+                f"Throttle rate {rate!r} of {self.scope!r} must allow at "
+                "least one request."
+            )
+        return num_requests, duration
+
+    def allow_request(self, request, view):
+        scope = getattr(view, self.scope_attr, None)
+        if not scope:
+            return True
+        self.scope = f"{scope}.{self.kind}"
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        window, elapsed = divmod(self.timer() / self.duration, 1)
+        current_key = f"{key}:{int(window)}"
+        count = self.increment(current_key)
+        previous = cache.get(f"{key}:{int(window) - 1}", 0)
+        if previous * (1 - elapsed) + count <= self.num_requests:
+            return True
+
+        try:
+            cache.decr(current_key)
+        except ValueError:
+            pass
+        self.wait_time = self.get_wait_time(count - 1, previous, elapsed)
+        return False
+
+    def increment(self, key) -> int:
+        # A window is still weighted in during the next one.
+        timeout = math.ceil(self.duration * 2)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            if cache.add(key, 1, timeout):
+                return 1
+            return cache.incr(key)
+
+    def get_wait_time(self, count, previous, elapsed) -> float:
+        """
+        Return the seconds until a request fits again, given the `count`
+        requests allowed in the current window so far.
+        """
+        limit = self.num_requests - 1
+        if count <= limit:
+            # The previous window has to slide further out.
+            overlap = (limit - count) / previous
+            return (1 - overlap - elapsed) * self.duration
+        # Only the next window, where this one is weighted in, has room.
+        return (2 - limit / count - elapsed) * self.duration
+
+    def wait(self):
+        return self.wait_time
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_throttle_ident(request),
+        }
+
+    def get_throttle_ident(self, request):
+        raise NotImplementedError(".get_throttle_ident() must be overridden")
+
+
+class IPSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    Throttles requests per client IP address.
+    """
+
+    kind = "ip"
+
+    def get_throttle_ident(self, request):
+        return self.get_ident(request)
+
+
+class EmailSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    Throttles requests per `email` in the request data, so that a single
+    address cannot be flooded from many IP addresses.
+    """
+
+    kind = "email"
+
+    def get_cache_key(self, request, view):
+        data = request.data
+        email = data.get("email") if hasattr(data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return super().get_cache_key(request, view)
+
+    def get_throttle_ident(self, request):
+        email = request.data["email"].strip().lower()
+        # Keep email addresses out of the cache keys.
+        return sha256(email.encode()).hexdigest()
+
+
+class UserSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    Throttles requests per authenticated user.
+    """
+
+    kind = "user"
+
+    def get_cache_key(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return None
+        return super().get_cache_key(request, view)
+
+    def get_throttle_ident(self, request):
+        return request.user.pk
+
+
+AUTH_THROTTLE_CLASSES = [
+    IPSlidingWindowThrottle,
+    EmailSlidingWindowThrottle,
+    UserSlidingWindowThrottle,
+]
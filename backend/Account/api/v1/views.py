@@ -6,12 +6,11 @@ from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework_simplejwt.views import TokenObtainPairView
-from django.contrib.sites.shortcuts import get_current_site
 from django.contrib.auth import get_user_model
-from django.template import loader
-from django.core.mail import EmailMessage
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
+from Account.mail import VERIFICATION_EMAIL, PASSWORD_RESET_EMAIL
 from Account.tokens import TokenGenerator
+from .throttles import AUTH_THROTTLE_CLASSES
 from .serializers import (
     RegistrationSerializer,
     CustomTokenObtainPairSerializer,
@@ -25,6 +24,8 @@ from .serializers import (
 
 class RegistrationView(GenericAPIView):
     serializer_class = RegistrationSerializer
+    throttle_classes = AUTH_THROTTLE_CLASSES
+    throttle_scope = "registration"
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -32,21 +33,7 @@ class RegistrationView(GenericAPIView):
         user = serializer.save()
         token, _ = Token.objects.get_or_create(user=user)
 
-        # Send verification email
-        subject = "ToDoApp: Verify Account"
-        template_name = "Account/verification_email.html"
-        current_site = get_current_site(request)
-        site_name = current_site.name
-        domain = current_site.domain
-        context = {
-            "domain": domain,
-            "site_name": site_name,
-            "protocol": "http",
-            "token": TokenGenerator.make_token(user),
-        }
-        body = loader.render_to_string(template_name, context)
-        email = EmailMessage(subject, body, None, [user.email])
-        email.send()
+        VERIFICATION_EMAIL.send(user, request)
 
         data = {"email": user.email, "token": token.key}
 
@@ -59,6 +46,8 @@ class CustomAuthToken(ObtainAuthToken):
     """
 
     serializer_class = CustomAuthTokenSerializer
+    throttle_classes = AUTH_THROTTLE_CLASSES
+    throttle_scope = "login"
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(
@@ -94,6 +83,8 @@ class LogoutView(APIView):
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = AUTH_THROTTLE_CLASSES
+    throttle_scope = "login"
 
 
 class ChangePasswordAPIView(GenericAPIView):
@@ -103,6 +94,8 @@ class ChangePasswordAPIView(GenericAPIView):
 
     permission_classes = [IsAuthenticated]
     serializer_class = ChangePasswordSerializer
+    throttle_classes = AUTH_THROTTLE_CLASSES
+    throttle_scope = "change_password"
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -118,28 +111,15 @@ class ChangePasswordAPIView(GenericAPIView):
 
 class VerificationResendAPIView(GenericAPIView):
     serializer_class = VerificationResendSerializer
+    throttle_classes = AUTH_THROTTLE_CLASSES
+    throttle_scope = "verification_resend"
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
 
-        # Send verification email
-        subject = "ToDoApp: Verify Account"
-        template_name = "Account/verification_email.html"
-        current_site = get_current_site(request)
-        site_name = current_site.name
-        domain = current_site.domain
-        context = {
-            "domain": domain,
-            "site_name": site_name,
-            "protocol": "http",
-            "token": TokenGenerator.make_token(user),
-            "using_api": True,
-        }
-        body = loader.render_to_string(template_name, context)
-        email = EmailMessage(subject, body, None, [user.email])
-        email.send()
+        VERIFICATION_EMAIL.send(user, request, using_api=True)
         return Response(
             {"details": "Verification email sent."}, status=status.HTTP_200_OK
         )
@@ -147,28 +127,15 @@ class VerificationResendAPIView(GenericAPIView):
 
 class PasswordResetAPIView(GenericAPIView):
     serializer_class = PasswordResetSerializer
+    throttle_classes = AUTH_THROTTLE_CLASSES
+    throttle_scope = "password_reset"
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
 
-        # Send password reset email
-        subject = "ToDoApp: Password Reset"
-        template_name = "Account/password_reset_email.html"
-        current_site = get_current_site(request)
-        site_name = current_site.name
-        domain = current_site.domain
-        context = {
-            "domain": domain,
-            "site_name": site_name,
-            "protocol": "http",
-            "token": TokenGenerator.make_token(user),
-            "using_api": True,
-        }
-        body = loader.render_to_string(template_name, context)
-        email = EmailMessage(subject, body, None, [user.email])
-        email.send()
+        PASSWORD_RESET_EMAIL.send(user, request, using_api=True)
         return Response(
             {"details": "Password reset email sent."},
             status=status.HTTP_200_OK,
@@ -182,7 +149,7 @@ class VerificationConfirmAPIView(APIView):
 
     def get(self, request, token, *args, **kwargs):
         try:
-            user_id = TokenGenerator.check_token(token)
+            user_id = TokenGenerator.check_token(token, "verification")
         except ValueError:
             return Response(
                 {"details": "Invalid token."},
@@ -226,7 +193,7 @@ class PasswordResetConfirmAPIView(GenericAPIView):
 
     def post(self, request, token, *args, **kwargs):
         try:
-            user_id = TokenGenerator.check_token(token)
+            user_id = TokenGenerator.check_token(token, "password_reset")
         except ValueError:
             return Response(
                 {"details": "Invalid token."},
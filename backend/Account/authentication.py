@@ -0,0 +1,173 @@
+from asgiref.sync import sync_to_async
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from .cache import (
+    aget_cached_token_user_id,
+    aget_cached_token_version,
+    aget_cached_user,
+    get_cached_token_user_id,
+    get_cached_token_version,
+    get_cached_user,
+)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    `TokenAuthentication` resolving tokens and users through the cache.
+
+    A request with a known token costs no query. Cached entries are
+    dropped when the token is deleted (logout) or the user is saved.
+
+    `aauthenticate()` authenticates a plain `HttpRequest` in async views.
+    """
+
+    def authenticate_credentials(self, key):
+        user_id = get_cached_token_user_id(key)
+        user = None if user_id is None else get_cached_user(user_id)
+        return self.check_credentials(key, user)
+
+    async def aauthenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) == 1:
+            msg = _("Invalid token header. No credentials provided.")
+            raise exceptions.AuthenticationFailed(msg)
+        elif len(auth) > 2:
+            msg = _(
+                "Invalid token header. Token string should not contain spaces."
+            )
+            raise exceptions.AuthenticationFailed(msg)
+
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            msg = _(
+                "Invalid token header. Token string should not contain "
+                "invalid characters."
+            )
+            raise exceptions.AuthenticationFailed(msg)
+
+        user_id = await aget_cached_token_user_id(key)
+        user = None if user_id is None else await aget_cached_user(user_id)
+        return self.check_credentials(key, user)
+
+    def check_credentials(self, key, user):
+        if user is None:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _("User inactive or deleted.")
+            )
+
+        token = self.get_model()(key=key, user=user)
+        return (user, token)
+
+
+class TokenClaimsUser(SimpleLazyObject):
+    """
+    Lazy user answering from the claims of a validated access token.
+
+    `pk`, `id`, `email`, `is_active` and `is_verified` are read from the
+    token. Anything else loads the actual user (through the user cache)
+    and is delegated to it, so the object can be used like a User.
+    """
+
+    def __init__(self, token):
+        user_id = token[api_settings.USER_ID_CLAIM]
+        super().__init__(lambda: get_cached_user(user_id))
+        self.__dict__["token"] = token
+
+    @property
+    def pk(self):
+        return self.token[api_settings.USER_ID_CLAIM]
+
+    id = pk
+
+    @property
+    def email(self):
+        return self.token["email"]
+
+    @property
+    def is_active(self):
+        return self.token["is_active"]
+
+    @property
+    def is_verified(self):
+        return self.token["is_verified"]
+
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    `JWTAuthentication` that does not load the user for every request.
+
+    Access tokens issued by `CustomTokenObtainPairSerializer` carry the
+    user's status as claims and their `token_version`. The token is
+    accepted if that version is still the user's current one, which is
+    read from the cache, and `request.user` is a `TokenClaimsUser`.
+    Saving a new password, or changing `is_active` or `is_verified`,
+    bumps the version and so revokes the tokens issued before.
+
+    Tokens without a version claim are handled as by `JWTAuthentication`.
+    `aauthenticate()` authenticates a plain `HttpRequest` in async views.
+    """
+
+    def get_user(self, validated_token):
+        if "token_version" not in validated_token:
+            return super().get_user(validated_token)
+
+        user = TokenClaimsUser(validated_token)
+        version = get_cached_token_version(user.pk)
+        return self.check_token_version(user, version, validated_token)
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if "token_version" not in validated_token:
+            get_user = sync_to_async(super().get_user)
+            return await get_user(validated_token), validated_token
+
+        user = TokenClaimsUser(validated_token)
+        version = await aget_cached_token_version(user.pk)
+        user = self.check_token_version(user, version, validated_token)
+        return user, validated_token
+
+    def check_token_version(self, user, version, validated_token):
+        if version is None:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+        if version != validated_token["token_version"]:
+            raise AuthenticationFailed(
+                _("Token has been revoked."), code="token_revoked"
+            )
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        return user
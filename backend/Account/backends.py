@@ -0,0 +1,12 @@
+from django.contrib.auth.backends import ModelBackend
+from .cache import get_cached_user
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    `ModelBackend` loading the session's user from the cache.
+    """
+
+    def get_user(self, user_id):
+        user = get_cached_user(user_id)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,139 @@
+from hashlib import sha256
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+
+def _user_key(user_id) -> str:
+    return f"account:user:{user_id}"
+
+
+def _token_version_key(user_id) -> str:
+    return f"account:token_version:{user_id}"
+
+
+def _token_key(key) -> str:
+    # Tokens are credentials, so only their digest is used as cache key.
+    return f"account:token:{sha256(key.encode()).hexdigest()}"
+
+
+def get_cached_user(user_id):
+    """
+    Return the user with the given id, or None if there is none.
+
+    Users are cached for `ACCOUNT_USER_CACHE_TIMEOUT` seconds and dropped
+    from the cache whenever they are saved or deleted.
+    """
+    key = _user_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = get_user_model()._default_manager.filter(pk=user_id).first()
+        if user is not None:
+            cache.set(key, user, settings.ACCOUNT_USER_CACHE_TIMEOUT)
+    return user
+
+
+async def aget_cached_user(user_id):
+    """
+    Async version of `get_cached_user()`.
+    """
+    key = _user_key(user_id)
+    user = await cache.aget(key)
+    if user is None:
+        user = (
+            await get_user_model()._default_manager.filter(pk=user_id).afirst()
+        )
+        if user is not None:
+            await cache.aset(key, user, settings.ACCOUNT_USER_CACHE_TIMEOUT)
+    return user
+
+
+def get_cached_token_version(user_id):
+    """
+    Return the user's current `token_version`, or None if there is no
+    such user.
+    """
+    key = _token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            get_user_model()
+            ._default_manager.filter(pk=user_id)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        if version is not None:
+            cache.set(key, version, settings.ACCOUNT_USER_CACHE_TIMEOUT)
+    return version
+
+
+async def aget_cached_token_version(user_id):
+    """
+    Async version of `get_cached_token_version()`.
+    """
+    key = _token_version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = (
+            await get_user_model()
+            ._default_manager.filter(pk=user_id)
+            .values_list("token_version", flat=True)
+            .afirst()
+        )
+        if version is not None:
+            await cache.aset(key, version, settings.ACCOUNT_USER_CACHE_TIMEOUT)
+    return version
+
+
+def get_cached_token_user_id(key):
+    """
+    Return the id of the user owning the token, or None if it is unknown.
+    """
+    cache_key = _token_key(key)
+    user_id = cache.get(cache_key)
+    if user_id is None:
+        user_id = (
+            Token.objects.filter(key=key)
+            .values_list("user_id", flat=True)
+            .first()
+        )
+        if user_id is not None:
+            cache.set(cache_key, user_id, settings.ACCOUNT_USER_CACHE_TIMEOUT)
+    return user_id
+
+
+async def aget_cached_token_user_id(key):
+    """
+    Async version of `get_cached_token_user_id()`.
+    """
+    cache_key = _token_key(key)
+    user_id = await cache.aget(cache_key)
+    if user_id is None:
+        user_id = (
+            await Token.objects.filter(key=key)
+            .values_list("user_id", flat=True)
+            .afirst()
+        )
+        if user_id is not None:
+            await cache.aset(
+                cache_key, user_id, settings.ACCOUNT_USER_CACHE_TIMEOUT
+            )
+    return user_id
+
+
+def _invalidate(key):
+    # Delete right away and again after commit, so that a concurrent
+    # request cannot keep data it read before the change was committed.
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def invalidate_user(user_id):
+    _invalidate(_user_key(user_id))
+    _invalidate(_token_version_key(user_id))
+
+
+def invalidate_token(key):
+    _invalidate(_token_key(key))
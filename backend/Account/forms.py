@@ -5,6 +5,8 @@ from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import PasswordResetForm
 from django.contrib.auth.password_validation import validate_password
+from django.template.loader import get_template
+from .outbox import enqueue_email
 
 User = get_user_model()
 
@@ -136,6 +138,26 @@ class CustomPasswordResetForm(PasswordResetForm):
             raise forms.ValidationError(_("No user with this email address."))
         return email
 
+    def send_mail(
+        self,
+        subject_template_name,
+        email_template_name,
+        context,
+        from_email,
+        to_email,
+        html_email_template_name=None,
+    ):
+        """
+        Queue the reset email in the outbox instead of sending it.
+        """
+        subject = get_template(subject_template_name).render(context)
+        subject = "".join(subject.splitlines())
+        body = get_template(email_template_name).render(context)
+        html_body = None
+        if html_email_template_name is not None:
+            html_body = get_template(html_email_template_name).render(context)
+        enqueue_email(subject, body, [to_email], from_email, html_body)
+
 
 class CustomPasswordResetConfirmForm(forms.Form):
     user_id = forms.IntegerField(widget=forms.HiddenInput())
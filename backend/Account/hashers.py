@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 hasher using `PASSWORD_PBKDF2_ITERATIONS` iterations.
+
+    The algorithm name is unchanged, so existing hashes keep verifying
+    and are rehashed with the configured iterations on the next login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    Scrypt hasher using `PASSWORD_SCRYPT_WORK_FACTOR` and
+    `PASSWORD_SCRYPT_PARALLELISM`.
+    """
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT_PARALLELISM
+
+    @property
+    def maxmem(self):
+        # OpenSSL refuses to use more than 32 MiB by default, which is
+        # less than scrypt needs from a work factor of 2**15.
+        return 2 * 128 * self.work_factor * self.block_size
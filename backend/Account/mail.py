@@ -0,0 +1,77 @@
+from django.contrib.sites.shortcuts import get_current_site
+from django.template import Context, Engine
+from Account.tokens import TokenGenerator
+from .outbox import enqueue_email, enqueue_emails
+
+
+class AccountEmail:
+    """
+    An email sent to users with a link containing an account token.
+    """
+
+    protocol = "http"
+
+    def __init__(self, subject, template_name, purpose):
+        self.subject = subject
+        self.template_name = template_name
+        self.purpose = purpose
+
+    def get_context(self, site, using_api):
+        domain, site_name = site
+        return {
+            "domain": domain,
+            "site_name": site_name,
+            "protocol": self.protocol,
+            "using_api": using_api,
+        }
+
+    def render(self, user, site, using_api=False) -> str:
+        return self.render_many([user], site, using_api)[0]
+
+    def render_many(self, users, site, using_api=False) -> list:
+        """
+        Render the email body of each user.
+
+        The compiled template, kept by Django's cached template loader,
+        and a single context are shared by all users; only the token
+        changes between renders.
+        """
+        template = Engine.get_default().get_template(self.template_name)
+        context = Context(self.get_context(site, using_api), autoescape=True)
+        bodies = []
+        for user in users:
+            token = TokenGenerator.make_token(user, self.purpose)
+            with context.push(token=token):
+                bodies.append(template.render(context))
+        return bodies
+
+    def send(self, user, request, using_api=False):
+        """
+        Queue the email to the user.
+        """
+        site = get_current_site(request)
+        body = self.render(user, (site.domain, site.name), using_api)
+        return enqueue_email(self.subject, body, [user.email])
+
+    def send_many(self, users, site, using_api=False):
+        """
+        Queue the email to every user with a single INSERT per batch.
+        """
+        users = list(users)
+        bodies = self.render_many(users, site, using_api)
+        return enqueue_emails(
+            (self.subject, body, [user.email])
+            for user, body in zip(users, bodies)
+        )
+
+
+VERIFICATION_EMAIL = AccountEmail(
+    "ToDoApp: Verify Account",
+    "Account/verification_email.html",
+    purpose="verification",
+)
+PASSWORD_RESET_EMAIL = AccountEmail(
+    "ToDoApp: Password Reset",
+    "Account/password_reset_email.html",
+    purpose="password_reset",
+)
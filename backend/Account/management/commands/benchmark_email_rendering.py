@@ -0,0 +1,83 @@
+import time
+
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template import loader
+from django.test import RequestFactory
+from Account.mail import VERIFICATION_EMAIL
+from Account.models import User
+from Account.tokens import TokenGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the cost of rendering a verification email per recipient, "
+        "rendering each email from scratch, through the mail service and "
+        "in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--emails",
+            type=int,
+            default=500,
+            help="Number of emails rendered by each path.",
+        )
+
+    def handle(self, *args, **options):
+        count = options["emails"]
+        request = RequestFactory().get("/", SERVER_NAME="localhost")
+        current_site = get_current_site(request)
+        site = (current_site.domain, current_site.name)
+
+        with transaction.atomic():
+            user = User(email="benchmark-email@example.com")
+            user.set_unusable_password()
+            user.save()
+            users = [user] * count
+
+            timings = {
+                "tokens": self.measure(
+                    lambda: [TokenGenerator.make_token(u) for u in users]
+                ),
+                "uncached": self.measure(
+                    lambda: [self.render_uncached(u, request) for u in users]
+                ),
+                "service": self.measure(
+                    lambda: [VERIFICATION_EMAIL.render(u, site) for u in users]
+                ),
+                "batch": self.measure(
+                    lambda: VERIFICATION_EMAIL.render_many(users, site)
+                ),
+            }
+
+            self.stdout.write(
+                self.style.MIGRATE_HEADING("Microseconds per email")
+            )
+            for name, seconds in timings.items():
+                self.stdout.write(
+                    f"  {name:<10} {seconds / count * 1_000_000:>10.1f}"
+                )
+
+            transaction.set_rollback(True)
+
+    def measure(self, render):
+        start = time.perf_counter()
+        render()
+        return time.perf_counter() - start
+
+    def render_uncached(self, user, request):
+        """
+        Render the email the way the views did before the mail service.
+        """
+        current_site = get_current_site(request)
+        context = {
+            "domain": current_site.domain,
+            "site_name": current_site.name,
+            "protocol": "http",
+            "token": TokenGenerator.make_token(user),
+        }
+        return loader.render_to_string(
+            VERIFICATION_EMAIL.template_name, context
+        )
@@ -0,0 +1,95 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.contrib.auth.hashers import get_hasher
+from django.test import override_settings
+from Account.hashers import (
+    TunedPBKDF2PasswordHasher,
+    TunedScryptPasswordHasher,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the cost of hashing a password on this host and recommend "
+        "hasher settings for a target login latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=250.0,
+            help="Time a single password hash may take, in milliseconds.",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=3,
+            help="Hashes timed per measurement; the fastest one is used.",
+        )
+
+    def handle(self, *args, **options):
+        self.samples = options["samples"]
+        target = options["target_ms"] / 1000
+
+        hasher = get_hasher()
+        self.stdout.write(self.style.MIGRATE_HEADING("Current settings"))
+        self.stdout.write(
+            f"  {hasher.algorithm}: {self.measure(hasher) * 1000:.1f} ms"
+        )
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"Recommended for {options['target_ms']:.0f} ms"
+            )
+        )
+        iterations = self.recommend_pbkdf2_iterations(target)
+        self.stdout.write(f"  PASSWORD_PBKDF2_ITERATIONS={iterations}")
+        work_factor, seconds = self.recommend_scrypt_work_factor(target)
+        if work_factor is None:
+            self.stdout.write(
+                "  scrypt: the smallest work factor is already too slow"
+            )
+        else:
+            self.stdout.write(
+                f"  PASSWORD_SCRYPT_WORK_FACTOR={work_factor} "
+                f"({seconds * 1000:.1f} ms, "
+                f"{128 * work_factor * 8 // 2**20} MiB)"
+            )
+
+    def measure(self, hasher):
+        salt = hasher.salt()
+        best = None
+        for _ in range(self.samples):
+            start = time.perf_counter()
+            hasher.encode("benchmark-password", salt)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def recommend_pbkdf2_iterations(self, target):
+        """
+        Return the iterations that fit in `target`, rounded down to ten
+        thousands. PBKDF2's cost is linear in its iterations.
+        """
+        probe = 100_000
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=probe):
+            seconds = self.measure(TunedPBKDF2PasswordHasher())
+        iterations = int(probe * target / seconds)
+        return max(iterations // 10_000 * 10_000, 10_000)
+
+    def recommend_scrypt_work_factor(self, target):
+        """
+        Return the largest power of two work factor that fits in `target`,
+        with its cost, or None if even 2**12 does not.
+        """
+        recommended = None, None
+        for exponent in range(12, 21):
+            work_factor = 2**exponent
+            with override_settings(PASSWORD_SCRYPT_WORK_FACTOR=work_factor):
+                seconds = self.measure(TunedScryptPasswordHasher())
+            if seconds > target:
+                break
+            recommended = work_factor, seconds
+        return recommended
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from Account.models import User
+from Account.tokens import TokenGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the cost of making and checking verification tokens in "
+        "each token format."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tokens",
+            type=int,
+            default=1000,
+            help="Number of tokens made and checked per format.",
+        )
+
+    def handle(self, *args, **options):
+        count = options["tokens"]
+
+        with transaction.atomic():
+            user = User(email="benchmark-tokens@example.com")
+            user.set_unusable_password()
+            user.save()
+
+            self.stdout.write(
+                self.style.MIGRATE_HEADING("Microseconds per token")
+            )
+            for token_format in ["jwe", "signed"]:
+                with override_settings(ACCOUNT_TOKEN_FORMAT=token_format):
+                    make, check, length = self.run(user, count)
+                self.stdout.write(
+                    f"  {token_format:<8} make {make:>8.1f} "
+                    f"check {check:>8.1f} ({length} characters)"
+                )
+
+            transaction.set_rollback(True)
+
+    def run(self, user, count):
+        start = time.perf_counter()
+        tokens = [TokenGenerator.make_token(user) for _ in range(count)]
+        made = time.perf_counter()
+        for token in tokens:
+            assert TokenGenerator.check_token(token) == user.pk
+        checked = time.perf_counter()
+        return (
+            (made - start) / count * 1_000_000,
+            (checked - made) / count * 1_000_000,
+            len(tokens[0]),
+        )
@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from Account.outbox import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = "Send the emails queued in the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of emails sent per SMTP connection.",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            help="Attempts before an email is marked as failed.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and poll for new emails.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls when the outbox is empty.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_queued_emails(
+                options["batch_size"], options["max_attempts"]
+            )
+            if sent or failed:
+                self.stdout.write(f"Sent {sent} emails, {failed} failed.")
+            if not options["loop"]:
+                break
+            if sent + failed < options["batch_size"]:
+                time.sleep(options["interval"])
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from Account.verification import get_rejection_stats, reset_rejection_stats
+
+
+class Command(BaseCommand):
+    help = "Show how many requests the verification gate rejected."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after showing them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_rejection_stats()
+        for status, count in stats.items():
+            self.stdout.write(f"{status}: {count}")
+        if options["reset"]:
+            reset_rejection_stats()
+            self.stdout.write("Counters reset.")
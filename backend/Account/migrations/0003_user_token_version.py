@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-18 20:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("Account", "0002_user_is_verified"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="token_version",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="token version"
+            ),
+        ),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 5.2 on 2026-10-18 20:46
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("Account", "0003_user_token_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEmail",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "subject",
+                    models.CharField(max_length=255, verbose_name="subject"),
+                ),
+                ("body", models.TextField(verbose_name="body")),
+                (
+                    "html_body",
+                    models.TextField(blank=True, verbose_name="HTML body"),
+                ),
+                (
+                    "from_email",
+                    models.CharField(
+                        blank=True, max_length=255, verbose_name="from email"
+                    ),
+                ),
+                ("to", models.JSONField(verbose_name="to")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "pending"),
+                            ("sent", "sent"),
+                            ("failed", "failed"),
+                        ],
+                        default="pending",
+                        max_length=16,
+                        verbose_name="status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="attempts"
+                    ),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="next attempt at",
+                    ),
+                ),
+                (
+                    "claim",
+                    models.CharField(
+                        blank=True,
+                        editable=False,
+                        max_length=32,
+                        verbose_name="claim",
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, verbose_name="last error"),
+                ),
+                (
+                    "created_date",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="created date"
+                    ),
+                ),
+                (
+                    "sent_date",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="sent date"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "outbox email",
+                "verbose_name_plural": "outbox emails",
+                "indexes": [
+                    models.Index(
+                        fields=["status", "next_attempt_at"],
+                        name="outbox_due_idx",
+                    )
+                ],
+            },
+        ),
+    ]
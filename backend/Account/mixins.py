@@ -1,16 +1,31 @@
 from django.contrib.auth.mixins import AccessMixin
 from django.shortcuts import redirect
 from django.urls import reverse
+from .verification import (
+    UNVERIFIED,
+    VERIFIED,
+    get_verification_status,
+    record_rejection,
+)
 
 
 class VerifiedUserRequiredMixin(AccessMixin):
-    """Verify that the logged-in user is email-verified."""
+    """
+    Verify that the user is logged in and email-verified.
+
+    Requests are normally rejected by `VerificationGateMiddleware` before
+    the view is dispatched; the check in `dispatch` reuses the status it
+    resolved and only matters without the middleware.
+    """
+
+    verification_required = True
 
     def dispatch(self, request, *args, **kwargs):
-        if not request.user.is_authenticated:
+        status = get_verification_status(request)
+        if status != VERIFIED:
+            record_rejection(status)
+            if status == UNVERIFIED:
+                return redirect(reverse("Account:verification-required"))
             return self.handle_no_permission()
 
-        if not getattr(request.user, "is_verified", False):
-            return redirect(reverse("Account:verification-required"))
-
         return super().dispatch(request, *args, **kwargs)
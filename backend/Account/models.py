@@ -4,6 +4,7 @@ from django.contrib.auth.models import (
     PermissionsMixin,
     BaseUserManager,
 )
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -56,6 +57,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_verified = models.BooleanField(
         default=False, verbose_name=_("is verified")
     )
+    token_version = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name=_("token version")
+    )
 
     created_date = models.DateTimeField(
         auto_now_add=True, verbose_name=_("created date")
@@ -67,7 +71,101 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
+    # Changing any of these revokes the user's JWTs, which carry them as
+    # claims, see `token_version`.
+    TOKEN_CLAIM_FIELDS = ["is_active", "is_verified"]
+
     objects = UserManager()
 
     def __str__(self):
         return self.email
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_claims = {
+            name: value
+            for name, value in zip(field_names, values)
+            if name in cls.TOKEN_CLAIM_FIELDS
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Bump `token_version` when the password or a claim field changes.
+        """
+        if self.pk is not None and self.token_claims_changed():
+            self.token_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
+        self._loaded_claims = {
+            name: getattr(self, name) for name in self.TOKEN_CLAIM_FIELDS
+        }
+
+    def token_claims_changed(self) -> bool:
+        if self._password is not None:
+            return True
+        loaded = getattr(self, "_loaded_claims", {})
+        return any(
+            getattr(self, name) != value for name, value in loaded.items()
+        )
+
+
+class OutboxEmail(models.Model):
+    """
+    Email waiting to be delivered by the `send_queued_emails` worker.
+
+    Failed deliveries are retried with exponential backoff until
+    `max_attempts` is reached, after which the email is kept with the
+    `failed` status as a dead letter.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("pending")
+        SENT = "sent", _("sent")
+        FAILED = "failed", _("failed")
+
+    subject = models.CharField(max_length=255, verbose_name=_("subject"))
+    body = models.TextField(verbose_name=_("body"))
+    html_body = models.TextField(blank=True, verbose_name=_("HTML body"))
+    from_email = models.CharField(
+        max_length=255, blank=True, verbose_name=_("from email")
+    )
+    to = models.JSONField(verbose_name=_("to"))
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_("status"),
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name=_("attempts")
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now, verbose_name=_("next attempt at")
+    )
+    claim = models.CharField(
+        max_length=32, blank=True, editable=False, verbose_name=_("claim")
+    )
+    last_error = models.TextField(blank=True, verbose_name=_("last error"))
+    created_date = models.DateTimeField(
+        auto_now_add=True, verbose_name=_("created date")
+    )
+    sent_date = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("sent date")
+    )
+
+    class Meta:
+        verbose_name = _("outbox email")
+        verbose_name_plural = _("outbox emails")
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="outbox_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)}"
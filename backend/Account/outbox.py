@@ -0,0 +1,151 @@
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.utils import timezone
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(subject, body, to, from_email=None, html_body=None):
+    """
+    Queue an email for the `send_queued_emails` worker and return it.
+    """
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        html_body=html_body or "",
+        from_email=from_email or "",
+        to=list(to),
+    )
+
+
+def enqueue_emails(messages, batch_size=500):
+    """
+    Queue `(subject, body, to)` messages with one INSERT per batch.
+    """
+    return OutboxEmail.objects.bulk_create(
+        (
+            OutboxEmail(subject=subject, body=body, to=list(to))
+            for subject, body, to in messages
+        ),
+        batch_size=batch_size,
+    )
+
+
+def get_retry_delay(attempts) -> timedelta:
+    """
+    Return the delay before the next attempt after `attempts` failures.
+    """
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return min(delay, settings.EMAIL_OUTBOX_MAX_RETRY_DELAY)
+
+
+def claim_emails(batch_size):
+    """
+    Claim up to `batch_size` due emails and return them.
+
+    Claimed emails are pushed back by `EMAIL_OUTBOX_CLAIM_TIMEOUT`, so
+    that concurrent workers skip them and they are picked up again if
+    this worker dies before recording the outcome. Claiming is one
+    short UPDATE; no lock is held while the emails are sent.
+    """
+    now = timezone.now()
+    claim = uuid.uuid4().hex
+    due = OutboxEmail.objects.filter(
+        status=OutboxEmail.Status.PENDING, next_attempt_at__lte=now
+    )
+    ids = due.order_by("next_attempt_at").values_list("pk", flat=True)
+    ids = list(ids[:batch_size])
+    due.filter(pk__in=ids).update(
+        claim=claim,
+        next_attempt_at=now + settings.EMAIL_OUTBOX_CLAIM_TIMEOUT,
+    )
+    return list(OutboxEmail.objects.filter(claim=claim).order_by("pk"))
+
+
+def build_message(email, connection):
+    message = EmailMultiAlternatives(
+        email.subject,
+        email.body,
+        email.from_email or None,
+        email.to,
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
+
+
+def send_queued_emails(batch_size=100, max_attempts=None):
+    """
+    Send one batch of due emails over a single SMTP connection.
+
+    Returns the number of emails sent and failed. Emails that fail are
+    rescheduled, or marked as failed once they reach `max_attempts`.
+
+    The outcome is only recorded for emails still holding this worker's
+    claim. Emails whose claim expired before they were sent are left to
+    the worker that claims them next.
+    """
+    if max_attempts is None:
+        max_attempts = settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    emails = claim_emails(batch_size)
+    if not emails:
+        return 0, 0
+    claim = emails[0].claim
+
+    sent = []
+    failed = 0
+    connection = get_connection()
+    # The connection is opened explicitly so that send_messages() keeps
+    # it open between messages. After an error it is reopened, as it may
+    # no longer be usable.
+    is_open = False
+    try:
+        for email in emails:
+            # next_attempt_at is when the claim expires.
+            if email.next_attempt_at <= timezone.now():
+                break
+            try:
+                if not is_open:
+                    connection.open()
+                    is_open = True
+                connection.send_messages([build_message(email, connection)])
+            except Exception as error:
+                logger.warning("Sending email %s failed: %s", email.pk, error)
+                connection.close()
+                is_open = False
+                record_failure(email, error, max_attempts)
+                failed += 1
+            else:
+                sent.append(email.pk)
+    finally:
+        connection.close()
+
+    OutboxEmail.objects.filter(pk__in=sent, claim=claim).update(
+        status=OutboxEmail.Status.SENT,
+        sent_date=timezone.now(),
+        claim="",
+        last_error="",
+    )
+    return len(sent), failed
+
+
+def record_failure(email, error, max_attempts):
+    attempts = email.attempts + 1
+    changes = {
+        "attempts": attempts,
+        "last_error": f"{type(error).__name__}: {error}",
+        "claim": "",
+    }
+    if attempts >= max_attempts:
+        changes["status"] = OutboxEmail.Status.FAILED
+    else:
+        changes["next_attempt_at"] = timezone.now() + get_retry_delay(attempts)
+    OutboxEmail.objects.filter(pk=email.pk, claim=email.claim).update(
+        **changes
+    )
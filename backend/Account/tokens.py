@@ -2,16 +2,48 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import AbstractUser
 import jwt
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
 from jose import jwe
 from jose.exceptions import JWEError, JWEParseError
 
 
 class TokenGenerator:
+    """
+    Generates and checks the tokens sent in verification and password
+    reset links.
+
+    `ACCOUNT_TOKEN_FORMAT` selects the format of new tokens:
+
+    - "signed": `<user id>.<purpose>.<token version>:<timestamp>:<HMAC>`,
+      signed with the secret key. Tokens expire after
+      `ACCOUNT_TOKEN_MAX_AGE` and are only accepted for the purpose they
+      were made for. Tokens of the `single_use_purposes` are also only
+      accepted while the user's `token_version` is unchanged, so a reset
+      link stops working once the password has been changed.
+    - "jwe": an A256GCM-encrypted simplejwt access token.
+
+    JWE tokens are accepted as long as `ACCOUNT_TOKEN_ACCEPT_JWE` is set,
+    so that links sent before switching formats keep working.
+    """
+
+    salt = "Account.tokens.TokenGenerator"
+    single_use_purposes = {"password_reset"}
+
     @classmethod
-    def make_token(cls, user: AbstractUser) -> str:
+    def make_token(
+        cls, user: AbstractUser, purpose: str = "verification"
+    ) -> str:
         """
         Generates a token for the given user.
         """
+        if settings.ACCOUNT_TOKEN_FORMAT == "jwe":
+            return cls.make_jwe_token(user)
+        signer = signing.TimestampSigner(salt=cls.salt)
+        return signer.sign(f"{user.pk}.{purpose}.{user.token_version}")
+
+    @classmethod
+    def make_jwe_token(cls, user: AbstractUser) -> str:
         refresh = RefreshToken.for_user(user)
         access = refresh.access_token
         key = settings.SECRET_KEY[:32]
@@ -21,10 +53,42 @@ class TokenGenerator:
         return enc.decode("utf-8")
 
     @classmethod
-    def check_token(cls, token: str) -> int:
+    def check_token(cls, token: str, purpose: str = None) -> int:
         """
-        Checks if the given token is valid.
+        Checks if the given token is valid and returns the user id.
+
+        Raises `jwt.ExpiredSignatureError` for expired tokens and
+        `ValueError` for invalid ones, whatever their format.
         """
+        # JWE tokens are dot separated, signed tokens use colons.
+        if ":" not in token:
+            if not settings.ACCOUNT_TOKEN_ACCEPT_JWE:
+                raise ValueError({"detail": "Invalid token."})
+            return cls.check_jwe_token(token)
+
+        signer = signing.TimestampSigner(salt=cls.salt)
+        try:
+            value = signer.unsign(
+                token, max_age=settings.ACCOUNT_TOKEN_MAX_AGE
+            )
+        except signing.SignatureExpired:
+            raise jwt.ExpiredSignatureError("Signature has expired")
+        except signing.BadSignature:
+            raise ValueError({"detail": "Invalid token."})
+
+        user_id, token_purpose, version = value.split(".")
+        if purpose is not None and token_purpose != purpose:
+            raise ValueError({"detail": "Invalid token."})
+        if token_purpose in cls.single_use_purposes:
+            users = get_user_model().objects.filter(
+                pk=user_id, token_version=version
+            )
+            if not users.exists():
+                raise ValueError({"detail": "Invalid token."})
+        return int(user_id)
+
+    @classmethod
+    def check_jwe_token(cls, token: str) -> int:
         key = settings.SECRET_KEY.encode()[:32]
         try:
             dec = jwe.decrypt(token, key)
@@ -32,3 +96,24 @@ class TokenGenerator:
             raise ValueError({"detail": "Invalid token."})
         token = jwt.decode(dec, settings.SECRET_KEY, "HS256")
         return token["user_id"]
+
+
+class PurposeTokenGenerator:
+    """
+    `TokenGenerator` tokens of one purpose behind the interface of
+    Django's token generators, for views such as `PasswordResetView` that
+    call `make_token(user)` and `check_token(user, token)`.
+    """
+
+    def __init__(self, purpose: str):
+        self.purpose = purpose
+
+    def make_token(self, user: AbstractUser) -> str:
+        return TokenGenerator.make_token(user, self.purpose)
+
+    def check_token(self, user: AbstractUser, token: str) -> bool:
+        try:
+            user_id = TokenGenerator.check_token(token, self.purpose)
+        except (ValueError, jwt.InvalidTokenError):
+            return False
+        return user is not None and user_id == user.pk
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+
+ANONYMOUS = "anonymous"
+UNVERIFIED = "unverified"
+VERIFIED = "verified"
+
+REJECTED_KEYS = {
+    ANONYMOUS: "account:gate:rejected:anonymous",
+    UNVERIFIED: "account:gate:rejected:unverified",
+}
+
+
+def get_verification_status(request) -> str:
+    """
+    Return whether the request's user is anonymous, unverified or
+    verified.
+
+    The status is resolved once per request and user, and shared by the
+    HTML views and the API through the underlying `HttpRequest`. Users
+    come from the user cache (sessions and tokens) or from the token
+    claims (JWTs), so checking their status costs no query.
+    """
+    request = getattr(request, "_request", request)
+    user = request.user
+    resolved = getattr(request, "_verification_status", None)
+    if resolved is not None and resolved[0] is user:
+        return resolved[1]
+
+    if not user or not user.is_authenticated:
+        status = ANONYMOUS
+    elif not getattr(user, "is_verified", False):
+        status = UNVERIFIED
+    else:
+        status = VERIFIED
+    # Keyed by the user: DRF replaces the session user once it has
+    # authenticated the request.
+    request._verification_status = (user, status)
+    return status
+
+
+def record_rejection(status: str):
+    key = REJECTED_KEYS[status]
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_rejection_stats() -> dict:
+    values = cache.get_many(REJECTED_KEYS.values())
+    return {
+        status: values.get(key, 0) for status, key in REJECTED_KEYS.items()
+    }
+
+
+def reset_rejection_stats():
+    cache.delete_many(REJECTED_KEYS.values())
@@ -9,11 +9,9 @@ from django.views.generic import FormView, TemplateView
 from django.urls import reverse_lazy
 from django.contrib.auth import login, get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.mail import EmailMessage
-from django.template import loader
-from django.contrib.sites.shortcuts import get_current_site
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
-from Account.tokens import TokenGenerator
+from Account.mail import VERIFICATION_EMAIL
+from Account.tokens import PurposeTokenGenerator, TokenGenerator
 from .forms import (
     EmailAuthenticationForm,
     CustomSignupForm,
@@ -70,7 +68,7 @@ class CustomPasswordResetView(PasswordResetView):
     subject_template_name = "Account/password_reset_subject.txt"
     success_url = reverse_lazy("Account:reset-password-done")
     form_class = CustomPasswordResetForm
-    token_generator = TokenGenerator()
+    token_generator = PurposeTokenGenerator("password_reset")
 
     def form_valid(self, form):
         email = form.cleaned_data.get("email")
@@ -103,12 +101,13 @@ class CustomPasswordResetConfirmView(FormView):
     template_name = "Account/reset_password_confirm.html"
     form_class = CustomPasswordResetConfirmForm
     success_url = reverse_lazy("Account:reset-password-complete")
+    token_generator = PurposeTokenGenerator("password_reset")
 
     def get(self, request, *args, **kwargs):
         token = kwargs.get("token")
         context = self.get_context_data(**kwargs)
         try:
-            user_id = TokenGenerator.check_token(token)
+            user_id = TokenGenerator.check_token(token, "password_reset")
             context.update({"user_id": user_id})
         except ValueError as e:
             context.update({"error": str(e)})
@@ -122,7 +121,13 @@ class CustomPasswordResetConfirmView(FormView):
         user_id = form.cleaned_data.get("user_id", None)
         password = form.cleaned_data.get("new_password1", None)
 
-        user = get_user_model().objects.get(pk=user_id)
+        # The user id is a hidden field, the token decides whose password
+        # may be reset.
+        user = get_user_model().objects.filter(pk=user_id).first()
+        token = self.kwargs.get("token")
+        if not self.token_generator.check_token(user, token):
+            form.add_error(None, "Invalid Token.")
+            return self.form_invalid(form)
         user.set_password(password)
         user.save()
         return super().form_valid(form)
@@ -137,20 +142,7 @@ class VerificationResendView(LoginRequiredMixin, TemplateView):
 
     def get(self, request, *args, **kwargs):
         user = request.user
-        subject = "ToDoApp: Verify Account"
-        template_name = "Account/verification_email.html"
-        current_site = get_current_site(request)
-        site_name = current_site.name
-        domain = current_site.domain
-        context = {
-            "domain": domain,
-            "site_name": site_name,
-            "protocol": "http",
-            "token": TokenGenerator.make_token(user),
-        }
-        body = loader.render_to_string(template_name, context)
-        email = EmailMessage(subject, body, None, [user.email])
-        email.send()
+        VERIFICATION_EMAIL.send(user, request)
         return super().get(request, *args, **kwargs)
 
 
@@ -161,7 +153,7 @@ class VerificationConfirmView(TemplateView):
         token = kwargs.get("token")
         context = self.get_context_data(**kwargs)
         try:
-            user_id = TokenGenerator.check_token(token)
+            user_id = TokenGenerator.check_token(token, "verification")
             user = get_user_model().objects.get(pk=user_id)
             user.is_verified = True
             user.save()
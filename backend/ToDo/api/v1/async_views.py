@@ -0,0 +1,247 @@
+import json
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.paginator import InvalidPage, Paginator
+from django.http import JsonResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, serializers, status
+from rest_framework.pagination import _positive_int
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from Account.authentication import (
+    CachedTokenAuthentication,
+    StatelessJWTAuthentication,
+)
+from ToDo.models import Task
+from .permissions import IsVerified
+from .serializers import TaskSerializer
+
+
+class AsyncTaskView(View):
+    """
+    Base class of the async task API views.
+
+    DRF views are synchronous, so under ASGI every request to them runs
+    in a thread. These are plain Django views with async handlers that
+    query through the async ORM, doing what `APIView` does for the task
+    API: requests are authenticated with a token or a JWT, the user must
+    be verified (`IsVerified`), bodies are parsed as JSON and
+    `APIException`s are returned as by DRF's exception handler.
+
+    Sessions are not accepted, so the views need no CSRF protection.
+    """
+
+    authentication_classes = [
+        CachedTokenAuthentication,
+        StatelessJWTAuthentication,
+    ]
+    serializer_class = TaskSerializer
+    not_found_message = "No Task matches the given query."
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await self.authenticate(request)
+            self.check_permissions(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    async def authenticate(self, request):
+        # The session user set by AuthenticationMiddleware is lazy and
+        # would be loaded synchronously, so it is replaced either way.
+        request.user, request.auth = AnonymousUser(), None
+        for authentication_class in self.authentication_classes:
+            result = await authentication_class().aauthenticate(request)
+            if result is not None:
+                request.user, request.auth = result
+                return
+
+    def check_permissions(self, request):
+        if IsVerified().has_permission(request, self):
+            return
+        if request.auth is None:
+            raise exceptions.NotAuthenticated()
+        raise exceptions.PermissionDenied(IsVerified.message)
+
+    def handle_exception(self, exc):
+        headers = {}
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            exc.status_code = status.HTTP_401_UNAUTHORIZED
+            authenticator = self.authentication_classes[0]()
+            headers["WWW-Authenticate"] = authenticator.authenticate_header(
+                self.request
+            )
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {"detail": exc.detail}
+        return JsonResponse(
+            data, status=exc.status_code, headers=headers, safe=False
+        )
+
+    def get_data(self, request):
+        if request.content_type != "application/json":
+            raise exceptions.UnsupportedMediaType(request.content_type)
+        try:
+            return json.loads(request.body)
+        except ValueError as exc:
+            raise exceptions.ParseError(f"JSON parse error - {exc}")
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs["context"] = {"request": self.request, "view": self}
+        return self.serializer_class(*args, **kwargs)
+
+    def get_queryset(self):
+        return Task.objects.for_user(self.request.user)
+
+    async def get_object(self, pk):
+        try:
+            return await self.get_queryset().aget(pk=pk)
+        except Task.DoesNotExist:
+            raise exceptions.NotFound(self.not_found_message)
+
+
+class AsyncTaskListView(AsyncTaskView):
+    """
+    List (GET) and create (POST) tasks.
+
+    The list is filtered by `completed` and paginated by page number
+    with `page` and `page_size`, in the format of `DefaultPagination`
+    with exact counts.
+    """
+
+    page_size = 10
+    page_query_param = "page"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    last_page_strings = ("last",)
+    invalid_page_message = "Invalid page."
+
+    async def get(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = Paginator(queryset, self.get_page_size())
+        paginator.count = await queryset.acount()
+        number = request.GET.get(self.page_query_param) or 1
+        if number in self.last_page_strings:
+            number = paginator.num_pages
+        try:
+            page = paginator.page(number)
+        except InvalidPage:
+            raise exceptions.NotFound(self.invalid_page_message)
+
+        tasks = [task async for task in page.object_list]
+        serializer = self.get_serializer(tasks, many=True)
+        return JsonResponse(
+            {
+                "links": {
+                    "next": self.get_next_link(page),
+                    "previous": self.get_previous_link(page),
+                },
+                "total_objects": paginator.count,
+                "total_pages": paginator.num_pages,
+                "results": serializer.data,
+            }
+        )
+
+    async def post(self, request):
+        serializer = self.get_serializer(data=self.get_data(request))
+        serializer.is_valid(raise_exception=True)
+        task = await Task.objects.acreate(
+            **serializer.validated_data, user_id=request.user.pk
+        )
+        serializer = self.get_serializer(task)
+        return JsonResponse(serializer.data, status=status.HTTP_201_CREATED)
+
+    def filter_queryset(self, queryset):
+        completed = self.request.GET.get("completed")
+        if completed:
+            try:
+                completed = serializers.BooleanField().run_validation(
+                    completed
+                )
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError({"completed": exc.detail})
+            queryset = queryset.filter(completed=completed)
+        return queryset
+
+    def get_page_size(self):
+        try:
+            return _positive_int(
+                self.request.GET[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_next_link(self, page):
+        if not page.has_next():
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.page_query_param, page.next_page_number()
+        )
+
+    def get_previous_link(self, page):
+        if not page.has_previous():
+            return None
+        url = self.request.build_absolute_uri()
+        number = page.previous_page_number()
+        if number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, number)
+
+
+class AsyncTaskDetailView(AsyncTaskView):
+    """
+    Retrieve a task.
+    """
+
+    async def get(self, request, pk):
+        task = await self.get_object(pk)
+        return JsonResponse(self.get_serializer(task).data)
+
+
+class AsyncTaskStatusView(AsyncTaskView):
+    """
+    Set `completed` of a task (PATCH), which must not have it already.
+    """
+
+    completed = None
+    unchanged_message = None
+
+    async def patch(self, request, pk):
+        task = await self.get_object(pk)
+        if task.completed == self.completed:
+            return JsonResponse(
+                {"detail": self.unchanged_message},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        task.completed = self.completed
+        await task.asave(update_fields=["completed", "updated_at"])
+        return JsonResponse(self.get_serializer(task).data)
+
+
+class AsyncTaskCompleteView(AsyncTaskStatusView):
+    """
+    Mark a task as completed.
+    """
+
+    completed = True
+    unchanged_message = "Task is already completed."
+
+
+class AsyncTaskRestoreView(AsyncTaskStatusView):
+    """
+    Mark a task as incompleted.
+    """
+
+    completed = False
+    unchanged_message = "Task is not completed yet."
@@ -0,0 +1,23 @@
+from rest_framework import filters
+from ToDo.search import get_search_backend
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for `SearchFilter` using the task search backend.
+
+    It reads the same `search` query parameter, but matches through the
+    database's full-text index when there is one and orders the results
+    by relevance unless an explicit `ordering` is requested.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        backend = get_search_backend(queryset.db)
+        queryset = backend.search(queryset, terms)
+        if backend.ranked:
+            queryset = queryset.order_by("-search_rank")
+        return queryset
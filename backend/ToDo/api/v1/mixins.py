@@ -0,0 +1,170 @@
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+from ToDo.cache import (
+    get_task_version,
+    record_list_cache_access,
+    task_list_cache_key,
+)
+from ToDoApp.db import read_from_replica
+
+
+class ReplicaReadMixin:
+    """
+    Serves list and detail requests from the read replica.
+
+    Everything the two actions read, including the pagination count and
+    the conditional request validators, goes to the replica unless the
+    user recently wrote to their tasks, see `ToDoApp.db.ReplicaRouter`.
+    """
+
+    def list(self, request, *args, **kwargs):
+        with read_from_replica(request.user.pk):
+            return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        with read_from_replica(request.user.pk):
+            return super().retrieve(request, *args, **kwargs)
+
+
+class ConditionalTaskMixin:
+    """
+    ETag and Last-Modified support for the task list and detail views.
+
+    The list is validated against the user's task version and the detail
+    against the task's `updated_at`. Both are looked up without loading
+    or serializing tasks, so a matching `If-None-Match` (or
+    `If-Modified-Since`) is answered with 304 for the price of a cache
+    lookup or a single indexed query. On PUT and PATCH, `If-Match` and
+    `If-Unmodified-Since` are checked against the task while its row is
+    locked, and a mismatch returns 412.
+    """
+
+    def get_list_validators(self, request):
+        user_id = request.user.pk
+        version = get_task_version(user_id)
+        key = (
+            user_id,
+            version,
+            request.get_full_path(),
+            request.accepted_renderer.format,
+        )
+        digest = md5(repr(key).encode(), usedforsecurity=False).hexdigest()
+        return f'"{digest}"', version / 1_000_000
+
+    def get_object_validators(self, request, updated_at):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        timestamp = updated_at.timestamp()
+        etag = "-".join(
+            [
+                str(self.kwargs[lookup_url_kwarg]),
+                str(int(timestamp * 1_000_000)),
+                request.accepted_renderer.format,
+            ]
+        )
+        return f'"{etag}"', timestamp
+
+    def get_updated_at(self, lock=False):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset().filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        if lock:
+            queryset = queryset.select_for_update()
+        return queryset.values_list("updated_at", flat=True).first()
+
+    def set_validators(self, response, etag, timestamp):
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(timestamp)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        etag, timestamp = self.get_list_validators(request)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(timestamp)
+        )
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag, timestamp)
+
+    def retrieve(self, request, *args, **kwargs):
+        updated_at = self.get_updated_at()
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag, timestamp = self.get_object_validators(request, updated_at)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(timestamp)
+        )
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        return self.set_validators(response, etag, timestamp)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            updated_at = self.get_updated_at(lock=True)
+            if updated_at is not None:
+                etag, timestamp = self.get_object_validators(
+                    request, updated_at
+                )
+                response = get_conditional_response(
+                    request, etag=etag, last_modified=int(timestamp)
+                )
+                if response is not None:
+                    return response
+
+            response = super().update(request, *args, **kwargs)
+
+        instance = getattr(self, "updated_instance", None)
+        if instance is not None:
+            etag, timestamp = self.get_object_validators(
+                request, instance.updated_at
+            )
+            self.set_validators(response, etag, timestamp)
+        return response
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.updated_instance = serializer.instance
+
+
+class CachedListMixin:
+    """
+    Caches the data of list responses per user and query parameters.
+
+    Keys include the user's task version, so every write to their tasks
+    makes the cached pages unreachable without deleting anything.
+    Pagination links are absolute, so the scheme and host are part of
+    the key as well.
+    """
+
+    list_cache_namespace = "api"
+
+    def get_list_cache_key(self, request):
+        return task_list_cache_key(
+            request.user.pk,
+            self.list_cache_namespace,
+            request.query_params,
+            request.scheme,
+            request.get_host(),
+            request.path,
+        )
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_list_cache_key(request)
+        data = cache.get(key)
+        record_list_cache_access(hit=data is not None)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.TASK_LIST_CACHE_TIMEOUT)
+        return response
@@ -1,16 +1,295 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from hashlib import md5
+
+from django.core.cache import cache
+from django.core.exceptions import (
+    EmptyResultSet,
+    FieldDoesNotExist,
+    ValidationError,
+)
+from django.core.paginator import (
+    EmptyPage,
+    InvalidPage,
+    Page,
+    PageNotAnInteger,
+    Paginator,
+)
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    PageNumberPagination,
+    _positive_int,
+)
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from ToDo.cache import get_task_version
+
+COUNT_EXACT = "exact"
+COUNT_APPROXIMATE = "approximate"
+COUNT_NONE = "none"
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that avoids recounting the filtered queryset on every page.
+
+    `count_mode` is one of:
+
+    * `exact`: the count is cached under `cache_key`, which must change
+      whenever the counted rows may have changed.
+    * `approximate`: a cached exact count is used if there is one,
+      otherwise counting stops at `approximate_count_limit` rows.
+    * `none`: nothing is counted; whether there is a next page is found
+      by fetching one extra row.
+    """
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        count_mode=COUNT_EXACT,
+        cache_key=None,
+        cache_timeout=None,
+        approximate_count_limit=1000,
+        **kwargs,
+    ):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_mode = count_mode
+        self.cache_key = cache_key
+        self.cache_timeout = cache_timeout
+        self.approximate_count_limit = approximate_count_limit
+        self.count_is_exact = count_mode == COUNT_EXACT
+
+    @cached_property
+    def count(self):
+        if self.count_mode == COUNT_NONE:
+            return None
+
+        if self.cache_key is not None:
+            count = cache.get(self.cache_key)
+            if count is not None:
+                self.count_is_exact = True
+                return count
+
+        if self.count_mode == COUNT_APPROXIMATE:
+            limit = self.approximate_count_limit
+            count = self.object_list[: limit + 1].count()
+            if count > limit:
+                return limit
+            self.count_is_exact = True
+        else:
+            count = super().count
+
+        if self.cache_key is not None:
+            cache.set(self.cache_key, count, self.cache_timeout)
+        return count
+
+    def validate_number(self, number):
+        if self.count is not None and self.count_is_exact:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.count is not None and self.count_is_exact:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page + 1
+        object_list = list(self.object_list[bottom:top])
+        if not object_list and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        return UncountedPage(
+            object_list[: self.per_page],
+            number,
+            self,
+            has_next=len(object_list) > self.per_page,
+        )
+
+
+class UncountedPage(Page):
+    """
+    Page of a paginator whose total count is not known.
+    """
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1
 
 
 class DefaultPagination(PageNumberPagination):
     """
     Default pagination class for the API.
+
+    The `count` query parameter controls the totals in the response:
+    `true` (default) returns exact, cached totals, `approximate` stops
+    counting at `approximate_count_limit` rows and `false` skips counting.
+    Counts are cached per user until the user's tasks change.
     """
 
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
     page_query_param = "page"
+    count_query_param = "count"
+    count_cache_timeout = 60 * 60
+    approximate_count_limit = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = CachedCountPaginator(
+            queryset,
+            page_size,
+            count_mode=self.get_count_mode(request),
+            cache_key=self.get_count_cache_key(queryset, request),
+            cache_timeout=self.count_cache_timeout,
+            approximate_count_limit=self.approximate_count_limit,
+        )
+        page_number = request.query_params.get(self.page_query_param) or 1
+        if page_number in self.last_page_strings:
+            if paginator.count is None or not paginator.count_is_exact:
+                raise NotFound(
+                    self.invalid_page_message.format(
+                        page_number=page_number,
+                        message="The last page is unknown without a count.",
+                    )
+                )
+            page_number = paginator.num_pages
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+
+        if self.template is not None and self.page.has_other_pages():
+            self.display_page_controls = True
+
+        return list(self.page)
+
+    def get_count_mode(self, request):
+        value = request.query_params.get(self.count_query_param, "")
+        value = value.lower()
+        if value in ("false", "0", "no"):
+            return COUNT_NONE
+        if value == COUNT_APPROXIMATE:
+            return COUNT_APPROXIMATE
+        return COUNT_EXACT
+
+    def get_count_cache_key(self, queryset, request):
+        if self.get_count_mode(request) == COUNT_NONE:
+            return None
+        user_id = getattr(request.user, "pk", None)
+        if user_id is None:
+            return None
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        digest = md5(
+            repr((sql, params)).encode(), usedforsecurity=False
+        ).hexdigest()
+        version = get_task_version(user_id)
+        return f"tasks:count:{user_id}:{version}:{digest}"
+
+    def get_paginated_response(self, data):
+        paginator = self.page.paginator
+        response = {
+            "links": {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+            },
+            "total_objects": paginator.count,
+            "total_pages": (
+                None if paginator.count is None else paginator.num_pages
+            ),
+            "results": data,
+        }
+        if paginator.count_mode == COUNT_APPROXIMATE:
+            response["total_is_exact"] = paginator.count_is_exact
+        return Response(response)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over the queryset's ordering.
+
+    The sort key is taken from the queryset, so it follows
+    `Meta.ordering`, the `ordering` query parameter and the search
+    ranking, and is completed
+    with the primary key to make it unique. Pages are fetched with range
+    conditions on the sort key instead of an OFFSET, so they cost the same
+    no matter how deep they are and are not shifted by inserted rows.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        self.annotations = queryset.query.annotations
+        self.nulls_largest = connections[
+            queryset.db
+        ].features.nulls_order_largest
+        self.ordering = self.get_ordering(queryset)
+        position, self.reverse = self.decode_cursor(request)
+        self.has_cursor = position is not None
+
+        queryset = queryset.order_by(
+            *[
+                f"-{name}" if desc != self.reverse else name
+                for name, desc in self.ordering
+            ]
+        )
+        limit = self.page_size + 1
+        if position is None:
+            results = list(queryset[:limit])
+        else:
+            results = []
+            for condition in self.get_after_filters(position):
+                results += queryset.filter(condition)[: limit - len(results)]
+                if len(results) == limit:
+                    break
+
+        self.has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if self.reverse:
+            results.reverse()
+        self.page = results
+        return results
 
     def get_paginated_response(self, data):
         return Response(
@@ -19,8 +298,184 @@ class DefaultPagination(PageNumberPagination):
                     "next": self.get_next_link(),
                     "previous": self.get_previous_link(),
                 },
-                "total_objects": self.page.paginator.count,
-                "total_pages": self.page.paginator.num_pages,
                 "results": data,
             }
         )
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_ordering(self, queryset):
+        """
+        Return the sort key as a list of `(field name, descending)` pairs.
+        """
+        query = queryset.query
+        ordering = query.order_by or (
+            query.get_meta().ordering if query.default_ordering else []
+        )
+        fields = []
+        for item in ordering:
+            if not isinstance(item, str):
+                raise ValueError(
+                    "Keyset pagination only supports ordering by field names."
+                )
+            name = item.lstrip("-")
+            if name == "pk":
+                name = self.model._meta.pk.name
+            fields.append((name, item.startswith("-")))
+
+        pk_name = self.model._meta.pk.name
+        if pk_name not in [name for name, _ in fields]:
+            # Index entries are implicitly ordered by the primary key in the
+            # scan direction, which follows the first field.
+            desc = fields[0][1] if fields else False
+            fields.append((pk_name, desc))
+        return fields
+
+    def get_field(self, name):
+        """
+        Return the model field or annotation output field named `name`.
+        """
+        if name in self.annotations:
+            return self.annotations[name].output_field
+        return self.model._meta.get_field(name)
+
+    def get_after_filters(self, position):
+        """
+        Yield filters selecting the rows that come after `position`.
+
+        The row comparison `(a, b, c) > (x, y, z)` is split into
+        `a = x AND b = y AND c > z`, then `a = x AND b > y`, then `a > x`.
+        Each of these is an equality prefix followed by a single range, so
+        every query is an index seek, and they are yielded in traversal
+        order so the caller can stop as soon as the page is full.
+        """
+        for i in reversed(range(len(self.ordering))):
+            prefix = Q()
+            for (name, _), value in zip(self.ordering[:i], position[:i]):
+                if value is None:
+                    prefix &= Q(**{f"{name}__isnull": True})
+                else:
+                    prefix &= Q(**{name: value})
+
+            name, desc = self.ordering[i]
+            for condition in self.get_field_after_filters(
+                name, desc, position[i]
+            ):
+                yield prefix & condition
+
+    def get_field_after_filters(self, name, desc, value):
+        desc = desc != self.reverse
+        # NULLs sort where the database puts them, so that the ORDER BY
+        # still matches the indexes.
+        nulls_first = desc == self.nulls_largest
+        if value is None:
+            if nulls_first:
+                yield Q(**{f"{name}__isnull": False})
+            return
+
+        yield Q(**{f"{name}__{'lt' if desc else 'gt'}": value})
+        if not nulls_first and self.get_field(name).null:
+            yield Q(**{f"{name}__isnull": True})
+
+    def get_next_link(self):
+        if self.reverse:
+            has_next = self.has_cursor
+        else:
+            has_next = self.has_more
+        if not has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if self.reverse:
+            has_previous = self.has_more
+        else:
+            has_previous = self.has_cursor
+        if not has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, instance, reverse):
+        position = []
+        for name, _ in self.ordering:
+            if name not in self.annotations:
+                name = self.get_field(name).attname
+            value = getattr(instance, name)
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            position.append(value)
+
+        payload = {
+            "o": self.get_ordering_signature(),
+            "p": position,
+            "r": int(reverse),
+        }
+        encoded = urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        ).decode("ascii")
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        """
+        Return the `(position, reverse)` pair stored in the cursor.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            if payload["o"] != self.get_ordering_signature():
+                raise ValueError("Cursor does not match the ordering.")
+            if len(payload["p"]) != len(self.ordering):
+                raise ValueError("Cursor does not match the ordering.")
+            position = [
+                (
+                    None
+                    if value is None
+                    else self.get_field(name).to_python(value)
+                )
+                for (name, _), value in zip(self.ordering, payload["p"])
+            ]
+            return position, bool(payload["r"])
+        except (
+            TypeError,
+            ValueError,
+            KeyError,
+            FieldDoesNotExist,
+            ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_ordering_signature(self):
+        return [f"-{name}" if desc else name for name, desc in self.ordering]
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "The pagination cursor value. Pass an empty value to "
+                    "start paginating with cursors."
+                ),
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
@@ -1,7 +1,83 @@
+from django.utils import timezone
 from rest_framework import serializers
+from ToDo.cache import tasks_changed
 from ToDo.models import Task
 
 
+class TaskListSerializer(serializers.ListSerializer):
+    """
+    Validates and writes lists of tasks with one query per batch.
+
+    For creation the items are plain task payloads. For updates
+    `instance` is a dict mapping task ids to tasks and every item must
+    carry the `id` of one of them. Validation errors are reported per
+    item, in the order of the input list.
+    """
+
+    batch_size = 500
+
+    default_error_messages = {
+        "missing_id": "This field is required.",
+        "does_not_exist": "Task {pk} does not exist.",
+        "duplicate_id": "Task {pk} appears more than once.",
+    }
+
+    def to_internal_value(self, data):
+        self._seen_ids = set()
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+
+        pk = data.get("id") if isinstance(data, dict) else None
+        if pk is None:
+            raise serializers.ValidationError(
+                {"id": [self.error_messages["missing_id"]]}
+            )
+        task = self.instance.get(pk)
+        if task is None:
+            message = self.error_messages["does_not_exist"]
+            raise serializers.ValidationError({"id": [message.format(pk=pk)]})
+        if task.pk in self._seen_ids:
+            message = self.error_messages["duplicate_id"]
+            raise serializers.ValidationError({"id": [message.format(pk=pk)]})
+        self._seen_ids.add(task.pk)
+
+        self.child.instance = task
+        self.child.initial_data = data
+        validated = super().run_child_validation(data)
+        return {**validated, "id": task.pk}
+
+    def create(self, validated_data):
+        user_id = self.context["request"].user.pk
+        tasks = Task.objects.bulk_create(
+            [Task(**attrs, user_id=user_id) for attrs in validated_data],
+            batch_size=self.batch_size,
+        )
+        tasks_changed(user_id)
+        return tasks
+
+    def update(self, instance, validated_data):
+        now = timezone.now()
+        fields = {"updated_at"}
+        tasks = []
+        for attrs in validated_data:
+            task = instance[attrs.pop("id")]
+            for field, value in attrs.items():
+                setattr(task, field, value)
+            task.updated_at = now
+            fields.update(attrs)
+            tasks.append(task)
+
+        Task.objects.bulk_update(
+            tasks, sorted(fields), batch_size=self.batch_size
+        )
+        for user_id in {task.user_id for task in tasks}:
+            tasks_changed(user_id)
+        return tasks
+
+
 class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
@@ -16,7 +92,36 @@ class TaskSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["user", "completed", "craeted_at", "updated_at"]
+        list_serializer_class = TaskListSerializer
 
     def create(self, validated_data):
-        validated_data["user"] = self.context["request"].user
+        validated_data["user_id"] = self.context["request"].user.pk
         return super().create(validated_data)
+
+
+class TaskBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False
+    )
+
+    def validate_ids(self, ids):
+        max_length = self.context.get("max_length")
+        if max_length is not None and len(ids) > max_length:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {max_length} elements."
+            )
+        return ids
+
+
+class TaskBulkStatusSerializer(TaskBulkDeleteSerializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False
+    )
+    overdue = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        if "ids" not in attrs and not attrs.get("overdue"):
+            raise serializers.ValidationError(
+                "Either `ids` or `overdue` is required."
+            )
+        return attrs
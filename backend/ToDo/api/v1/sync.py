@@ -0,0 +1,172 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.pagination import _positive_int
+from rest_framework.response import Response
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = (
+        "The sync cursor has expired, fetch the changes again without it."
+    )
+    default_code = "cursor_expired"
+
+
+class TaskChangeFeed:
+    """
+    Pages through the tasks changed and deleted since a sync cursor.
+
+    The feed walks two streams in `(timestamp, id)` order: tasks by
+    `updated_at` and tombstones by `deleted_at`. The opaque cursor holds
+    the position reached in each stream and when it was issued. Without a
+    cursor every task is returned and deletions are only reported from
+    then on. Clients call the feed again with the returned cursor while
+    `has_more` is true, and keep the last cursor for the next sync.
+
+    Timestamps are taken before the write commits and on different
+    servers, so a row can become visible behind a position already
+    handed out. The last cursor of a sync is therefore moved back to
+    `TASK_CHANGE_FEED_OVERLAP` before it was issued, and the next sync
+    scans that window again. Rows in it may be reported twice; clients
+    apply changes by task id, so repeats are harmless.
+
+    Tombstones are kept for `TASK_TOMBSTONE_RETENTION`, so older cursors
+    could miss deletions and are rejected with 410.
+    """
+
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    cursor_query_param = "since"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate(self, request, tasks, tombstones):
+        """
+        Return the changed tasks and the deleted task ids of the page.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.issued_at = timezone.now()
+        task_position, tombstone_position = self.decode_cursor(request)
+        if task_position is None and tombstone_position is None:
+            tombstone_position = (self.issued_at, 0)
+
+        self.has_more = False
+        changed = self.get_page(tasks, "updated_at", task_position)
+        deleted = self.get_page(tombstones, "deleted_at", tombstone_position)
+        if changed:
+            task_position = (changed[-1].updated_at, changed[-1].pk)
+        if deleted:
+            tombstone_position = (deleted[-1].deleted_at, deleted[-1].pk)
+        if not self.has_more:
+            # Only once the sync is complete, so that its pages still
+            # move forward.
+            horizon = (self.issued_at - settings.TASK_CHANGE_FEED_OVERLAP, 0)
+            if task_position is not None:
+                task_position = min(task_position, horizon)
+            tombstone_position = min(tombstone_position, horizon)
+        self.cursor = self.encode_cursor(task_position, tombstone_position)
+        return changed, [tombstone.task_id for tombstone in deleted]
+
+    def get_page(self, queryset, field, position):
+        """
+        Return up to `page_size` rows after `position` on `(field, id)`.
+
+        A row more is fetched so that `has_more` is only set when there
+        is something left.
+        """
+        queryset = queryset.order_by(field, "pk")
+        limit = self.page_size + 1
+        if position is None:
+            results = list(queryset[:limit])
+        else:
+            value, pk = position
+            results = list(
+                queryset.filter(**{field: value}, pk__gt=pk)[:limit]
+            )
+            remaining = limit - len(results)
+            if remaining:
+                later = queryset.filter(**{f"{field}__gt": value})
+                results += later[:remaining]
+        if len(results) > self.page_size:
+            results.pop()
+            self.has_more = True
+        return results
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def encode_cursor(self, task_position, tombstone_position):
+        payload = {
+            "s": self.issued_at.isoformat(),
+            "t": self.encode_position(task_position),
+            "d": self.encode_position(tombstone_position),
+        }
+        return urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        ).decode("ascii")
+
+    def encode_position(self, position):
+        if position is None:
+            return None
+        value, pk = position
+        return [value.isoformat(), pk]
+
+    def decode_cursor(self, request):
+        """
+        Return the positions in the task and tombstone streams.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, None
+
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            issued_at = self.decode_datetime(payload["s"])
+            task_position = self.decode_position(payload["t"])
+            tombstone_position = self.decode_position(payload["d"])
+            if tombstone_position is None:
+                raise ValueError("Cursor has no tombstone position.")
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if issued_at < self.issued_at - settings.TASK_TOMBSTONE_RETENTION:
+            raise CursorExpired()
+        return task_position, tombstone_position
+
+    def decode_position(self, position):
+        if position is None:
+            return None
+        value, pk = position
+        if not isinstance(pk, int):
+            raise TypeError("Invalid cursor position.")
+        return self.decode_datetime(value), pk
+
+    def decode_datetime(self, value):
+        value = parse_datetime(value)
+        if value is None or timezone.is_naive(value):
+            raise ValueError("Invalid cursor timestamp.")
+        return value
+
+    def get_response(self, changed, deleted):
+        return Response(
+            {
+                "changed": changed,
+                "deleted": deleted,
+                "cursor": self.cursor,
+                "has_more": self.has_more,
+            }
+        )
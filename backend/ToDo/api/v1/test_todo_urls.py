@@ -1,10 +1,29 @@
 import pytest
-from django.urls import reverse
+from datetime import timedelta
+from io import StringIO
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse, reverse_lazy
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
+from rest_framework_simplejwt.tokens import RefreshToken
 from Account.models import User
-from ToDo.models import Task
+from Account.verification import get_rejection_stats
+from ToDo.models import Task, TaskTombstone
+from ToDo.api.v1.paginations import DefaultPagination
+from ToDo.cache import get_list_cache_stats, tasks_changed
+from ToDo.api.v1.views import TasksViewSet
+from ToDo.search import get_search_backend
+from ToDo.seeding import TaskSeeder
+from ToDo.views import TaskListView
+from ToDoApp.db import is_pinned_to_primary, read_from_replica
 
 
 @pytest.fixture
@@ -300,3 +319,1285 @@ class TestTask:
         response: Response = api_client.patch(url)
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert response.data["detail"] == "Task is not completed yet."
+
+
+@pytest.mark.django_db
+class TestTaskKeysetPagination:
+    @pytest.fixture
+    def tasks(self, verified_user: User) -> list:
+        tasks = []
+        for i in range(25):
+            tasks.append(
+                Task.objects.create(
+                    title=f"Task {i}",
+                    due_date=(
+                        None
+                        if i % 4 == 0
+                        else f"2024-01-{i % 7 + 1:02d}T00:00Z"
+                    ),
+                    completed=i % 3 == 0,
+                    user=verified_user,
+                )
+            )
+        return tasks
+
+    def walk(self, api_client: APIClient, url: str, link: str) -> list:
+        pages = []
+        while url:
+            response: Response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            pages.append([task["id"] for task in response.data["results"]])
+            url = response.data["links"][link]
+        return pages
+
+    def test_pages_follow_meta_ordering(
+        self, api_client: APIClient, verified_user: User, tasks: list
+    ):
+        api_client.force_authenticate(user=verified_user)
+        url = reverse("ToDo:tasks-list") + "?cursor=&page_size=4"
+        pages = self.walk(api_client, url, "next")
+        expected = list(
+            Task.objects.filter(user=verified_user).values_list(
+                "id", flat=True
+            )
+        )
+        assert len(pages) == 7
+        assert sum(pages, []) == expected
+
+    def test_previous_links_walk_back(
+        self, api_client: APIClient, verified_user: User, tasks: list
+    ):
+        api_client.force_authenticate(user=verified_user)
+        url = reverse("ToDo:tasks-list") + "?cursor=&page_size=4"
+        forward = self.walk(api_client, url, "next")
+
+        response: Response = api_client.get(url)
+        while response.data["links"]["next"]:
+            response = api_client.get(response.data["links"]["next"])
+        backward = self.walk(
+            api_client, response.data["links"]["previous"], "previous"
+        )
+        assert backward[::-1] == forward[:-1]
+
+    def test_filters_and_ordering(
+        self, api_client: APIClient, verified_user: User, tasks: list
+    ):
+        api_client.force_authenticate(user=verified_user)
+        url = "{}?cursor=&page_size=3&completed=false&ordering=due_date"
+        url = url.format(reverse("ToDo:tasks-list"))
+        ids = sum(self.walk(api_client, url, "next"), [])
+        expected = list(
+            Task.objects.filter(user=verified_user, completed=False)
+            .order_by("due_date", "id")
+            .values_list("id", flat=True)
+        )
+        assert ids == expected
+
+    def test_cursor_is_stable_on_insert(
+        self, api_client: APIClient, verified_user: User, tasks: list
+    ):
+        api_client.force_authenticate(user=verified_user)
+        url = reverse("ToDo:tasks-list") + "?cursor=&page_size=5"
+        response: Response = api_client.get(url)
+        first_page = [task["id"] for task in response.data["results"]]
+        Task.objects.create(
+            title="New Task",
+            due_date="2030-01-01T00:00Z",
+            user=verified_user,
+        )
+        response = api_client.get(response.data["links"]["next"])
+        second_page = [task["id"] for task in response.data["results"]]
+        assert not set(first_page) & set(second_page)
+
+    def test_invalid_cursor(self, api_client: APIClient, verified_user: User):
+        api_client.force_authenticate(user=verified_user)
+        url = reverse("ToDo:tasks-list") + "?cursor=invalid"
+        response: Response = api_client.get(url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestTaskCountCaching:
+    def count_queries(self, captured) -> int:
+        return sum("COUNT(" in query["sql"] for query in captured)
+
+    def test_count_is_cached_until_tasks_change(
+        self,
+        api_client: APIClient,
+        incompleted_task: Task,
+        django_assert_max_num_queries,
+    ):
+        url = reverse("ToDo:tasks-list")
+        api_client.force_authenticate(user=incompleted_task.user)
+        with django_assert_max_num_queries(10) as captured:
+            response: Response = api_client.get(url)
+        assert response.data["total_objects"] == 1
+        assert self.count_queries(captured) == 1
+
+        with django_assert_max_num_queries(10) as captured:
+            response = api_client.get(url)
+        assert response.data["total_objects"] == 1
+        assert self.count_queries(captured) == 0
+
+        api_client.patch(
+            reverse("ToDo:tasks-tasks-complete", args=[incompleted_task.id])
+        )
+        response = api_client.get(url + "?completed=false")
+        assert response.data["total_objects"] == 0
+
+        api_client.post(url, {"title": "Another Task"})
+        response = api_client.get(url)
+        assert response.data["total_objects"] == 2
+
+    def test_count_false_skips_count(
+        self,
+        api_client: APIClient,
+        incompleted_task: Task,
+        django_assert_max_num_queries,
+    ):
+        url = reverse("ToDo:tasks-list") + "?count=false&page_size=1"
+        api_client.force_authenticate(user=incompleted_task.user)
+        Task.objects.create(title="Another Task", user=incompleted_task.user)
+        with django_assert_max_num_queries(10) as captured:
+            response: Response = api_client.get(url)
+        assert self.count_queries(captured) == 0
+        assert response.data["total_objects"] is None
+        assert response.data["total_pages"] is None
+        assert len(response.data["results"]) == 1
+        assert response.data["links"]["next"] is not None
+
+        response = api_client.get(response.data["links"]["next"])
+        assert len(response.data["results"]) == 1
+        assert response.data["links"]["next"] is None
+
+    def test_count_approximate(
+        self, api_client: APIClient, incompleted_task: Task, monkeypatch
+    ):
+        monkeypatch.setattr(DefaultPagination, "approximate_count_limit", 2)
+        for i in range(3):
+            Task.objects.create(title=f"Task {i}", user=incompleted_task.user)
+        url = reverse("ToDo:tasks-list") + "?count=approximate&page_size=1"
+        api_client.force_authenticate(user=incompleted_task.user)
+        response: Response = api_client.get(url)
+        assert response.data["total_objects"] == 2
+        assert response.data["total_is_exact"] is False
+
+        response = api_client.get(url + "&page=4")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["links"]["next"] is None
+
+
+@pytest.mark.django_db
+class TestTaskSearch:
+    def search(self, api_client: APIClient, query: str) -> list:
+        url = reverse("ToDo:tasks-list")
+        response: Response = api_client.get(url, {"search": query})
+        assert response.status_code == status.HTTP_200_OK
+        return [task["title"] for task in response.data["results"]]
+
+    def test_search_uses_full_text_backend(self):
+        assert get_search_backend().ranked
+
+    def test_search_matches_title_and_description(
+        self, api_client: APIClient, verified_user: User
+    ):
+        Task.objects.create(title="Buy groceries", user=verified_user)
+        Task.objects.create(
+            title="Call mom",
+            description="Ask about the groceries list",
+            user=verified_user,
+        )
+        Task.objects.create(title="Write report", user=verified_user)
+        api_client.force_authenticate(user=verified_user)
+        assert sorted(self.search(api_client, "grocer")) == [
+            "Buy groceries",
+            "Call mom",
+        ]
+        assert self.search(api_client, "groceries list") == ["Call mom"]
+        assert self.search(api_client, '"unbalanced') == []
+
+    def test_search_ranks_results(
+        self, api_client: APIClient, verified_user: User
+    ):
+        Task.objects.create(
+            title="Report",
+            description="A long description that mentions nothing else",
+            user=verified_user,
+        )
+        Task.objects.create(
+            title="Report report", description="report", user=verified_user
+        )
+        api_client.force_authenticate(user=verified_user)
+        assert self.search(api_client, "report") == [
+            "Report report",
+            "Report",
+        ]
+
+    def test_search_index_follows_writes(
+        self, api_client: APIClient, verified_user: User
+    ):
+        task = Task.objects.create(title="Old title", user=verified_user)
+        other = Task.objects.create(title="Old news", user=verified_user)
+        api_client.force_authenticate(user=verified_user)
+        task.title = "New title"
+        task.save()
+        other.delete()
+        assert self.search(api_client, "old") == []
+        assert self.search(api_client, "new") == ["New title"]
+
+    def test_index_is_only_rewritten_on_changes(self, verified_user: User):
+        task = Task.objects.create(title="Title", user=verified_user)
+
+        def count_changes(write) -> int:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT total_changes()")
+                [(before,)] = cursor.fetchall()
+                write()
+                cursor.execute("SELECT total_changes()")
+                [(after,)] = cursor.fetchall()
+            return after - before
+
+        # The task row only.
+        assert count_changes(task.save) == 1
+        task.title = "New title"
+        assert count_changes(task.save) > 1
+
+    def test_migrate_recreates_lost_triggers(
+        self, api_client: APIClient, verified_user: User
+    ):
+        task = Task.objects.create(title="Old title", user=verified_user)
+        # As after a migration that rebuilt the task table.
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER "ToDo_task_fts_au"')
+        Task.objects.filter(pk=task.pk).update(title="Lost title")
+        call_command("migrate", verbosity=0)
+
+        task.title = "New title"
+        task.save()
+        api_client.force_authenticate(user=verified_user)
+        assert self.search(api_client, "lost") == []
+        assert self.search(api_client, "new") == ["New title"]
+
+    def test_search_is_scoped_to_user(
+        self, api_client: APIClient, verified_user: User
+    ):
+        other_user = User.objects.create_user(
+            email="other@example.com", password="pass@1234*"
+        )
+        Task.objects.create(title="Secret plan", user=other_user)
+        api_client.force_authenticate(user=verified_user)
+        assert self.search(api_client, "secret") == []
+
+    def test_search_with_keyset_pagination(
+        self, api_client: APIClient, verified_user: User
+    ):
+        for i in range(7):
+            Task.objects.create(
+                title="Meeting " + "notes " * i, user=verified_user
+            )
+        api_client.force_authenticate(user=verified_user)
+        url = reverse("ToDo:tasks-list")
+        response: Response = api_client.get(
+            url, {"search": "notes", "cursor": "", "page_size": 2}
+        )
+        titles = []
+        while True:
+            titles += [task["title"] for task in response.data["results"]]
+            if not response.data["links"]["next"]:
+                break
+            response = api_client.get(response.data["links"]["next"])
+        assert len(titles) == len(set(titles)) == 6
+
+
+@pytest.mark.django_db
+class TestTaskBulk:
+    url = reverse_lazy("ToDo:tasks-tasks-bulk")
+
+    @pytest.fixture
+    def client(self, api_client: APIClient, verified_user: User):
+        api_client.force_authenticate(user=verified_user)
+        return api_client
+
+    @pytest.fixture
+    def tasks(self, verified_user: User) -> list:
+        return Task.objects.bulk_create(
+            Task(user=verified_user, title=f"Task {i}") for i in range(3)
+        )
+
+    def test_bulk_requires_verified_user(
+        self, api_client: APIClient, unverified_user: User
+    ):
+        api_client.force_authenticate(user=unverified_user)
+        response = api_client.post(self.url, [{"title": "A"}], format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_bulk_create(
+        self,
+        client: APIClient,
+        verified_user: User,
+        django_assert_max_num_queries,
+    ):
+        data = [{"title": f"Task {i}"} for i in range(50)]
+        with django_assert_max_num_queries(5):
+            response = client.post(self.url, data, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data) == 50
+        assert all(item["id"] for item in response.data)
+        assert all(item["user"] == verified_user.pk for item in response.data)
+        assert verified_user.tasks.count() == 50
+
+    def test_bulk_create_reports_errors_per_item(
+        self, client: APIClient, verified_user: User
+    ):
+        data = [{"title": "Valid"}, {"description": "No title"}]
+        response = client.post(self.url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[0] == {}
+        assert "title" in response.data[1]
+        assert not verified_user.tasks.exists()
+
+    def test_bulk_create_limit(self, client: APIClient, monkeypatch):
+        monkeypatch.setattr(TasksViewSet, "bulk_max_size", 2)
+        data = [{"title": "Task"}] * 3
+        response = client.post(self.url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_update(
+        self, client: APIClient, tasks: list, django_assert_max_num_queries
+    ):
+        data = [
+            {"id": task.pk, "title": f"Renamed {task.pk}"} for task in tasks
+        ]
+        with django_assert_max_num_queries(5):
+            response = client.patch(self.url, data, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        for task in tasks:
+            task.refresh_from_db()
+            assert task.title == f"Renamed {task.pk}"
+
+    def test_bulk_update_reports_errors_per_item(
+        self, client: APIClient, tasks: list
+    ):
+        other = User.objects.create_user(
+            email="other@example.com", password="pass@1234*"
+        )
+        foreign = Task.objects.create(user=other, title="Foreign")
+        data = [
+            {"id": tasks[0].pk, "title": "Renamed"},
+            {"id": foreign.pk, "title": "Stolen"},
+            {"title": "No id"},
+            {"id": tasks[0].pk, "title": ""},
+        ]
+        response = client.patch(self.url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[0] == {}
+        assert "id" in response.data[1]
+        assert "id" in response.data[2]
+        assert "id" in response.data[3]
+        tasks[0].refresh_from_db()
+        foreign.refresh_from_db()
+        assert tasks[0].title == "Task 0"
+        assert foreign.title == "Foreign"
+
+    def test_bulk_delete(self, client: APIClient, tasks: list):
+        ids = [task.pk for task in tasks[:2]]
+        response = client.delete(self.url, {"ids": ids}, format="json")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert list(Task.objects.values_list("pk", flat=True)) == [tasks[2].pk]
+
+    def test_bulk_delete_marks_tasks_changed_once(
+        self, client: APIClient, tasks: list, monkeypatch
+    ):
+        changed = []
+        monkeypatch.setattr("ToDo.models.tasks_changed", changed.append)
+        monkeypatch.setattr("ToDo.signals.tasks_changed", changed.append)
+        ids = [task.pk for task in tasks]
+        client.delete(self.url, {"ids": ids}, format="json")
+        assert changed == [tasks[0].user_id]
+
+    def test_bulk_delete_unknown_id(self, client: APIClient, tasks: list):
+        ids = [tasks[0].pk, 0]
+        response = client.delete(self.url, {"ids": ids}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.data["ids"]) == [1]
+        assert Task.objects.count() == 3
+
+    def test_bulk_writes_invalidate_cached_counts(
+        self, client: APIClient, tasks: list
+    ):
+        list_url = reverse("ToDo:tasks-list")
+        assert client.get(list_url).data["total_objects"] == 3
+        client.post(self.url, [{"title": "New"}], format="json")
+        assert client.get(list_url).data["total_objects"] == 4
+
+
+@pytest.mark.django_db
+class TestTaskBulkStatus:
+    complete_url = reverse_lazy("ToDo:tasks-tasks-bulk-complete")
+    restore_url = reverse_lazy("ToDo:tasks-tasks-bulk-restore")
+
+    @pytest.fixture
+    def client(self, api_client: APIClient, verified_user: User):
+        api_client.force_authenticate(user=verified_user)
+        return api_client
+
+    @pytest.fixture
+    def tasks(self, verified_user: User) -> dict:
+        now = timezone.now()
+        return {
+            "overdue": Task.objects.create(
+                user=verified_user,
+                title="Overdue",
+                due_date=now - timedelta(days=1),
+            ),
+            "upcoming": Task.objects.create(
+                user=verified_user,
+                title="Upcoming",
+                due_date=now + timedelta(days=1),
+            ),
+            "done": Task.objects.create(
+                user=verified_user,
+                title="Done",
+                due_date=now - timedelta(days=1),
+                completed=True,
+            ),
+        }
+
+    def completed(self) -> set:
+        return set(
+            Task.objects.filter(completed=True).values_list("title", flat=True)
+        )
+
+    def test_complete_by_ids(
+        self, client: APIClient, tasks: dict, django_assert_num_queries
+    ):
+        ids = [tasks["upcoming"].pk, tasks["done"].pk]
+        with django_assert_num_queries(4):
+            response = client.patch(
+                self.complete_url, {"ids": ids}, format="json"
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["ids"] == [tasks["upcoming"].pk]
+        assert self.completed() == {"Upcoming", "Done"}
+
+    def test_complete_updates_the_selected_rows(
+        self, client: APIClient, tasks: dict
+    ):
+        with CaptureQueriesContext(connection) as captured:
+            response = client.patch(
+                self.complete_url, {"overdue": True}, format="json"
+            )
+        assert response.data["ids"] == [tasks["overdue"].pk]
+        updates = [
+            query["sql"]
+            for query in captured.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        assert len(updates) == 1
+        assert f'"id" IN ({tasks["overdue"].pk})' in updates[0]
+
+    def test_complete_overdue(self, client: APIClient, tasks: dict):
+        response = client.patch(
+            self.complete_url, {"overdue": True}, format="json"
+        )
+        assert response.data["ids"] == [tasks["overdue"].pk]
+        assert self.completed() == {"Overdue", "Done"}
+
+    def test_restore_with_query_filters(self, client: APIClient, tasks: dict):
+        client.patch(self.complete_url, {"overdue": True}, format="json")
+        response = client.patch(
+            f"{self.restore_url}?title=Done", {"overdue": True}, format="json"
+        )
+        assert response.data["ids"] == [tasks["done"].pk]
+        assert self.completed() == {"Overdue"}
+
+    def test_requires_selection(self, client: APIClient, tasks: dict):
+        response = client.patch(self.complete_url, {}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Task.objects.filter(title="Upcoming", completed=True)
+
+    def test_ignores_other_users_tasks(self, client: APIClient):
+        other = User.objects.create_user(
+            email="other@example.com", password="pass@1234*"
+        )
+        task = Task.objects.create(user=other, title="Foreign")
+        response = client.patch(
+            self.complete_url, {"ids": [task.pk]}, format="json"
+        )
+        assert response.data["ids"] == []
+        task.refresh_from_db()
+        assert task.completed is False
+
+    def test_invalidates_cached_counts(self, client: APIClient, tasks: dict):
+        list_url = reverse("ToDo:tasks-list") + "?completed=true"
+        assert client.get(list_url).data["total_objects"] == 1
+        client.patch(self.complete_url, {"overdue": True}, format="json")
+        assert client.get(list_url).data["total_objects"] == 2
+
+    def test_single_toggle_only_writes_status(
+        self, client: APIClient, tasks: dict
+    ):
+        url = reverse("ToDo:tasks-tasks-complete", args=[tasks["overdue"].pk])
+        with CaptureQueriesContext(connection) as captured:
+            client.patch(url)
+        updates = [
+            query["sql"]
+            for query in captured.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        assert len(updates) == 1
+        assert '"title"' not in updates[0]
+        assert '"completed"' in updates[0]
+        assert '"updated_at"' in updates[0]
+
+
+@pytest.mark.django_db
+class TestTaskConditionalRequests:
+    @pytest.fixture
+    def client(self, api_client: APIClient, verified_user: User):
+        api_client.force_authenticate(user=verified_user)
+        return api_client
+
+    def test_list_not_modified(
+        self,
+        client: APIClient,
+        incompleted_task: Task,
+        django_assert_num_queries,
+    ):
+        url = reverse("ToDo:tasks-list")
+        response = client.get(url)
+        etag = response.headers["ETag"]
+        assert response.headers["Last-Modified"]
+
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+
+    def test_list_etag_changes_with_tasks_and_params(
+        self, client: APIClient, incompleted_task: Task
+    ):
+        url = reverse("ToDo:tasks-list")
+        etag = client.get(url).headers["ETag"]
+        assert client.get(url + "?completed=true").headers["ETag"] != etag
+
+        client.patch(
+            reverse("ToDo:tasks-tasks-complete", args=[incompleted_task.id])
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+
+    def test_detail_not_modified(
+        self,
+        client: APIClient,
+        incompleted_task: Task,
+        django_assert_num_queries,
+    ):
+        url = reverse("ToDo:tasks-detail", args=[incompleted_task.id])
+        etag = client.get(url).headers["ETag"]
+
+        with django_assert_num_queries(1):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        client.patch(url, {"title": "Changed"})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["title"] == "Changed"
+
+    def test_detail_of_other_user(
+        self, api_client: APIClient, incompleted_task: Task
+    ):
+        other = User.objects.create_user(
+            email="other@example.com", password="pass@1234*", is_verified=True
+        )
+        api_client.force_authenticate(user=other)
+        url = reverse("ToDo:tasks-detail", args=[incompleted_task.id])
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_if_match(self, client: APIClient, incompleted_task: Task):
+        url = reverse("ToDo:tasks-detail", args=[incompleted_task.id])
+        etag = client.get(url).headers["ETag"]
+
+        response = client.patch(url, {"title": "First"}, HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+        assert client.get(url).headers["ETag"] == response.headers["ETag"]
+
+        response = client.patch(url, {"title": "Second"}, HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        incompleted_task.refresh_from_db()
+        assert incompleted_task.title == "First"
+
+
+@pytest.mark.django_db
+class TestTaskChanges:
+    url = reverse_lazy("ToDo:tasks-tasks-changes")
+
+    @pytest.fixture
+    def client(self, api_client: APIClient, verified_user: User):
+        api_client.force_authenticate(user=verified_user)
+        return api_client
+
+    @pytest.fixture(autouse=True)
+    def no_overlap(self, settings):
+        settings.TASK_CHANGE_FEED_OVERLAP = timedelta(0)
+
+    def sync(self, client: APIClient, cursor=None, **params) -> dict:
+        if cursor:
+            params["since"] = cursor
+        response = client.get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return response.data
+
+    def test_initial_sync_returns_all_tasks(
+        self, client: APIClient, verified_user: User
+    ):
+        tasks = Task.objects.bulk_create(
+            Task(user=verified_user, title=f"Task {i}") for i in range(5)
+        )
+        data = self.sync(client, page_size=3)
+        assert data["has_more"] is True
+        assert data["deleted"] == []
+        rest = self.sync(client, data["cursor"], page_size=3)
+        assert rest["has_more"] is False
+        ids = [task["id"] for task in data["changed"] + rest["changed"]]
+        assert sorted(ids) == sorted(task.pk for task in tasks)
+
+    def test_returns_only_changes_since_cursor(
+        self, client: APIClient, verified_user: User
+    ):
+        first, second, third = Task.objects.bulk_create(
+            Task(user=verified_user, title=f"Task {i}") for i in range(3)
+        )
+        cursor = self.sync(client)["cursor"]
+        assert self.sync(client, cursor)["changed"] == []
+
+        client.patch(
+            reverse("ToDo:tasks-detail", args=[first.pk]), {"title": "New"}
+        )
+        client.delete(reverse("ToDo:tasks-detail", args=[second.pk]))
+        created = client.post(reverse("ToDo:tasks-list"), {"title": "Add"})
+
+        data = self.sync(client, cursor)
+        assert [task["id"] for task in data["changed"]] == [
+            first.pk,
+            created.data["id"],
+        ]
+        assert data["deleted"] == [second.pk]
+        assert data["has_more"] is False
+
+        data = self.sync(client, data["cursor"])
+        assert data["changed"] == []
+        assert data["deleted"] == []
+
+    def test_bulk_changes_are_reported(
+        self, client: APIClient, verified_user: User
+    ):
+        tasks = Task.objects.bulk_create(
+            Task(user=verified_user, title=f"Task {i}") for i in range(3)
+        )
+        cursor = self.sync(client)["cursor"]
+        client.patch(
+            reverse("ToDo:tasks-tasks-bulk-complete"),
+            {"ids": [tasks[0].pk]},
+            format="json",
+        )
+        client.delete(
+            reverse("ToDo:tasks-tasks-bulk"),
+            {"ids": [tasks[1].pk]},
+            format="json",
+        )
+        data = self.sync(client, cursor)
+        assert [task["id"] for task in data["changed"]] == [tasks[0].pk]
+        assert data["deleted"] == [tasks[1].pk]
+
+    def test_late_commits_are_reported(
+        self, client: APIClient, verified_user: User, settings
+    ):
+        settings.TASK_CHANGE_FEED_OVERLAP = timedelta(minutes=1)
+        Task.objects.create(user=verified_user, title="Committed first")
+        cursor = self.sync(client)["cursor"]
+
+        # Stamped before the sync, but only committed after it.
+        stamped_at = timezone.now() - timedelta(seconds=5)
+        late = Task.objects.create(user=verified_user, title="Late")
+        Task.objects.filter(pk=late.pk).update(updated_at=stamped_at)
+        TaskTombstone.objects.create(
+            user=verified_user, task_id=1000, deleted_at=stamped_at
+        )
+
+        data = self.sync(client, cursor)
+        assert late.pk in [task["id"] for task in data["changed"]]
+        assert data["deleted"] == [1000]
+
+    def test_bulk_delete_inserts_tombstones_at_once(
+        self, client: APIClient, verified_user: User
+    ):
+        tasks = Task.objects.bulk_create(
+            Task(user=verified_user, title=f"Task {i}") for i in range(3)
+        )
+        with CaptureQueriesContext(connection) as captured:
+            client.delete(
+                reverse("ToDo:tasks-tasks-bulk"),
+                {"ids": [task.pk for task in tasks]},
+                format="json",
+            )
+        inserts = [
+            query["sql"]
+            for query in captured.captured_queries
+            if query["sql"].startswith('INSERT INTO "ToDo_tasktombstone"')
+        ]
+        assert len(inserts) == 1
+        assert sorted(
+            TaskTombstone.objects.values_list("task_id", flat=True)
+        ) == sorted(task.pk for task in tasks)
+
+    def test_is_scoped_to_user(self, client: APIClient):
+        other = User.objects.create_user(
+            email="other@example.com", password="pass@1234*"
+        )
+        cursor = self.sync(client)["cursor"]
+        task = Task.objects.create(user=other, title="Foreign")
+        task.delete()
+        data = self.sync(client, cursor)
+        assert data["changed"] == []
+        assert data["deleted"] == []
+
+    def test_invalid_cursor(self, client: APIClient):
+        response = client.get(self.url, {"since": "garbage"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_expired_cursor(self, client: APIClient, settings):
+        cursor = self.sync(client)["cursor"]
+        settings.TASK_TOMBSTONE_RETENTION = timedelta(0)
+        response = client.get(self.url, {"since": cursor})
+        assert response.status_code == status.HTTP_410_GONE
+
+    def test_user_deletion_leaves_no_tombstones(
+        self, verified_user: User, incompleted_task: Task
+    ):
+        verified_user.delete()
+        assert not TaskTombstone.objects.exists()
+
+    def test_purge_task_tombstones(self, incompleted_task: Task):
+        incompleted_task.delete()
+        call_command("purge_task_tombstones", stdout=StringIO())
+        assert TaskTombstone.objects.count() == 1
+        call_command("purge_task_tombstones", days=0, stdout=StringIO())
+        assert not TaskTombstone.objects.exists()
+
+
+@pytest.mark.django_db
+class TestTaskListCache:
+    @pytest.fixture
+    def client(self, api_client: APIClient, verified_user: User):
+        api_client.force_authenticate(user=verified_user)
+        return api_client
+
+    def test_list_is_served_from_cache(
+        self,
+        client: APIClient,
+        incompleted_task: Task,
+        django_assert_num_queries,
+    ):
+        url = reverse("ToDo:tasks-list")
+        first = client.get(url, {"completed": "false", "ordering": "due_date"})
+        with django_assert_num_queries(0):
+            second = client.get(
+                url, {"ordering": "due_date", "completed": "false"}
+            )
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data == first.data
+        assert get_list_cache_stats() == {"hits": 1, "misses": 1}
+
+    def test_writes_invalidate_cached_lists(
+        self, client: APIClient, incompleted_task: Task
+    ):
+        url = reverse("ToDo:tasks-list")
+        assert client.get(url).data["results"][0]["completed"] is False
+        client.patch(
+            reverse("ToDo:tasks-tasks-complete", args=[incompleted_task.id])
+        )
+        assert client.get(url).data["results"][0]["completed"] is True
+        client.delete(reverse("ToDo:tasks-detail", args=[incompleted_task.id]))
+        assert client.get(url).data["results"] == []
+
+    def test_cache_is_per_user(
+        self, api_client: APIClient, incompleted_task: Task
+    ):
+        url = reverse("ToDo:tasks-list")
+        api_client.force_authenticate(user=incompleted_task.user)
+        assert len(api_client.get(url).data["results"]) == 1
+        other = User.objects.create_user(
+            email="other@example.com", password="pass@1234*", is_verified=True
+        )
+        api_client.force_authenticate(user=other)
+        assert api_client.get(url).data["results"] == []
+
+    def test_html_list_is_served_from_cache(
+        self,
+        verified_user: User,
+        incompleted_task: Task,
+        django_assert_max_num_queries,
+    ):
+        browser = Client()
+        browser.force_login(verified_user)
+        url = reverse("ToDo:tasks")
+        assert incompleted_task.title in browser.get(url).content.decode()
+        with django_assert_max_num_queries(2) as captured:
+            response = browser.get(url)
+        assert not any(
+            '"ToDo_task"' in query["sql"]
+            for query in captured.captured_queries
+        )
+        assert incompleted_task.title in response.content.decode()
+
+        incompleted_task.title = "Renamed Task"
+        incompleted_task.save()
+        assert "Renamed Task" in browser.get(url).content.decode()
+
+    def test_task_cache_stats_command(self, client: APIClient):
+        client.get(reverse("ToDo:tasks-list"))
+        client.get(reverse("ToDo:tasks-list"))
+        out = StringIO()
+        call_command("task_cache_stats", "--reset", stdout=out)
+        assert "hit ratio: 50.0%" in out.getvalue()
+        assert get_list_cache_stats() == {"hits": 0, "misses": 0}
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReadReplica:
+    """
+    The replica is an SQLite file copied from the test database, which
+    lags behind it until it is copied again.
+    """
+
+    @pytest.fixture
+    def replicate(self, settings, tmp_path):
+        # Added as a dynamic connection, which tests may use.
+        settings_dict = {
+            **connections["default"].settings_dict,
+            "NAME": str(tmp_path / "replica.sqlite3"),
+        }
+        DatabaseWrapper = type(connections["default"])
+        alias = "test-replica"
+        connections[alias] = DatabaseWrapper(settings_dict, alias)
+        settings.REPLICA_DATABASE = alias
+
+        def replicate():
+            call_command("copy_sqlite_replica", stdout=StringIO())
+            # Drops the pins and the pages cached from the primary.
+            cache.clear()
+
+        yield replicate
+        connections[alias].close()
+        del connections[alias]
+
+    @pytest.fixture
+    def client(self, api_client: APIClient, verified_user: User):
+        api_client.force_authenticate(user=verified_user)
+        return api_client
+
+    def test_task_reads_come_from_replica(
+        self, replicate, client: APIClient, incompleted_task: Task
+    ):
+        replicate()
+        with read_from_replica(incompleted_task.user_id):
+            # Writes go to the primary.
+            task = Task.objects.create(
+                title="New Task", user=incompleted_task.user
+            )
+        assert Task.objects.using("default").filter(pk=task.pk).exists()
+        cache.clear()
+
+        response = client.get(reverse("ToDo:tasks-list"))
+        assert response.data["total_objects"] == 1
+        assert response.data["results"][0]["id"] == incompleted_task.id
+        response = client.get(reverse("ToDo:tasks-detail", args=[task.pk]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        replicate()
+        response = client.get(reverse("ToDo:tasks-list"))
+        assert response.data["total_objects"] == 2
+        response = client.get(reverse("ToDo:tasks-detail", args=[task.pk]))
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_writers_read_from_primary(
+        self, replicate, client: APIClient, verified_user: User
+    ):
+        replicate()
+        url = reverse("ToDo:tasks-list")
+        response = client.post(url, {"title": "New Task"})
+        assert response.status_code == status.HTTP_201_CREATED
+        assert is_pinned_to_primary(verified_user.pk)
+        assert client.get(url).data["results"][0]["title"] == "New Task"
+
+        cache.clear()
+        assert client.get(url).data["results"] == []
+
+    def test_pin_precedes_the_committed_version(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            "ToDo.cache.pin_to_primary", lambda user_id: calls.append("pin")
+        )
+        monkeypatch.setattr(
+            "ToDo.cache.bump_task_version",
+            lambda user_id: calls.append("bump"),
+        )
+        tasks_changed(1)
+        assert calls == ["bump", "pin", "bump"]
+
+    def test_html_list_reads_from_replica(
+        self, replicate, verified_user: User, incompleted_task: Task
+    ):
+        replicate()
+        Task.objects.create(title="New Task", user=verified_user)
+        cache.clear()
+
+        browser = Client()
+        browser.force_login(verified_user)
+        content = browser.get(reverse("ToDo:tasks")).content.decode()
+        assert incompleted_task.title in content
+        assert "New Task" not in content
+
+
+@pytest.mark.django_db
+class TestVerificationGate:
+    @pytest.fixture
+    def view_not_dispatched(self, monkeypatch):
+        def get(view, request, *args, **kwargs):
+            raise AssertionError("The view should not be dispatched.")
+
+        monkeypatch.setattr(TaskListView, "get", get)
+
+    def test_anonymous_html_requests_are_rejected_early(
+        self, client: Client, view_not_dispatched
+    ):
+        response = client.get(reverse("ToDo:tasks"))
+        assert response.status_code == status.HTTP_302_FOUND
+        assert response.url.startswith(reverse("Account:login"))
+        assert get_rejection_stats() == {"anonymous": 1, "unverified": 0}
+
+    def test_unverified_html_requests_are_rejected_early(
+        self, client: Client, unverified_user: User, view_not_dispatched
+    ):
+        client.force_login(unverified_user)
+        response = client.get(reverse("ToDo:tasks"))
+        assert response.status_code == status.HTTP_302_FOUND
+        assert response.url == reverse("Account:verification-required")
+        assert get_rejection_stats() == {"anonymous": 0, "unverified": 1}
+
+    def test_verified_html_requests_pass(
+        self, client: Client, verified_user: User
+    ):
+        client.force_login(verified_user)
+        response = client.get(reverse("ToDo:tasks"))
+        assert response.status_code == status.HTTP_200_OK
+        assert get_rejection_stats() == {"anonymous": 0, "unverified": 0}
+
+    def test_api_rejections_are_counted(
+        self, api_client: APIClient, unverified_user: User
+    ):
+        url = reverse("ToDo:tasks-list")
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        api_client.force_authenticate(user=unverified_user)
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert get_rejection_stats() == {"anonymous": 1, "unverified": 1}
+
+        out = StringIO()
+        call_command("verification_gate_stats", "--reset", stdout=out)
+        assert "unverified: 1" in out.getvalue()
+        assert get_rejection_stats() == {"anonymous": 0, "unverified": 0}
+
+
+@pytest.mark.django_db
+class TestTaskOwnership:
+    @pytest.fixture
+    def other_task(self) -> Task:
+        other = User.objects.create_user(
+            email="other@example.com", password="pass@1234*", is_verified=True
+        )
+        return Task.objects.create(
+            title="Other Task",
+            description="Owned by someone else.",
+            due_date="2023-12-31T23:59:59Z",
+            user=other,
+        )
+
+    def assert_scoped(self, queries, count):
+        sql = [query["sql"] for query in queries]
+        assert len(sql) == count, sql
+        assert not any('"Account_user"' in query for query in sql)
+        assert all(
+            '"ToDo_task"."user_id" = ' in query
+            for query in sql
+            if query.startswith('SELECT "ToDo_task"')
+        )
+
+    def test_for_user(self, incompleted_task: Task, other_task: Task):
+        tasks = Task.objects.for_user(incompleted_task.user)
+        assert list(tasks) == [incompleted_task]
+
+    @pytest.mark.parametrize(
+        "method, url_name, count",
+        [
+            ("get", "ToDo:tasks-detail", 2),
+            ("patch", "ToDo:tasks-tasks-complete", 2),
+            ("delete", "ToDo:tasks-detail", 3),
+        ],
+    )
+    def test_api_ownership_is_checked_in_the_query(
+        self,
+        api_client: APIClient,
+        incompleted_task: Task,
+        method,
+        url_name,
+        count,
+    ):
+        api_client.force_authenticate(user=incompleted_task.user)
+        url = reverse(url_name, args=[incompleted_task.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(api_client, method)(url)
+        assert status.is_success(response.status_code)
+        self.assert_scoped(queries, count)
+
+    def test_api_hides_other_users_tasks(
+        self, api_client: APIClient, verified_user: User, other_task: Task
+    ):
+        api_client.force_authenticate(user=verified_user)
+        url = reverse("ToDo:tasks-detail", args=[other_task.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.delete(url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        self.assert_scoped(queries, 1)
+        assert Task.objects.filter(pk=other_task.pk).exists()
+
+    def test_html_ownership_is_checked_in_the_query(
+        self, client: Client, incompleted_task: Task
+    ):
+        client.force_login(incompleted_task.user)
+        # Load the session's user into the cache.
+        client.get(reverse("ToDo:tasks"))
+
+        url = reverse("ToDo:task_update", args=[incompleted_task.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        self.assert_scoped(queries, 1)
+
+        url = reverse("ToDo:task_delete", args=[incompleted_task.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(url)
+        assert response.status_code == status.HTTP_302_FOUND
+        self.assert_scoped(queries, 3)
+
+    @pytest.mark.parametrize(
+        "url_name", ["ToDo:task_update", "ToDo:task_delete"]
+    )
+    def test_html_hides_other_users_tasks(
+        self, client: Client, verified_user: User, other_task: Task, url_name
+    ):
+        client.force_login(verified_user)
+        response = client.post(reverse(url_name, args=[other_task.id]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        other_task.refresh_from_db()
+        assert other_task.title == "Other Task"
+
+
+@pytest.mark.django_db
+class TestTaskSeeding:
+    def get_values(self, tasks):
+        return [
+            (task.title, task.description, task.due_date, task.completed)
+            for task in tasks
+        ]
+
+    def test_seed_tasks(self):
+        out = StringIO()
+        call_command("seed_tasks", users=2, tasks=30, seed=3, stdout=out)
+        assert "Created 2 users and 60 tasks" in out.getvalue()
+
+        users = User.objects.filter(email__startswith="seed-3-")
+        assert users.count() == 2
+        user = users.get(email="seed-3-0@example.com")
+        assert user.is_verified
+        assert user.check_password("fake@123456")
+        assert Task.objects.for_user(user).count() == 30
+
+    def test_search_index_is_rebuilt(self):
+        seeder = TaskSeeder(seed=3)
+        [(index, user_id)] = seeder.populate(1, 20)
+        task = Task.objects.filter(user_id=user_id).latest("pk")
+        word = task.title.split()[-1]
+        tasks = get_search_backend().search(Task.objects.all(), [word])
+        assert task in tasks
+
+    def test_same_seed_same_tasks(self):
+        users = [(0, 1), (1, 2)]
+        seeder = TaskSeeder(seed=5, batch_size=7)
+        jobs = list(seeder.get_jobs(users, 2500))
+        assert all(len(job) <= 2 for job in jobs)
+        first = [task for job in jobs for task in seeder.build_job(job)]
+
+        seeder = TaskSeeder(seed=5, now=seeder.now, batch_size=5000)
+        [job] = seeder.get_jobs(users, 2500)
+        second = seeder.build_job(job)
+        assert self.get_values(first) == self.get_values(second)
+
+        seeder = TaskSeeder(seed=6, now=seeder.now)
+        [job] = seeder.get_jobs(users, 2500)
+        assert self.get_values(seeder.build_job(job)) != self.get_values(
+            second
+        )
+
+    def test_distributions(self):
+        seeder = TaskSeeder()
+        tasks = list(seeder.iter_tasks(0, 1, 0, 1000))
+        overdue = [t for t in tasks if t.due_date and t.due_date < seeder.now]
+        upcoming = [
+            t for t in tasks if t.due_date and t.due_date >= seeder.now
+        ]
+        assert 100 < sum(t.due_date is None for t in tasks) < 300
+        assert 200 < sum(t.description is None for t in tasks) < 400
+        assert sum(t.completed for t in overdue) > len(overdue) / 2
+        assert sum(t.completed for t in upcoming) < len(upcoming) / 2
+
+
+@pytest.mark.django_db
+class TestAsyncTaskAPI:
+    @pytest.fixture
+    def token(self, verified_user: User) -> Token:
+        return Token.objects.create(user=verified_user)
+
+    @pytest.fixture
+    def client(self, api_client: APIClient, token: Token) -> APIClient:
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        return api_client
+
+    def test_views_are_async(self, incompleted_task: Task):
+        for name, args in [
+            ("ToDo:async-tasks-list", []),
+            ("ToDo:async-tasks-detail", [incompleted_task.id]),
+            ("ToDo:async-tasks-complete", [incompleted_task.id]),
+            ("ToDo:async-tasks-restore", [incompleted_task.id]),
+        ]:
+            assert iscoroutinefunction(resolve(reverse(name, args=args)).func)
+
+    def test_requires_authentication(self, api_client: APIClient):
+        response = api_client.get(reverse("ToDo:async-tasks-list"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.headers["WWW-Authenticate"] == "Token"
+
+        api_client.credentials(HTTP_AUTHORIZATION="Token unknown")
+        response = api_client.get(reverse("ToDo:async-tasks-list"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json() == {"detail": "Invalid token."}
+
+    def test_requires_verified_user(
+        self, api_client: APIClient, unverified_user: User
+    ):
+        token = Token.objects.create(user=unverified_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        response = api_client.get(reverse("ToDo:async-tasks-list"))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_list_matches_sync_list(
+        self, client: APIClient, verified_user: User
+    ):
+        for index in range(12):
+            Task.objects.create(
+                title=f"Task {index}",
+                completed=index % 3 == 0,
+                user=verified_user,
+            )
+        for params in [
+            {},
+            {"page": 2},
+            {"completed": "false", "page_size": 3},
+        ]:
+            response = client.get(reverse("ToDo:async-tasks-list"), params)
+            expected = client.get(reverse("ToDo:tasks-list"), params).json()
+            assert response.status_code == status.HTTP_200_OK
+            data = response.json()
+            links = data.pop("links")
+            expected.pop("links")
+            assert data == expected
+        assert links == {
+            "next": "http://testserver/tasks/api/v1/async/tasks/"
+            "?completed=false&page=2&page_size=3",
+            "previous": None,
+        }
+
+        response = client.get(reverse("ToDo:async-tasks-list"), {"page": 9})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_create_task(self, client: APIClient, verified_user: User):
+        url = reverse("ToDo:async-tasks-list")
+        data = {"title": "Async Task", "due_date": "2030-01-01T12:00"}
+        response = client.post(url, data, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        task = Task.objects.get(pk=response.json()["id"])
+        assert task.user == verified_user
+        assert task.title == "Async Task"
+
+        response = client.post(url, {"description": "x"}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "title" in response.json()
+
+    def test_tasks_of_other_users_are_not_found(
+        self, api_client: APIClient, incompleted_task: Task
+    ):
+        other = User.objects.create_user(
+            email="other@example.com", password="pass@1234*", is_verified=True
+        )
+        token = Token.objects.create(user=other)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        for name in ["detail", "complete", "restore"]:
+            url = reverse(
+                f"ToDo:async-tasks-{name}", args=[incompleted_task.id]
+            )
+            method = api_client.get if name == "detail" else api_client.patch
+            assert method(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_complete_and_restore_task(
+        self, client: APIClient, incompleted_task: Task
+    ):
+        args = [incompleted_task.id]
+        assert (
+            len(client.get(reverse("ToDo:tasks-list")).json()["results"]) == 1
+        )
+        response = client.patch(
+            reverse("ToDo:async-tasks-complete", args=args)
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["completed"] is True
+        response = client.patch(
+            reverse("ToDo:async-tasks-complete", args=args)
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        # The cached DRF list sees the change.
+        results = client.get(reverse("ToDo:tasks-list")).json()["results"]
+        assert results[0]["completed"] is True
+
+        response = client.patch(reverse("ToDo:async-tasks-restore", args=args))
+        assert response.status_code == status.HTTP_200_OK
+        incompleted_task.refresh_from_db()
+        assert incompleted_task.completed is False
+        response = client.get(reverse("ToDo:async-tasks-detail", args=args))
+        assert response.json()["completed"] is False
+
+    def test_asgi_request_with_jwt(self, incompleted_task: Task):
+        access = RefreshToken.for_user(incompleted_task.user).access_token
+        url = reverse("ToDo:async-tasks-detail", args=[incompleted_task.id])
+        response = async_to_sync(AsyncClient().get)(
+            url, headers={"Authorization": f"Bearer {access}"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["title"] == incompleted_task.title
@@ -1,9 +1,37 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
+from .async_views import (
+    AsyncTaskCompleteView,
+    AsyncTaskDetailView,
+    AsyncTaskListView,
+    AsyncTaskRestoreView,
+)
 from .views import TasksViewSet
 
 router = DefaultRouter()
 router.register(r"tasks", TasksViewSet, basename="tasks")
 
-urlpatterns = []
+urlpatterns = [
+    path(
+        "async/tasks/",
+        AsyncTaskListView.as_view(),
+        name="async-tasks-list",
+    ),
+    path(
+        "async/tasks/<int:pk>/",
+        AsyncTaskDetailView.as_view(),
+        name="async-tasks-detail",
+    ),
+    path(
+        "async/tasks/<int:pk>/complete/",
+        AsyncTaskCompleteView.as_view(),
+        name="async-tasks-complete",
+    ),
+    path(
+        "async/tasks/<int:pk>/restore/",
+        AsyncTaskRestoreView.as_view(),
+        name="async-tasks-restore",
+    ),
+]
 
 urlpatterns += router.urls
@@ -1,39 +1,102 @@
 from rest_framework import viewsets
-from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework import filters
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
-from ToDo.models import Task
-from .serializers import TaskSerializer
-from .permissions import IsOwner, IsVerified
-from .paginations import DefaultPagination
+from ToDo.models import Task, TaskTombstone
+from .mixins import (
+    CachedListMixin,
+    ConditionalTaskMixin,
+    ReplicaReadMixin,
+)
+from .serializers import (
+    TaskBulkDeleteSerializer,
+    TaskBulkStatusSerializer,
+    TaskSerializer,
+)
+from .permissions import IsVerified
+from .paginations import DefaultPagination, KeysetPagination
+from .filters import FullTextSearchFilter
+from .sync import TaskChangeFeed
 
 
-class TasksViewSet(viewsets.ModelViewSet):
+class TasksViewSet(
+    ReplicaReadMixin,
+    ConditionalTaskMixin,
+    CachedListMixin,
+    viewsets.ModelViewSet,
+):
     """
     A viewset for viewing and editing Task instances.
+
+    The list is paginated by page number by default. Passing the `cursor`
+    query parameter (empty for the first page) switches to keyset
+    pagination, whose pages take constant time regardless of depth.
+
+    `tasks/bulk/` creates, updates or deletes up to `bulk_max_size` tasks
+    in a single request and transaction, and `tasks/bulk/complete/` and
+    `tasks/bulk/restore/` change the status of many tasks with one UPDATE.
+
+    List and detail responses carry ETag and Last-Modified headers for
+    conditional requests (`ConditionalTaskMixin`) and list data is cached
+    per user (`CachedListMixin`). Both are read from the replica, if one
+    is configured (`ReplicaReadMixin`). Offline clients resync through
+    `tasks/changes/`, see `TaskChangeFeed`.
     """
 
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
-    permission_classes = [IsAuthenticated, IsOwner, IsVerified]
+    permission_classes = [IsVerified]
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
+        FullTextSearchFilter,
         filters.OrderingFilter,
     ]
     filterset_fields = ["title", "completed", "due_date"]
     search_fields = ["title", "description"]
     ordering_fields = ["due_date"]
     pagination_class = DefaultPagination
+    keyset_pagination_class = KeysetPagination
+    change_feed_class = TaskChangeFeed
+    bulk_max_size = 1000
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            pagination_class = self.pagination_class
+            cursor_param = self.keyset_pagination_class.cursor_query_param
+            query_params = getattr(self.request, "query_params", {})
+            if cursor_param in query_params:
+                pagination_class = self.keyset_pagination_class
+            self._paginator = pagination_class()
+        return self._paginator
 
     def get_queryset(self, *args, **kwargs):
         queryset = super().get_queryset(*args, **kwargs)
-        queryset = queryset.filter(user=self.request.user)
+        queryset = queryset.for_user(self.request.user)
         return queryset
 
+    @action(
+        detail=False,
+        methods=["GET"],
+        url_path="changes",
+        url_name="tasks-changes",
+    )
+    def changes(self, request):
+        """
+        List the tasks created, updated or deleted since the `since` cursor.
+        """
+        feed = self.change_feed_class()
+        changed, deleted = feed.paginate(
+            request,
+            self.get_queryset(),
+            TaskTombstone.objects.filter(user_id=request.user.pk),
+        )
+        serializer = self.get_serializer(changed, many=True)
+        return feed.get_response(serializer.data, deleted)
+
     @action(
         detail=True,
         methods=["PATCH"],
@@ -51,7 +114,7 @@ class TasksViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         task.completed = True
-        task.save()
+        task.save(update_fields=["completed", "updated_at"])
         serializer = self.get_serializer(task)
         return Response(serializer.data)
 
@@ -72,6 +135,112 @@ class TasksViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         task.completed = False
-        task.save()
+        task.save(update_fields=["completed", "updated_at"])
         serializer = self.get_serializer(task)
         return Response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=["POST", "PATCH", "DELETE"],
+        url_path="bulk",
+        url_name="tasks-bulk",
+    )
+    def bulk(self, request):
+        """
+        Create (POST), partially update (PATCH) or delete (DELETE) tasks.
+
+        POST and PATCH take a list of tasks, PATCH items must include the
+        task `id`. DELETE takes `{"ids": [...]}`. Nothing is written
+        unless every item is valid; errors are returned per item.
+        """
+        if request.method == "DELETE":
+            return self.bulk_destroy(request)
+
+        queryset = self.get_queryset()
+        if request.method == "PATCH" and isinstance(request.data, list):
+            ids = [
+                item["id"]
+                for item in request.data
+                if isinstance(item, dict) and isinstance(item.get("id"), int)
+            ]
+            instance = queryset.in_bulk(ids)
+        else:
+            instance = None
+        serializer = self.get_serializer(
+            instance,
+            data=request.data,
+            many=True,
+            partial=instance is not None,
+            max_length=self.bulk_max_size,
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+
+        if instance is None:
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.data)
+
+    def bulk_destroy(self, request):
+        serializer = TaskBulkDeleteSerializer(
+            data=request.data, context={"max_length": self.bulk_max_size}
+        )
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+
+        with transaction.atomic():
+            queryset = self.get_queryset().filter(pk__in=ids)
+            found = set(queryset.values_list("pk", flat=True))
+            errors = {
+                index: [f"Task {pk} does not exist."]
+                for index, pk in enumerate(ids)
+                if pk not in found
+            }
+            if errors:
+                return Response(
+                    {"ids": errors}, status=status.HTTP_400_BAD_REQUEST
+                )
+            queryset.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(
+        detail=False,
+        methods=["PATCH"],
+        url_path="bulk/complete",
+        url_name="tasks-bulk-complete",
+    )
+    def bulk_complete(self, request):
+        """
+        Mark the selected tasks as completed.
+        """
+        return self.bulk_set_completed(request, True)
+
+    @action(
+        detail=False,
+        methods=["PATCH"],
+        url_path="bulk/restore",
+        url_name="tasks-bulk-restore",
+    )
+    def bulk_restore(self, request):
+        """
+        Mark the selected tasks as incompleted.
+        """
+        return self.bulk_set_completed(request, False)
+
+    def bulk_set_completed(self, request, completed: bool):
+        """
+        Tasks are selected by `ids` and/or `"overdue": true` in the body,
+        narrowed down by the list filters in the query string. The ids of
+        the tasks whose status changed are returned.
+        """
+        serializer = TaskBulkStatusSerializer(
+            data=request.data, context={"max_length": self.bulk_max_size}
+        )
+        serializer.is_valid(raise_exception=True)
+        queryset = self.filter_queryset(self.get_queryset())
+        if "ids" in serializer.validated_data:
+            queryset = queryset.filter(pk__in=serializer.validated_data["ids"])
+        if serializer.validated_data.get("overdue"):
+            queryset = queryset.overdue()
+        ids = queryset.set_completed(completed)
+        return Response({"ids": ids})
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TodoConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ToDo"
+
+    def ready(self):
+        from ToDoApp import db  # noqa: F401
+        from . import signals  # noqa: F401
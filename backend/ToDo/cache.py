@@ -0,0 +1,100 @@
+import time
+from hashlib import md5
+from django.core.cache import cache
+from django.db import transaction
+from ToDoApp.db import pin_to_primary
+
+
+def _version_key(user_id) -> str:
+    return f"tasks:version:{user_id}"
+
+
+def get_task_version(user_id) -> int:
+    """
+    Return the current version of the user's tasks.
+
+    The version changes on every write to the user's tasks, so anything
+    derived from them can be cached under a key that includes it and
+    never has to be deleted explicitly. Versions are timestamps in
+    microseconds, which keeps them increasing even if the key is evicted.
+    """
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns() // 1000
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_task_version(user_id) -> int:
+    """
+    Mark the user's tasks as changed and return the new version.
+    """
+    version = max(time.time_ns() // 1000, get_task_version(user_id) + 1)
+    cache.set(_version_key(user_id), version, timeout=None)
+    return version
+
+
+def tasks_changed(user_id):
+    """
+    Bump the user's task version now and again once the current
+    transaction commits, after pinning the user's reads to the primary.
+
+    Bumping right away lets the rest of the request see the change, and
+    the second bump drops anything a concurrent request cached from the
+    old data in the meantime. The pin keeps the user from reading, and
+    caching under the new version, a replica that has not caught up with
+    the commit yet. Writes that bypass model signals, such as
+    `bulk_create()` and `bulk_update()`, must call this explicitly.
+    """
+
+    def committed():
+        # Pinned first, so no request caches the lagging replica under
+        # the new version.
+        pin_to_primary(user_id)
+        bump_task_version(user_id)
+
+    bump_task_version(user_id)
+    transaction.on_commit(committed)
+
+
+def task_list_cache_key(user_id, namespace, params, *parts) -> str:
+    """
+    Return the cache key of a task list page.
+
+    `params` is the request's QueryDict. Parameters are sorted by name so
+    that the same list requested with a different parameter order shares
+    the entry; `parts` are extra values the page depends on, such as the
+    host used in absolute pagination links.
+    """
+    normalized = sorted(params.lists())
+    digest = md5(
+        repr((normalized, parts)).encode(), usedforsecurity=False
+    ).hexdigest()
+    version = get_task_version(user_id)
+    return f"tasks:list:{namespace}:{user_id}:{version}:{digest}"
+
+
+STATS_KEYS = {True: "tasks:stats:hits", False: "tasks:stats:misses"}
+
+
+def record_list_cache_access(hit: bool):
+    key = STATS_KEYS[hit]
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_list_cache_stats() -> dict:
+    values = cache.get_many(STATS_KEYS.values())
+    return {
+        "hits": values.get(STATS_KEYS[True], 0),
+        "misses": values.get(STATS_KEYS[False], 0),
+    }
+
+
+def reset_list_cache_stats():
+    cache.delete_many(STATS_KEYS.values())
@@ -0,0 +1,120 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+from Account.models import User
+from ToDo.api.v1.views import TasksViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of creating, updating and deleting tasks "
+        "one request at a time with the bulk endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tasks",
+            type=int,
+            default=1000,
+            help="Number of tasks written by each path.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=TasksViewSet.bulk_max_size,
+            help="Number of tasks per bulk request.",
+        )
+
+    def handle(self, *args, **options):
+        self.factory = APIRequestFactory()
+        count = options["tasks"]
+        batch_size = options["batch_size"]
+
+        with transaction.atomic():
+            self.user = User(
+                email="benchmark-bulk@example.com", is_verified=True
+            )
+            self.user.set_unusable_password()
+            self.user.save()
+
+            single = self.run_single(count)
+            bulk = self.run_bulk(count, batch_size)
+
+            self.stdout.write(self.style.MIGRATE_HEADING("Tasks per second"))
+            for name in single:
+                speedup = single[name] / bulk[name]
+                self.stdout.write(
+                    f"  {name:<8} {count / single[name]:>10.0f} one-by-one "
+                    f"{count / bulk[name]:>10.0f} bulk ({speedup:.1f}x)"
+                )
+
+            transaction.set_rollback(True)
+
+    def call(self, actions, method, data=None, **kwargs):
+        view = TasksViewSet.as_view(actions)
+        request = getattr(self.factory, method)("/", data, format="json")
+        force_authenticate(request, user=self.user)
+        response = view(request, **kwargs)
+        assert response.status_code < 400, response.data
+        return response
+
+    def run_single(self, count):
+        timings = {}
+
+        start = time.perf_counter()
+        ids = []
+        for i in range(count):
+            data = {"title": f"Task {i}"}
+            response = self.call({"post": "create"}, "post", data)
+            ids.append(response.data["id"])
+        timings["create"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for pk in ids:
+            self.call(
+                {"patch": "partial_update"},
+                "patch",
+                {"title": f"Renamed {pk}"},
+                pk=pk,
+            )
+        timings["update"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for pk in ids:
+            self.call({"delete": "destroy"}, "delete", pk=pk)
+        timings["delete"] = time.perf_counter() - start
+
+        return timings
+
+    def run_bulk(self, count, batch_size):
+        actions = {"post": "bulk", "patch": "bulk", "delete": "bulk"}
+        batches = [
+            range(i, min(i + batch_size, count))
+            for i in range(0, count, batch_size)
+        ]
+        timings = {}
+
+        start = time.perf_counter()
+        ids = []
+        for batch in batches:
+            data = [{"title": f"Task {i}"} for i in batch]
+            response = self.call(actions, "post", data)
+            ids.extend(item["id"] for item in response.data)
+        timings["create"] = time.perf_counter() - start
+
+        id_batches = [[ids[i] for i in batch] for batch in batches]
+
+        start = time.perf_counter()
+        for batch in id_batches:
+            data = [{"id": pk, "title": f"Renamed {pk}"} for pk in batch]
+            self.call(actions, "patch", data)
+        timings["update"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for batch in id_batches:
+            self.call(actions, "delete", {"ids": batch})
+        timings["delete"] = time.perf_counter() - start
+
+        return timings
@@ -0,0 +1,164 @@
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+from Account.models import User
+from ToDo.api.v1.views import TasksViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Create tasks through the task API from concurrent threads, while "
+        "others list tasks, and report the write throughput of the "
+        "configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--writers",
+            type=int,
+            default=8,
+            help="Number of threads creating tasks, each as its own user.",
+        )
+        parser.add_argument(
+            "--readers",
+            type=int,
+            default=4,
+            help="Number of threads listing tasks at the same time.",
+        )
+        parser.add_argument(
+            "--tasks",
+            type=int,
+            default=200,
+            help="Number of tasks created by each writer.",
+        )
+
+    def handle(self, *args, **options):
+        self.factory = APIRequestFactory(SERVER_NAME="localhost")
+        self.describe_database()
+
+        # The threads commit, so the data cannot be rolled back; the
+        # users are deleted with their tasks at the end instead.
+        users = [
+            User(email=f"benchmark-writes-{i}@example.com", is_verified=True)
+            for i in range(max(options["writers"], 1))
+        ]
+        for user in users:
+            user.set_unusable_password()
+        User.objects.filter(email__in=[u.email for u in users]).delete()
+        users = User.objects.bulk_create(users)
+
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = []
+        self.reads = 0
+
+        writers = [
+            threading.Thread(
+                target=self.write, args=(users[i], options["tasks"])
+            )
+            for i in range(options["writers"])
+        ]
+        readers = [
+            threading.Thread(target=self.read, args=(users[i % len(users)],))
+            for i in range(options["readers"])
+        ]
+        try:
+            start = time.perf_counter()
+            for thread in writers + readers:
+                thread.start()
+            for thread in writers:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            self.done.set()
+            for thread in readers:
+                thread.join()
+        finally:
+            self.done.set()
+            User.objects.filter(pk__in=[u.pk for u in users]).delete()
+
+        self.report(elapsed)
+
+    def describe_database(self):
+        name = connection.settings_dict["NAME"]
+        self.stdout.write(f"Database: {connection.vendor} {name}")
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                pragmas = []
+                for pragma in settings.SQLITE_PRAGMAS:
+                    cursor.execute(f"PRAGMA {pragma}")
+                    pragmas.append(f"{pragma}={cursor.fetchone()[0]}")
+            mode = connection.settings_dict["OPTIONS"].get(
+                "transaction_mode", "DEFERRED"
+            )
+            self.stdout.write(f"  {', '.join(pragmas)}, transactions={mode}")
+        else:
+            self.stdout.write(
+                f"  CONN_MAX_AGE={connection.settings_dict['CONN_MAX_AGE']}, "
+                f"pool={connection.settings_dict['OPTIONS'].get('pool')}"
+            )
+
+    def call(self, user, actions, method, data=None):
+        view = TasksViewSet.as_view(actions)
+        request = getattr(self.factory, method)("/", data, format="json")
+        force_authenticate(request, user=user)
+        return view(request)
+
+    def write(self, user, count):
+        try:
+            for i in range(count):
+                start = time.perf_counter()
+                try:
+                    response = self.call(
+                        user, {"post": "create"}, "post", {"title": f"T{i}"}
+                    )
+                except DatabaseError as error:
+                    with self.lock:
+                        self.errors.append(str(error))
+                    continue
+                latency = time.perf_counter() - start
+                with self.lock:
+                    if response.status_code == 201:
+                        self.latencies.append(latency)
+                    else:
+                        self.errors.append(str(response.status_code))
+        finally:
+            connection.close()
+
+    def read(self, user):
+        try:
+            while not self.done.is_set():
+                try:
+                    self.call(user, {"get": "list"}, "get")
+                except DatabaseError as error:
+                    with self.lock:
+                        self.errors.append(str(error))
+                    continue
+                with self.lock:
+                    self.reads += 1
+        finally:
+            connection.close()
+
+    def report(self, elapsed):
+        writes = len(self.latencies)
+        self.stdout.write(
+            f"{writes} writes in {elapsed:.1f} s "
+            f"({writes / elapsed:.0f}/s), {self.reads / elapsed:.0f} reads/s, "
+            f"{len(self.errors)} errors"
+        )
+        if writes:
+            latencies = sorted(self.latencies)
+            p99 = latencies[min(writes - 1, int(writes * 0.99))]
+            self.stdout.write(
+                f"  write latency p50 "
+                f"{statistics.median(latencies) * 1000:.1f} ms, "
+                f"p99 {p99 * 1000:.1f} ms"
+            )
+        for error in sorted(set(self.errors)):
+            count = self.errors.count(error)
+            self.stdout.write(self.style.ERROR(f"  {count} x {error}"))
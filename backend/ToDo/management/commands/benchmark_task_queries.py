@@ -0,0 +1,153 @@
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from Account.models import User
+from ToDo.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large task dataset and report query plans and latency of "
+        "the task list access paths with and without the Task indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tasks",
+            type=int,
+            default=50000,
+            help="Number of tasks to create for the benchmarked user.",
+        )
+        parser.add_argument(
+            "--other-users",
+            type=int,
+            default=4,
+            help="Number of extra users that get the same amount of tasks.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="How many times each query is executed.",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed for the data."
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the seeded data instead of rolling it back.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self.seed(options)
+            queries = self.get_queries(user)
+
+            self.drop_indexes()
+            self.analyze()
+            self.stdout.write(self.style.MIGRATE_HEADING("Without indexes"))
+            before = self.run_queries(queries, options["repeat"])
+
+            self.create_indexes()
+            self.analyze()
+            self.stdout.write(self.style.MIGRATE_HEADING("With indexes"))
+            after = self.run_queries(queries, options["repeat"])
+
+            self.stdout.write(self.style.MIGRATE_HEADING("Summary (median)"))
+            for name in queries:
+                self.stdout.write(
+                    f"  {name:<28} {before[name]:>9.3f} ms -> "
+                    f"{after[name]:>9.3f} ms"
+                )
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+    def seed(self, options):
+        rng = random.Random(options["seed"])
+        now = datetime.now(tz=timezone.utc)
+        users = [
+            User(email=f"benchmark-{options['seed']}-{i}@example.com")
+            for i in range(options["other_users"] + 1)
+        ]
+        for user in users:
+            user.set_unusable_password()
+        users = User.objects.bulk_create(users)
+
+        for user in users:
+            tasks = (
+                Task(
+                    user=user,
+                    title=f"Task {i}",
+                    due_date=(
+                        now + timedelta(minutes=rng.randint(-43200, 43200))
+                        if rng.random() < 0.8
+                        else None
+                    ),
+                    completed=rng.random() < 0.5,
+                )
+                for i in range(options["tasks"])
+            )
+            Task.objects.bulk_create(tasks, batch_size=1000)
+
+        self.stdout.write(
+            f"Seeded {len(users)} users with {options['tasks']} tasks each."
+        )
+        return users[0]
+
+    def get_queries(self, user):
+        tasks = Task.objects.filter(user=user)
+        return {
+            "list": tasks[:10],
+            "list completed=False": tasks.filter(completed=False)[:10],
+            "list completed=True": tasks.filter(completed=True)[:10],
+            "list ordering=due_date": tasks.order_by("due_date")[:10],
+            "list ordering=-due_date": tasks.order_by("-due_date")[:10],
+            "count": tasks.order_by(),
+        }
+
+    def run_queries(self, queries, repeat):
+        results = {}
+        for name, queryset in queries.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                if name == "count":
+                    queryset.count()
+                else:
+                    list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+
+            results[name] = statistics.median(timings)
+            self.stdout.write(self.style.SQL_KEYWORD(f"  {name}"))
+            for line in queryset.explain().splitlines():
+                self.stdout.write(f"    {line}")
+            self.stdout.write(
+                f"    median {results[name]:.3f} ms, "
+                f"max {max(timings):.3f} ms"
+            )
+        return results
+
+    def drop_indexes(self):
+        with connection.cursor() as cursor:
+            for index in Task._meta.indexes:
+                cursor.execute(
+                    f"DROP INDEX {connection.ops.quote_name(index.name)}"
+                )
+
+    def create_indexes(self):
+        # The schema editor cannot be entered inside atomic() on SQLite, so
+        # it is only used to build the statements.
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for index in Task._meta.indexes:
+                cursor.execute(str(index.create_sql(Task, editor)))
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
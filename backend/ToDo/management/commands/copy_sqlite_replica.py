@@ -0,0 +1,60 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database to the SQLite file of the "
+        "replica, standing in for replication during development."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep copying, which simulates a lagging replica.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between copies.",
+        )
+
+    def handle(self, *args, **options):
+        alias = settings.REPLICA_DATABASE
+        if alias is None:
+            raise CommandError("No replica is configured.")
+        source = connections[DEFAULT_DB_ALIAS]
+        replica = connections[alias]
+        if source.vendor != "sqlite" or replica.vendor != "sqlite":
+            raise CommandError("Only SQLite replicas can be copied.")
+
+        while True:
+            copy_sqlite_database(source, replica.settings_dict["NAME"])
+            self.stdout.write(
+                f"Copied {source.settings_dict['NAME']} to "
+                f"{replica.settings_dict['NAME']}."
+            )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+
+def copy_sqlite_database(source, path):
+    """
+    Copy the database of the `source` connection to the file at `path`.
+
+    The online backup API copies a consistent snapshot while other
+    connections keep reading and writing either database.
+    """
+    source.ensure_connection()
+    target = sqlite3.connect(path)
+    try:
+        source.connection.backup(target)
+    finally:
+        target.close()
@@ -0,0 +1,126 @@
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from loadtest.journeys import JOURNEYS, TASK_URLS
+from loadtest.runner import LoadTest, OutboxRelay
+from loadtest.smtp import SMTPSink
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay user journeys against a running server and report "
+        "throughput, error rates and latencies per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            default="http://127.0.0.1:8000",
+            help="Base URL of the server under test.",
+        )
+        parser.add_argument(
+            "--journey",
+            choices=sorted(JOURNEYS),
+            default="signup",
+            help="Sign up new users or log in as seeded ones.",
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=20,
+            help="Number of journeys to run.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=10,
+            help="Number of journeys running at the same time.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=5,
+            help="Times each journey lists, creates, completes and "
+            "restores a task.",
+        )
+        parser.add_argument(
+            "--auth",
+            choices=["token", "jwt"],
+            default="token",
+            help="How journeys log in.",
+        )
+        parser.add_argument(
+            "--api",
+            choices=sorted(TASK_URLS),
+            default="sync",
+            help="Use the DRF (sync) or the async task endpoints.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed the users of seeded journeys were created with.",
+        )
+        parser.add_argument(
+            "--password",
+            help="Password of the users, 'fake@123456' for seeded "
+            "journeys by default.",
+        )
+        parser.add_argument(
+            "--smtp-host",
+            default="127.0.0.1",
+            help="Address the SMTP sink listens on.",
+        )
+        parser.add_argument(
+            "--smtp-port",
+            type=int,
+            default=2525,
+            help="Port the SMTP sink listens on.",
+        )
+        parser.add_argument(
+            "--send-emails",
+            action="store_true",
+            help="Send the queued emails to the sink from this process.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=30,
+            help="Seconds to wait for a response or an email.",
+        )
+
+    def handle(self, *args, **options):
+        password = options["password"]
+        if password is None:
+            seeded = options["journey"] == "seeded"
+            password = "fake@123456" if seeded else "load@1234*"
+
+        with SMTPSink(options["smtp_host"], options["smtp_port"]) as sink:
+            host, port = sink.address
+            self.stdout.write(f"SMTP sink listening on {host}:{port}")
+            load_test = LoadTest(
+                options["url"],
+                journey=options["journey"],
+                concurrency=options["concurrency"],
+                iterations=options["iterations"],
+                auth=options["auth"],
+                api=options["api"],
+                sink=sink,
+                seed=options["seed"],
+                password=password,
+                timeout=options["timeout"],
+            )
+            with override_settings(
+                EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+                EMAIL_HOST=host,
+                EMAIL_PORT=port,
+            ):
+                relay = OutboxRelay() if options["send_emails"] else None
+                if relay is not None:
+                    relay.start()
+                try:
+                    stats = load_test.run(options["users"])
+                finally:
+                    if relay is not None:
+                        relay.stop()
+
+        stats.report(self.stdout.write)
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from ToDo.models import TaskTombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the tombstones of deleted tasks that are older than "
+        "TASK_TOMBSTONE_RETENTION."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Retention in days, overriding TASK_TOMBSTONE_RETENTION.",
+        )
+
+    def handle(self, *args, **options):
+        retention = settings.TASK_TOMBSTONE_RETENTION
+        if options["days"] is not None:
+            retention = timedelta(days=options["days"])
+        cutoff = timezone.now() - retention
+        deleted, _ = TaskTombstone.objects.filter(
+            deleted_at__lt=cutoff
+        ).delete()
+        self.stdout.write(f"Deleted {deleted} tombstones older than {cutoff}.")
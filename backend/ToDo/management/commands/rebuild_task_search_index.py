@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from ToDo.search import get_search_backend, install_search_backends
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the full-text search objects of the task table and "
+        "rebuild the index from its current content."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias to rebuild the index on.",
+        )
+
+    def handle(self, *args, **options):
+        install_search_backends(options["database"])
+        backend = get_search_backend(options["database"])
+        backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt the task search index ({type(backend).__name__})."
+            )
+        )
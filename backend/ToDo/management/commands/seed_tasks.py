@@ -0,0 +1,90 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from ToDo.seeding import TaskSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Create verified users with generated tasks for development and "
+        "capacity testing. The same seed always produces the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users", type=int, default=1, help="Number of users to create."
+        )
+        parser.add_argument(
+            "--tasks",
+            type=int,
+            default=5,
+            help="Number of tasks to create for each user.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed, also part of the users' emails.",
+        )
+        parser.add_argument(
+            "--password",
+            default="fake@123456",
+            help="Password of every created user.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows per bulk insert.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes inserting tasks.",
+        )
+        parser.add_argument(
+            "--keep-search-index",
+            action="store_false",
+            dest="defer_index",
+            help=(
+                "Maintain the full-text search index during the inserts "
+                "instead of rebuilding it at the end."
+            ),
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias to seed.",
+        )
+
+    def handle(self, *args, **options):
+        seeder = TaskSeeder(
+            seed=options["seed"],
+            password=options["password"],
+            batch_size=options["batch_size"],
+            using=options["database"],
+        )
+        start = time.perf_counter()
+        users = seeder.populate(
+            options["users"],
+            options["tasks"],
+            workers=options["workers"],
+            defer_index=options["defer_index"],
+        )
+        duration = time.perf_counter() - start
+
+        tasks = len(users) * options["tasks"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(users)} users and {tasks} tasks in "
+                f"{duration:.1f} s ({tasks / duration:.0f} tasks/s)."
+            )
+        )
+        if users:
+            self.stdout.write(
+                f"Users {seeder.get_email(0)} to "
+                f"{seeder.get_email(len(users) - 1)}, "
+                f"password {options['password']}"
+            )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from ToDo.cache import get_list_cache_stats, reset_list_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show the hit and miss counts of the task list cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after showing them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_list_cache_stats()
+        total = stats["hits"] + stats["misses"]
+        ratio = stats["hits"] / total if total else 0
+        self.stdout.write(
+            f"hits: {stats['hits']}\n"
+            f"misses: {stats['misses']}\n"
+            f"hit ratio: {ratio:.1%}"
+        )
+        if options["reset"]:
+            reset_list_cache_stats()
+            self.stdout.write("Counters reset.")
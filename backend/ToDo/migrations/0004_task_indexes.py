@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 20:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ToDo", "0003_alter_task_options"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "completed", "-due_date", "-created_at"],
+                name="task_user_ordering_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "due_date"], name="task_user_due_date_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2 on 2026-10-18 20:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.utils import OperationalError
+
+# The DDL is inlined, so that later changes to ToDo.search do not change
+# what this migration does.
+SQLITE_INSTALL = [
+    'CREATE VIRTUAL TABLE IF NOT EXISTS "ToDo_task_fts" USING fts5('
+    'title, description, content="ToDo_task", content_rowid=id, '
+    "tokenize='unicode61 remove_diacritics 2')",
+    'CREATE TRIGGER IF NOT EXISTS "ToDo_task_fts_ai" AFTER INSERT ON '
+    '"ToDo_task" BEGIN INSERT INTO "ToDo_task_fts"(rowid, title, '
+    "description) VALUES (new.id, new.title, new.description); END",
+    'CREATE TRIGGER IF NOT EXISTS "ToDo_task_fts_ad" AFTER DELETE ON '
+    '"ToDo_task" BEGIN INSERT INTO "ToDo_task_fts"("ToDo_task_fts", rowid, '
+    "title, description) VALUES ('delete', old.id, old.title, "
+    "old.description); END",
+    'CREATE TRIGGER IF NOT EXISTS "ToDo_task_fts_au" AFTER UPDATE OF title, '
+    'description ON "ToDo_task" BEGIN INSERT INTO "ToDo_task_fts"('
+    "\"ToDo_task_fts\", rowid, title, description) VALUES ('delete', "
+    "old.id, old.title, old.description); INSERT INTO "
+    '"ToDo_task_fts"(rowid, title, description) VALUES (new.id, '
+    "new.title, new.description); END",
+    'INSERT INTO "ToDo_task_fts"("ToDo_task_fts") VALUES (\'rebuild\')',
+]
+SQLITE_UNINSTALL = [
+    'DROP TRIGGER IF EXISTS "ToDo_task_fts_ai"',
+    'DROP TRIGGER IF EXISTS "ToDo_task_fts_ad"',
+    'DROP TRIGGER IF EXISTS "ToDo_task_fts_au"',
+    'DROP TABLE IF EXISTS "ToDo_task_fts"',
+]
+POSTGRES_INSTALL = [
+    'CREATE INDEX IF NOT EXISTS "task_search_idx" ON "ToDo_task" USING GIN '
+    "((to_tsvector('english', coalesce(title, '') || ' ' || "
+    "coalesce(description, ''))))",
+]
+POSTGRES_UNINSTALL = ['DROP INDEX IF EXISTS "task_search_idx"']
+
+
+def run(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement, params=None)
+
+
+def install_search_index(apps, schema_editor):
+    statements = {"sqlite": SQLITE_INSTALL, "postgresql": POSTGRES_INSTALL}
+    try:
+        run(schema_editor, statements)
+    except OperationalError:
+        # SQLite built without FTS5; searches fall back to LIKE.
+        pass
+
+
+def uninstall_search_index(apps, schema_editor):
+    run(
+        schema_editor,
+        {"sqlite": SQLITE_UNINSTALL, "postgresql": POSTGRES_UNINSTALL},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ToDo", "0004_task_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+        migrations.CreateModel(
+            name="TaskSearchIndex",
+            fields=[
+                (
+                    "task",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="ToDo.task",
+                    ),
+                ),
+                ("document", models.TextField(db_column="ToDo_task_fts")),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "ToDo_task_fts",
+                "managed": False,
+            },
+        ),
+    ]
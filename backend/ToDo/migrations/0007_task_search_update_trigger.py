@@ -0,0 +1,52 @@
+from django.db import migrations
+
+# Only reindex a task when its title or description value changes, not
+# whenever they are written, e.g. by a full save().
+SQLITE_FORWARD = [
+    'DROP TRIGGER IF EXISTS "ToDo_task_fts_au"',
+    'CREATE TRIGGER "ToDo_task_fts_au" AFTER UPDATE OF title, description '
+    'ON "ToDo_task" WHEN old.title IS NOT new.title OR old.description IS '
+    'NOT new.description BEGIN INSERT INTO "ToDo_task_fts"("ToDo_task_fts", '
+    "rowid, title, description) VALUES ('delete', old.id, old.title, "
+    'old.description); INSERT INTO "ToDo_task_fts"(rowid, title, '
+    "description) VALUES (new.id, new.title, new.description); END",
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS "ToDo_task_fts_au"',
+    'CREATE TRIGGER "ToDo_task_fts_au" AFTER UPDATE OF title, description '
+    'ON "ToDo_task" BEGIN INSERT INTO "ToDo_task_fts"("ToDo_task_fts", '
+    "rowid, title, description) VALUES ('delete', old.id, old.title, "
+    'old.description); INSERT INTO "ToDo_task_fts"(rowid, title, '
+    "description) VALUES (new.id, new.title, new.description); END",
+]
+
+
+def run(schema_editor, statements):
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        # Not installed where SQLite was built without FTS5.
+        if "ToDo_task_fts" not in connection.introspection.table_names(cursor):
+            return
+    for statement in statements:
+        schema_editor.execute(statement, params=None)
+
+
+def replace_update_trigger(apps, schema_editor):
+    run(schema_editor, SQLITE_FORWARD)
+
+
+def restore_update_trigger(apps, schema_editor):
+    run(schema_editor, SQLITE_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ToDo", "0006_task_tombstone"),
+    ]
+
+    operations = [
+        migrations.RunPython(replace_update_trigger, restore_update_trigger),
+    ]
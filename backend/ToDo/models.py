@@ -1,9 +1,90 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.lookups import BuiltinLookup, Exact
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from .cache import tasks_changed
 
 User = get_user_model()
 
 
+class IndexableBooleanExact(Exact):
+    """
+    `exact` lookup that always compares with `=`.
+
+    Django renders `bool_field=False` as `WHERE NOT bool_field`, which
+    SQLite cannot use as an index constraint.
+    """
+
+    def as_sql(self, compiler, connection):
+        return BuiltinLookup.as_sql(self, compiler, connection)
+
+
+class TaskQuerySet(models.QuerySet):
+    update_batch_size = 10000
+
+    def for_user(self, user):
+        """
+        Return the tasks owned by `user`.
+
+        Ownership is a condition on the `user_id` column, so it is
+        checked in the same query and never loads the related users.
+        """
+        return self.filter(user_id=user.pk)
+
+    def overdue(self):
+        return self.filter(due_date__lt=timezone.now())
+
+    def delete(self):
+        """
+        Delete the tasks, record their tombstones with one INSERT and mark
+        the tasks of each of their users as changed once.
+        """
+        with transaction.atomic(using=self.db):
+            rows = list(self.order_by().values_list("pk", "user_id"))
+            TaskTombstone.objects.using(self.db).bulk_create(
+                TaskTombstone(user_id=user_id, task_id=pk)
+                for pk, user_id in rows
+            )
+            deleted = super().delete()
+            for user_id in {user_id for pk, user_id in rows}:
+                tasks_changed(user_id)
+            return deleted
+
+    def set_completed(self, completed: bool) -> list:
+        """
+        Set `completed` on the tasks of the queryset and return the ids of
+        those whose status changed.
+
+        The changed tasks are selected and locked, then updated by id with
+        a single UPDATE (one per `update_batch_size` tasks), touching just
+        `completed` and `updated_at`. Like `update()`, this sends no model
+        signals.
+        """
+        with transaction.atomic(using=self.db):
+            # Updating exactly the locked rows keeps the returned ids and
+            # the cache in line with what was written, even if other rows
+            # start to match the filter in the meantime.
+            rows = list(
+                self.filter(completed=not completed)
+                .select_for_update()
+                .order_by()
+                .values_list("pk", "user_id")
+            )
+            ids = [pk for pk, user_id in rows]
+            tasks = self.model._base_manager.using(self.db)
+            now = timezone.now()
+            # Bounded batches keep the IN list under the database's limit
+            # on query parameters.
+            for start in range(0, len(ids), self.update_batch_size):
+                end = start + self.update_batch_size
+                tasks.filter(pk__in=ids[start:end]).update(
+                    completed=completed, updated_at=now
+                )
+            for user_id in {user_id for pk, user_id in rows}:
+                tasks_changed(user_id)
+        return ids
+
+
 class Task(models.Model):
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="tasks"
@@ -15,6 +96,8 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskQuerySet.as_manager()
+
     def __str__(self):
         return self.title
 
@@ -22,3 +105,78 @@ class Task(models.Model):
         ordering = ["completed", "-due_date", "-created_at"]
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
+        indexes = [
+            # Serves the default list: user filter (+ completed filter)
+            # followed by Meta.ordering, without a separate sort step.
+            models.Index(
+                fields=["user", "completed", "-due_date", "-created_at"],
+                name="task_user_ordering_idx",
+            ),
+            # Serves the API's `?ordering=due_date` / `?ordering=-due_date`.
+            models.Index(
+                fields=["user", "due_date"], name="task_user_due_date_idx"
+            ),
+            # Serves the change feed, which walks `(updated_at, id)`.
+            models.Index(
+                fields=["user", "updated_at", "id"],
+                name="task_user_updated_at_idx",
+            ),
+        ]
+
+
+Task._meta.get_field("completed").register_lookup(IndexableBooleanExact)
+
+
+class TaskTombstone(models.Model):
+    """
+    Record of a deleted task, so that the change feed can report it.
+
+    Tombstones older than `TASK_TOMBSTONE_RETENTION` are purged by the
+    `purge_task_tombstones` command.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="task_tombstones"
+    )
+    task_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Task {self.task_id}"
+
+    class Meta:
+        verbose_name = "Task tombstone"
+        verbose_name_plural = "Task tombstones"
+        indexes = [
+            models.Index(
+                fields=["user", "deleted_at", "id"],
+                name="tombstone_user_deleted_idx",
+            ),
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_idx"),
+        ]
+
+
+class TaskSearchIndex(models.Model):
+    """
+    Read-only mapping of the SQLite FTS5 table indexing the tasks.
+
+    The table only exists on SQLite, where it is created and kept up to
+    date by `ToDo.search.SQLiteFTS5SearchBackend`. `document` is FTS5's
+    hidden column named after the table, which is what MATCH compares
+    against, and `rank` is the bm25 score of the current match (lower is
+    better).
+    """
+
+    task = models.OneToOneField(
+        Task,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        related_name="search_index",
+    )
+    document = models.TextField(db_column="ToDo_task_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "ToDo_task_fts"
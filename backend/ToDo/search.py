@@ -0,0 +1,284 @@
+from django.conf import settings
+from django.db import connections
+from django.db.models import BooleanField, F, FloatField, Lookup, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from .models import Task, TaskSearchIndex
+
+
+class FullTextMatch(Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+TaskSearchIndex._meta.get_field("document").register_lookup(FullTextMatch)
+
+
+class SearchBackend:
+    """
+    Base class for task search backends.
+
+    `search()` filters a Task queryset down to the tasks matching every
+    term. Ranked backends also annotate each task with `search_rank`,
+    where a higher value is a better match.
+    """
+
+    vendor = None
+    ranked = False
+
+    def __init__(self, using="default"):
+        self.using = using
+        self.connection = connections[using]
+
+    def is_available(self) -> bool:
+        return self.vendor is None or self.connection.vendor == self.vendor
+
+    def search(self, queryset, terms):
+        raise NotImplementedError
+
+    def install(self):
+        """
+        Create the database objects the backend needs, if any.
+        """
+
+    def uninstall(self):
+        """
+        Drop the database objects created by `install()`.
+        """
+
+    def rebuild(self):
+        """
+        Rebuild the index from the current content of the task table.
+        """
+
+    def repair(self) -> bool:
+        """
+        Recreate the database objects lost since `install()`, if any, and
+        return whether anything was repaired.
+        """
+        return False
+
+    def quote(self, name):
+        return self.connection.ops.quote_name(name)
+
+
+class LikeSearchBackend(SearchBackend):
+    """
+    Fallback backend doing `icontains` lookups, like DRF's SearchFilter.
+    """
+
+    def search(self, queryset, terms):
+        for term in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset
+
+
+class SQLiteFTS5SearchBackend(SearchBackend):
+    """
+    Search backed by an SQLite FTS5 external content table.
+
+    The index is kept up to date by triggers on the task table, so every
+    write path (including bulk and raw updates) updates it incrementally,
+    and only when the title or description changes. Searches join the
+    table through `TaskSearchIndex`, match terms as word prefixes and rank
+    results with bm25.
+
+    SQLite drops the triggers when Django rebuilds the task table during
+    a migration. They are recreated, and the index rebuilt, after every
+    `migrate` (see `ToDo.signals`) and by `rebuild_task_search_index`.
+    """
+
+    vendor = "sqlite"
+    ranked = True
+    table = TaskSearchIndex._meta.db_table
+    trigger_suffixes = ("_ai", "_ad", "_au")
+
+    def is_available(self) -> bool:
+        if not super().is_available():
+            return False
+        with self.connection.cursor() as cursor:
+            return self.table in self.connection.introspection.table_names(
+                cursor
+            )
+
+    def get_match_expression(self, terms):
+        return " ".join(
+            '"{}"*'.format(term.replace('"', '""')) for term in terms
+        )
+
+    def search(self, queryset, terms):
+        return queryset.filter(
+            search_index__document__match=self.get_match_expression(terms)
+        ).annotate(search_rank=F("search_index__rank") * -1)
+
+    def install(self):
+        table = self.quote(self.table)
+        task_table = self.quote(Task._meta.db_table)
+        insert = (
+            f"INSERT INTO {table}(rowid, title, description) "
+            "VALUES (new.id, new.title, new.description);"
+        )
+        delete = (
+            f"INSERT INTO {table}({table}, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description);"
+        )
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+            f"title, description, content={task_table}, content_rowid=id, "
+            "tokenize='unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER IF NOT EXISTS {self.quote(self.table + '_ai')} "
+            f"AFTER INSERT ON {task_table} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.quote(self.table + '_ad')} "
+            f"AFTER DELETE ON {task_table} BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.quote(self.table + '_au')} "
+            f"AFTER UPDATE OF title, description ON {task_table} "
+            "WHEN old.title IS NOT new.title "
+            "OR old.description IS NOT new.description "
+            f"BEGIN {delete} {insert} END",
+        ]
+        with self.connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+        self.rebuild()
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            for suffix in self.trigger_suffixes:
+                cursor.execute(
+                    f"DROP TRIGGER IF EXISTS {self.quote(self.table + suffix)}"
+                )
+            cursor.execute(f"DROP TABLE IF EXISTS {self.quote(self.table)}")
+
+    def rebuild(self):
+        table = self.quote(self.table)
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+    def repair(self):
+        if not self.is_available():
+            return False
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND tbl_name = %s",
+                [Task._meta.db_table],
+            )
+            triggers = {name for (name,) in cursor.fetchall()}
+        if all(self.table + s in triggers for s in self.trigger_suffixes):
+            return False
+        # Writes since the triggers were dropped are missing from the
+        # index, so it is rebuilt as well.
+        self.install()
+        return True
+
+
+class PostgresFullTextSearchBackend(SearchBackend):
+    """
+    Search backed by a `tsvector` expression with a GIN index.
+
+    The index is on the expression itself, so Postgres maintains it on
+    every write without an extra column. Results are ranked with ts_rank.
+    """
+
+    vendor = "postgresql"
+    ranked = True
+    config = "english"
+    index = "task_search_idx"
+
+    def get_vector_sql(self):
+        return (
+            f"to_tsvector('{self.config}', "
+            "coalesce(title, '') || ' ' || coalesce(description, ''))"
+        )
+
+    def search(self, queryset, terms):
+        vector = self.get_vector_sql()
+        query = f"websearch_to_tsquery('{self.config}', %s)"
+        text = " ".join(terms)
+        return queryset.filter(
+            RawSQL(f"{vector} @@ {query}", [text], output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(
+                f"ts_rank({vector}, {query})",
+                [text],
+                output_field=FloatField(),
+            )
+        )
+
+    def install(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.quote(self.index)} "
+                f"ON {self.quote(Task._meta.db_table)} "
+                f"USING GIN (({self.get_vector_sql()}))"
+            )
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP INDEX IF EXISTS {self.quote(self.index)}")
+
+
+SEARCH_BACKENDS = [
+    SQLiteFTS5SearchBackend,
+    PostgresFullTextSearchBackend,
+]
+
+_backends = {}
+
+
+def get_search_backend(using="default") -> SearchBackend:
+    """
+    Return the search backend for the given database alias.
+
+    `TASK_SEARCH_BACKEND` may be set to the dotted path of a backend
+    class. Otherwise the full-text backend matching the database engine
+    is used, falling back to `LikeSearchBackend` when it is not installed.
+    """
+    if using not in _backends:
+        path = getattr(settings, "TASK_SEARCH_BACKEND", None)
+        if path:
+            backend = import_string(path)(using)
+        else:
+            backend = LikeSearchBackend(using)
+            for backend_class in SEARCH_BACKENDS:
+                candidate = backend_class(using)
+                if candidate.is_available():
+                    backend = candidate
+                    break
+        _backends[using] = backend
+    return _backends[using]
+
+
+def install_search_backends(using="default"):
+    """
+    Install the full-text backend matching the database engine.
+    """
+    _backends.pop(using, None)
+    for backend_class in SEARCH_BACKENDS:
+        backend = backend_class(using)
+        if backend.connection.vendor == backend.vendor:
+            backend.install()
+
+
+def repair_search_backends(using="default"):
+    """
+    Repair the full-text backend matching the database engine.
+    """
+    for backend_class in SEARCH_BACKENDS:
+        backend = backend_class(using)
+        if backend.connection.vendor == backend.vendor:
+            backend.repair()
+
+
+def uninstall_search_backends(using="default"):
+    _backends.pop(using, None)
+    for backend_class in SEARCH_BACKENDS:
+        backend = backend_class(using)
+        if backend.connection.vendor == backend.vendor:
+            backend.uninstall()
@@ -0,0 +1,225 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+from Account.models import User
+from .models import Task
+from .search import (
+    get_search_backend,
+    install_search_backends,
+    uninstall_search_backends,
+)
+
+WORDS = (
+    "buy milk call plan review write report meeting project deadline email "
+    "budget design test deploy fix update clean book order send invoice "
+    "client draft slides team lunch doctor gym groceries rent car repair "
+    "garden read notes backup server release sprint retro hire interview "
+    "travel flight hotel ticket birthday gift dentist taxes insurance bank"
+).split()
+
+
+def chunked(iterable, size):
+    """
+    Yield lists of at most `size` items without materializing `iterable`.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class TaskSeeder:
+    """
+    Deterministic generator of users and tasks for capacity testing.
+
+    Every block of `block_size` tasks of a user is drawn from its own
+    random generator, seeded with the seed, the user's index and the
+    block's position, so the same seed produces the same dataset whatever
+    the batch size or the number of worker processes. Due dates are
+    relative to `now`, the start of the current day by default.
+
+    Rows are generated lazily and inserted with `bulk_create` in chunks
+    of `batch_size`. All users share one password, hashed once.
+    """
+
+    email_format = "seed-{seed}-{index}@example.com"
+    block_size = 1000
+    # Due dates: share without one, then a triangular distribution in
+    # days around `now` (low, high, mode).
+    no_due_date_ratio = 0.2
+    due_days = (-60, 120, 3)
+    # Probability of being completed for overdue, upcoming and undated
+    # tasks.
+    completed_ratios = (0.8, 0.1, 0.3)
+    # Descriptions: share without one, then a log-normal number of words.
+    no_description_ratio = 0.3
+    description_words = (2.5, 1.0)
+    max_description_words = 300
+
+    def __init__(
+        self,
+        seed=0,
+        password="fake@123456",
+        now=None,
+        batch_size=5000,
+        using=DEFAULT_DB_ALIAS,
+    ):
+        self.seed = seed
+        self.password = make_password(password)
+        if now is None:
+            now = timezone.now().replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+        self.now = now
+        self.batch_size = batch_size
+        self.using = using
+
+    def get_email(self, index):
+        return self.email_format.format(seed=self.seed, index=index)
+
+    def iter_users(self, count):
+        for index in range(count):
+            yield User(
+                email=self.get_email(index),
+                password=self.password,
+                is_verified=True,
+            )
+
+    def create_users(self, count) -> list:
+        """
+        Create `count` users and return their `(index, pk)` pairs.
+        """
+        users = []
+        for chunk in chunked(self.iter_users(count), self.batch_size):
+            created = User.objects.using(self.using).bulk_create(chunk)
+            users.extend(user.pk for user in created)
+        return list(enumerate(users))
+
+    def get_random(self, index, start):
+        return random.Random(f"{self.seed}:{index}:{start}")
+
+    def iter_tasks(self, index, user_id, start, count):
+        """
+        Generate tasks `start` to `start + count` of the user at `index`.
+        """
+        rng = self.get_random(index, start)
+        for _ in range(count):
+            yield self.make_task(rng, user_id)
+
+    def make_task(self, rng, user_id):
+        overdue, upcoming, undated = self.completed_ratios
+        if rng.random() < self.no_due_date_ratio:
+            due_date = None
+            completed = rng.random() < undated
+        else:
+            minutes = int(rng.triangular(*self.due_days) * 24 * 60)
+            due_date = self.now + timedelta(minutes=minutes)
+            completed = rng.random() < (overdue if minutes < 0 else upcoming)
+
+        description = None
+        if rng.random() >= self.no_description_ratio:
+            length = int(rng.lognormvariate(*self.description_words)) + 1
+            length = min(length, self.max_description_words)
+            description = " ".join(rng.choices(WORDS, k=length))
+
+        title = " ".join(rng.choices(WORDS, k=rng.randint(2, 8)))
+        return Task(
+            user_id=user_id,
+            title=title.capitalize(),
+            description=description,
+            due_date=due_date,
+            completed=completed,
+        )
+
+    def get_blocks(self, users, tasks_per_user):
+        for index, user_id in users:
+            for start in range(0, tasks_per_user, self.block_size):
+                count = min(self.block_size, tasks_per_user - start)
+                yield index, user_id, start, count
+
+    def get_jobs(self, users, tasks_per_user):
+        """
+        Group the blocks of tasks into jobs of about `batch_size` tasks.
+        """
+        job, size = [], 0
+        for block in self.get_blocks(users, tasks_per_user):
+            job.append(block)
+            size += block[3]
+            if size >= self.batch_size:
+                yield job
+                job, size = [], 0
+        if job:
+            yield job
+
+    def iter_job(self, job):
+        for block in job:
+            yield from self.iter_tasks(*block)
+
+    def build_job(self, job) -> list:
+        return list(self.iter_job(job))
+
+    def insert_job(self, job) -> int:
+        return self.insert(self.iter_job(job))
+
+    def insert(self, tasks) -> int:
+        count = 0
+        for chunk in chunked(tasks, self.batch_size):
+            Task.objects.using(self.using).bulk_create(chunk)
+            count += len(chunk)
+        return count
+
+    def create_tasks(self, users, tasks_per_user, workers=1) -> int:
+        """
+        Create `tasks_per_user` tasks for each `(index, pk)` pair of
+        `users` and return how many were created.
+
+        With more than one worker, a process pool generates the tasks and
+        inserts them, each process with its own database connection. As
+        SQLite has a single writer, the tasks generated by the pool are
+        inserted by this process there. This cannot be used inside a
+        transaction.
+        """
+        jobs = self.get_jobs(users, tasks_per_user)
+        if workers <= 1:
+            return self.insert(
+                task for job in jobs for task in self.iter_job(job)
+            )
+
+        # Forked workers must not share the parent's connections.
+        connections.close_all()
+        with ProcessPoolExecutor(workers, initializer=django.setup) as pool:
+            if connections[self.using].vendor != "sqlite":
+                return sum(pool.map(self.insert_job, jobs))
+
+            count = 0
+            # A few jobs at a time, so that generated tasks do not pile up
+            # in memory faster than they are inserted.
+            for window in chunked(jobs, workers * 2):
+                for tasks in pool.map(self.build_job, window):
+                    count += self.insert(tasks)
+            return count
+
+    def populate(self, users, tasks_per_user, workers=1, defer_index=True):
+        """
+        Create `users` users with `tasks_per_user` tasks each and return
+        their `(index, pk)` pairs.
+
+        With `defer_index`, the full-text search index is dropped during
+        the inserts and built once at the end, which is much faster than
+        maintaining it row by row.
+        """
+        created = self.create_users(users)
+        defer_index = defer_index and get_search_backend(self.using).ranked
+        if defer_index:
+            uninstall_search_backends(self.using)
+        try:
+            self.create_tasks(created, tasks_per_user, workers)
+        finally:
+            if defer_index:
+                install_search_backends(self.using)
+        return created
@@ -0,0 +1,32 @@
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from .cache import tasks_changed
+from .models import Task, TaskTombstone
+from .search import repair_search_backends
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, **kwargs):
+    tasks_changed(instance.user_id)
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    # Queryset deletes record their tombstones in bulk and mark the tasks
+    # as changed once per user, see TaskQuerySet.delete(). Tasks deleted
+    # along with their user need neither, and the user row a tombstone
+    # would reference is already gone.
+    if isinstance(origin, Task):
+        TaskTombstone.objects.create(
+            user_id=instance.user_id, task_id=instance.pk
+        )
+        tasks_changed(instance.user_id)
+
+
+@receiver(post_migrate)
+def repair_search_index(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    # Migrations that rebuild the task table drop the SQLite triggers
+    # maintaining the full-text index.
+    if sender.label == "ToDo":
+        repair_search_backends(using)
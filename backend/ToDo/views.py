@@ -1,23 +1,33 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Page
 from django.shortcuts import render
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.views import View
-from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.exceptions import ValidationError, PermissionDenied
+from django.core.exceptions import ValidationError
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from .cache import record_list_cache_access, task_list_cache_key
 from .models import Task
 from .forms import TaskForm
 from Account.mixins import VerifiedUserRequiredMixin
+from ToDoApp.db import read_from_replica
 
 
-class TaskListView(LoginRequiredMixin, VerifiedUserRequiredMixin, ListView):
+class TaskListView(VerifiedUserRequiredMixin, ListView):
     model = Task
     template_name = "ToDo/task_list.html"
     context_object_name = "tasks"
     paginate_by = 5
 
+    def get(self, request, *args, **kwargs):
+        # Rendered here, since the template iterates over the page's
+        # queryset.
+        with read_from_replica(request.user.pk):
+            return super().get(request, *args, **kwargs).render()
+
     def get_queryset(self):
-        queryset = super().get_queryset().filter(user=self.request.user)
+        queryset = super().get_queryset().for_user(self.request.user)
         status = self.request.GET.get("status", "")
         if status == "completed":
             queryset = queryset.filter(completed=True)
@@ -25,6 +35,36 @@ class TaskListView(LoginRequiredMixin, VerifiedUserRequiredMixin, ListView):
             queryset = queryset.filter(completed=False)
         return queryset
 
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Paginate from the per-user list cache when possible.
+
+        The cache holds the page number, the total count and the tasks of
+        the page, from which the page is rebuilt without any query.
+        """
+        key = task_list_cache_key(
+            self.request.user.pk, "html", self.request.GET
+        )
+        cached = cache.get(key)
+        record_list_cache_access(hit=cached is not None)
+        if cached is None:
+            result = super().paginate_queryset(queryset, page_size)
+            paginator, page, object_list, is_paginated = result
+            cached = (page.number, paginator.count, list(object_list))
+            cache.set(key, cached, settings.TASK_LIST_CACHE_TIMEOUT)
+            return result
+
+        number, count, object_list = cached
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        paginator.count = count
+        page = Page(object_list, number, paginator)
+        return paginator, page, object_list, page.has_other_pages()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         status = self.request.GET.get("status", "")
@@ -32,10 +72,10 @@ class TaskListView(LoginRequiredMixin, VerifiedUserRequiredMixin, ListView):
         return context
 
 
-class TaskCompleteView(LoginRequiredMixin, VerifiedUserRequiredMixin, View):
+class TaskCompleteView(VerifiedUserRequiredMixin, View):
     def post(self, request, pk: int):
         try:
-            task = Task.objects.get(user=request.user, pk=pk)
+            task = Task.objects.for_user(request.user).get(pk=pk)
         except Task.DoesNotExist:
             return render(request, "404.html")
 
@@ -43,14 +83,14 @@ class TaskCompleteView(LoginRequiredMixin, VerifiedUserRequiredMixin, View):
             raise ValidationError("Task is already completed.")
 
         task.completed = True
-        task.save()
+        task.save(update_fields=["completed", "updated_at"])
         return redirect("ToDo:tasks")
 
 
-class TaskRestoreView(LoginRequiredMixin, VerifiedUserRequiredMixin, View):
+class TaskRestoreView(VerifiedUserRequiredMixin, View):
     def post(self, request, pk: int):
         try:
-            task = Task.objects.get(user=request.user, pk=pk)
+            task = Task.objects.for_user(request.user).get(pk=pk)
         except Task.DoesNotExist:
             return render(request, "404.html")
 
@@ -58,13 +98,11 @@ class TaskRestoreView(LoginRequiredMixin, VerifiedUserRequiredMixin, View):
             raise ValidationError("Task is not completed.")
 
         task.completed = False
-        task.save()
+        task.save(update_fields=["completed", "updated_at"])
         return redirect("ToDo:tasks")
 
 
-class TaskCreateView(
-    LoginRequiredMixin, VerifiedUserRequiredMixin, CreateView
-):
+class TaskCreateView(VerifiedUserRequiredMixin, CreateView):
     model = Task
     form_class = TaskForm
     template_name = "ToDo/task_form.html"
@@ -84,9 +122,7 @@ class TaskCreateView(
         return render(self.request, self.template_name, {"form": form})
 
 
-class TaskUpdateView(
-    LoginRequiredMixin, VerifiedUserRequiredMixin, UpdateView
-):
+class TaskUpdateView(VerifiedUserRequiredMixin, UpdateView):
     model = Task
     form_class = TaskForm
     template_name = "ToDo/task_form.html"
@@ -98,28 +134,16 @@ class TaskUpdateView(
         context["form_button"] = "Update"
         return context
 
-    def get_object(self, queryset=None):
-        obj = super().get_object(queryset)
-        if obj.user != self.request.user:
-            raise PermissionDenied(
-                "You do not have permission to edit this task."
-            )
-        return obj
+    def get_queryset(self):
+        return Task.objects.for_user(self.request.user)
 
     def form_invalid(self, form):
         return render(self.request, self.template_name, {"form": form})
 
 
-class TaskDeleteView(
-    LoginRequiredMixin, VerifiedUserRequiredMixin, DeleteView
-):
+class TaskDeleteView(VerifiedUserRequiredMixin, DeleteView):
     model = Task
     success_url = reverse_lazy("ToDo:tasks")
 
-    def get_object(self, queryset=None):
-        obj = super().get_object(queryset)
-        if obj.user != self.request.user:
-            raise ValidationError(
-                "You do not have permission to delete this task."
-            )
-        return obj
+    def get_queryset(self):
+        return Task.objects.for_user(self.request.user)
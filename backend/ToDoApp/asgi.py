@@ -3,6 +3,14 @@ ASGI config for ToDoApp project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+It is served by uvicorn, see the backend-asgi service of docker-compose.yml:
+
+    uvicorn ToDoApp.asgi:application --lifespan off
+
+Django does not implement the ASGI lifespan protocol. The async task API
+(ToDo.api.v1.async_views) runs on the event loop; the other views are
+synchronous and run in threads.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -12,5 +20,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ToDoApp.settings")
+# Database connections must not be persistent under ASGI, see DATABASES.
+os.environ["SERVER_INTERFACE"] = "asgi"
 
 application = get_asgi_application()
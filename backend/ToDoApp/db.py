@@ -0,0 +1,93 @@
+"""
+Database connection setup shared by every app, see DATABASES in settings.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Apply SQLITE_PRAGMAS to each new SQLite connection.
+
+    journal_mode is stored in the database file, the other pragmas only
+    last as long as the connection.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def _pin_key(user_id) -> str:
+    return f"db:primary:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """
+    Send the user's replica reads to the primary for REPLICA_PIN_TIMEOUT
+    seconds, so that they see their own writes while the replica catches
+    up.
+    """
+    if settings.REPLICA_DATABASE:
+        cache.set(_pin_key(user_id), True, settings.REPLICA_PIN_TIMEOUT)
+
+
+def is_pinned_to_primary(user_id) -> bool:
+    return cache.get(_pin_key(user_id)) is not None
+
+
+@contextmanager
+def read_from_replica(user_id):
+    """
+    Route the reads made inside the block to the replica, unless there is
+    none or the user is pinned to the primary.
+    """
+    if not settings.REPLICA_DATABASE or is_pinned_to_primary(user_id):
+        yield
+        return
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Send reads inside `read_from_replica()` to REPLICA_DATABASE and
+    writes to the primary.
+
+    Reads inside a transaction on the primary stay there, as they may
+    depend on its uncommitted writes. Writes always go to the primary,
+    also for instances loaded from the replica. The replica is filled by
+    replication and is never migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or not settings.REPLICA_DATABASE:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return settings.REPLICA_DATABASE
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == settings.REPLICA_DATABASE:
+            return False
+        return None
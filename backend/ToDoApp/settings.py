@@ -10,9 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -59,6 +62,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "Account.middleware.VerificationGateMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -85,15 +89,145 @@ WSGI_APPLICATION = "ToDoApp.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# SQLite by default. Set DATABASE_ENGINE=postgres to use PostgreSQL,
+# configured by the POSTGRES_* variables; this needs the `psycopg`
+# package. Connections are kept open for DATABASE_CONN_MAX_AGE seconds,
+# or, with DATABASE_POOL_MAX_SIZE set, taken from a pool of up to that
+# many connections per process. `manage.py benchmark_concurrent_writes`
+# measures write throughput with the current configuration.
+#
+# Under ASGI, Django runs every request's synchronous code in a thread of
+# its own, so each request would leave a persistent connection open that
+# is never reused or closed. ToDoApp.asgi sets SERVER_INTERFACE=asgi,
+# which makes connections non-persistent; use DATABASE_POOL_MAX_SIZE to
+# reuse PostgreSQL connections there.
+
+DATABASE_ENGINE = os.environ.get("DATABASE_ENGINE", "sqlite")
+SERVER_INTERFACE = os.environ.get("SERVER_INTERFACE", "wsgi")
+DATABASE_CONN_MAX_AGE = int(
+    os.environ.get(
+        "DATABASE_CONN_MAX_AGE", 0 if SERVER_INTERFACE == "asgi" else 60
+    )
+)
+if SERVER_INTERFACE == "asgi" and DATABASE_CONN_MAX_AGE:
+    raise ImproperlyConfigured(
+        "DATABASE_CONN_MAX_AGE must be 0 under ASGI, where persistent "
+        "connections leak. Use DATABASE_POOL_MAX_SIZE instead."
+    )
+DATABASE_POOL_MAX_SIZE = int(os.environ.get("DATABASE_POOL_MAX_SIZE", 0))
+
+if DATABASE_ENGINE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("POSTGRES_DB", "todoapp"),
+            "USER": os.environ.get("POSTGRES_USER", "todoapp"),
+            "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+            "HOST": os.environ.get("POSTGRES_HOST", "postgres"),
+            "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+            "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {},
+        }
+    }
+    if DATABASE_POOL_MAX_SIZE:
+        # Pooled connections are returned to the pool after each request,
+        # so they cannot also be persistent.
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.environ.get("DATABASE_POOL_MIN_SIZE", 1)),
+            "max_size": DATABASE_POOL_MAX_SIZE,
+        }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                # Take the write lock when a transaction starts. A
+                # deferred transaction that reads first fails with
+                # "database is locked" when another one wrote meanwhile,
+                # without waiting for the busy timeout.
+                "transaction_mode": os.environ.get(
+                    "SQLITE_TRANSACTION_MODE", "IMMEDIATE"
+                ),
+            },
+        }
+    }
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# Read replica. With POSTGRES_REPLICA_HOST (or SQLITE_REPLICA_PATH for
+# SQLite) set, task list and detail reads go to the "replica" database,
+# see ToDoApp.db.ReplicaRouter. After writing to their tasks a user reads
+# from the primary for REPLICA_PIN_TIMEOUT seconds, which has to exceed
+# the replication lag. `manage.py copy_sqlite_replica` refreshes an
+# SQLite replica from the primary.
+
+if DATABASE_ENGINE == "postgres" and os.environ.get("POSTGRES_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ["POSTGRES_REPLICA_HOST"],
+        "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+    }
+elif DATABASE_ENGINE != "postgres" and os.environ.get("SQLITE_REPLICA_PATH"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.environ["SQLITE_REPLICA_PATH"],
     }
+
+REPLICA_DATABASE = "replica" if "replica" in DATABASES else None
+if REPLICA_DATABASE:
+    # Tests read the test database through the replica alias instead of
+    # creating one on the replica.
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+REPLICA_PIN_TIMEOUT = int(os.environ.get("REPLICA_PIN_TIMEOUT", 5))
+DATABASE_ROUTERS = ["ToDoApp.db.ReplicaRouter"]
+
+# Pragmas set on every new SQLite connection, see ToDoApp.db. WAL lets
+# readers and the writer proceed concurrently, and with synchronous=NORMAL
+# commits no longer wait for the disk; a power loss can lose the last
+# transactions but not corrupt the database. Writers wait up to
+# busy_timeout milliseconds for the write lock.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000)),
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory by default. Set REDIS_URL (e.g. redis://redis:6379/0) to
+# share the cache between processes; this needs the `redis` package.
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+
+# Sessions are read from the cache and only fall back to the database.
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
+# How long users and token lookups are cached, in seconds. They are also
+# dropped from the cache on every change, see Account.signals.
+ACCOUNT_USER_CACHE_TIMEOUT = 3600
+
+# How long rendered task lists are cached, in seconds. Entries never go
+# stale before that: any write to a user's tasks changes their key.
+TASK_LIST_CACHE_TIMEOUT = 300
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -112,6 +246,30 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# New passwords are hashed with PASSWORD_HASHER ("pbkdf2" or "scrypt") at
+# the cost configured below. Existing hashes are upgraded on the next
+# successful login. `manage.py benchmark_password_hashing` recommends
+# costs for a target login latency on this host.
+
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "pbkdf2")
+PASSWORD_PBKDF2_ITERATIONS = int(
+    os.environ.get("PASSWORD_PBKDF2_ITERATIONS", 1_000_000)
+)
+PASSWORD_SCRYPT_WORK_FACTOR = int(
+    os.environ.get("PASSWORD_SCRYPT_WORK_FACTOR", 2**14)
+)
+PASSWORD_SCRYPT_PARALLELISM = int(
+    os.environ.get("PASSWORD_SCRYPT_PARALLELISM", 1)
+)
+
+PASSWORD_HASHERS = [
+    "Account.hashers.TunedPBKDF2PasswordHasher",
+    "Account.hashers.TunedScryptPasswordHasher",
+]
+if PASSWORD_HASHER == "scrypt":
+    PASSWORD_HASHERS.reverse()
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -140,6 +298,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # User Manager Settings
 AUTH_USER_MODEL = "Account.User"
+AUTHENTICATION_BACKENDS = ["Account.backends.CachedModelBackend"]
 LOGIN_URL = "Account:login"
 
 # Rest Framework Settings
@@ -149,22 +308,67 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "Account.authentication.CachedTokenAuthentication",
+        "Account.authentication.StatelessJWTAuthentication",
     ],
+    # Reverse proxies in front of the app whose X-Forwarded-For is
+    # trusted. Per-IP throttles use the address they report, so with the
+    # default of none the header is ignored and cannot be spoofed.
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", 0)),
+    # Sliding window rates of the account views, keyed by
+    # "<throttle_scope>.<ip|email|user>", see Account.api.v1.throttles.
+    "DEFAULT_THROTTLE_RATES": {
+        "registration.ip": "20/hour",
+        "login.ip": "60/min",
+        "login.email": "10/min",
+        "change_password.user": "10/hour",
+        "verification_resend.ip": "20/hour",
+        "verification_resend.email": "5/hour",
+        "password_reset.ip": "20/hour",
+        "password_reset.email": "5/hour",
+    },
 }
+# Load tests drive every virtual user from the same address.
+if os.environ.get("DISABLE_AUTH_THROTTLING"):
+    REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] = {}
+
+# Task change feed: how long deleted tasks are remembered. Sync cursors
+# older than this are rejected and the client has to resync from scratch.
+TASK_TOMBSTONE_RETENTION = timedelta(days=30)
+# Window the feed scans again on every sync, covering writes that commit
+# after a later one and clock skew between servers.
+TASK_CHANGE_FEED_OVERLAP = timedelta(minutes=1)
 
 # Simple JWT Settings
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(hours=3),
     "UPDATE_LAST_LOGIN": True,
+    "TOKEN_REFRESH_SERIALIZER": (
+        "Account.api.v1.serializers.CustomTokenRefreshSerializer"
+    ),
 }
 
+# Verification and password reset link tokens, see Account.tokens.
+# "signed" tokens are HMAC-signed, "jwe" tokens are encrypted JWTs. JWE
+# tokens are still accepted while ACCOUNT_TOKEN_ACCEPT_JWE is set.
+ACCOUNT_TOKEN_FORMAT = "signed"
+ACCOUNT_TOKEN_ACCEPT_JWE = True
+ACCOUNT_TOKEN_MAX_AGE = timedelta(hours=1)
+
 # Email Settings
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
-EMAIL_HOST = "smtp4dev"
-EMAIL_PORT = 25
+EMAIL_HOST = os.environ.get("EMAIL_HOST", "smtp4dev")
+EMAIL_PORT = int(os.environ.get("EMAIL_PORT", 25))
+
+# Email outbox, drained by `manage.py send_queued_emails`. Failed
+# deliveries are retried after EMAIL_OUTBOX_RETRY_DELAY, doubling up to
+# EMAIL_OUTBOX_MAX_RETRY_DELAY, and given up after
+# EMAIL_OUTBOX_MAX_ATTEMPTS.
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = timedelta(seconds=30)
+EMAIL_OUTBOX_MAX_RETRY_DELAY = timedelta(hours=1)
+EMAIL_OUTBOX_CLAIM_TIMEOUT = timedelta(minutes=5)
 
 # CAPTCHA
 DRF_RECAPTCHA_SECRET_KEY = "6Lchhk4rAAAAAGm8V82gxvEbEbr7_-mX4YW0Or88"
@@ -0,0 +1,82 @@
+"""
+Production settings for ToDoApp.
+
+Selected with DJANGO_SETTINGS_MODULE=ToDoApp.settings_production, which
+the container entry point sets for SERVER_PROFILE=production, see
+entrypoint.sh. Extends the development settings and reads everything
+specific to a deployment from the environment:
+
+- SECRET_KEY (required).
+- ALLOWED_HOSTS (required): comma separated host names.
+- REDIS_URL (required): the server runs several worker processes, which
+  must share the cache the task and user caches are invalidated in.
+- CSRF_TRUSTED_ORIGINS: comma separated origins, e.g. https://example.com.
+- HTTPS: set to 1 behind a TLS terminating proxy that sets
+  X-Forwarded-Proto. Cookies are then only sent over HTTPS.
+
+Static files are collected into STATIC_ROOT and served by WhiteNoise.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401, F403
+from .settings import BASE_DIR, MIDDLEWARE
+
+
+def get_env(name):
+    value = os.environ.get(name)
+    if not value:
+        raise ImproperlyConfigured(
+            f"The {name} environment variable is required in production."
+        )
+    return value
+
+
+def split_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+DEBUG = False
+
+SECRET_KEY = get_env("SECRET_KEY")
+ALLOWED_HOSTS = split_list(get_env("ALLOWED_HOSTS"))
+CSRF_TRUSTED_ORIGINS = split_list(os.environ.get("CSRF_TRUSTED_ORIGINS", ""))
+
+# The cache settings only use Redis if it is set.
+get_env("REDIS_URL")
+
+if os.environ.get("HTTPS"):
+    SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+    SESSION_COOKIE_SECURE = True
+    CSRF_COOKIE_SECURE = True
+
+# Static files
+STATIC_ROOT = BASE_DIR / "staticfiles"
+MIDDLEWARE = [
+    *MIDDLEWARE[:1],
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    *MIDDLEWARE[1:],
+]
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
+# Errors go to stderr, where the server collects them.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "root": {
+        "handlers": ["console"],
+        "level": os.environ.get("LOG_LEVEL", "WARNING"),
+    },
+}
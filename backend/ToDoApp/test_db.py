@@ -0,0 +1,40 @@
+import pytest
+from django.db import connection, connections
+
+
+@pytest.fixture
+def sqlite_file(tmp_path, django_db_blocker):
+    settings_dict = {
+        **connection.settings_dict,
+        "NAME": str(tmp_path / "db.sqlite3"),
+    }
+    wrapper = type(connections["default"])(settings_dict, alias="sqlite-file")
+    # A connection of its own, outside the test database.
+    with django_db_blocker.unblock():
+        yield wrapper
+        wrapper.close()
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="SQLite connection pragmas"
+)
+class TestSQLitePragmas:
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_new_connections_are_configured(self, sqlite_file):
+        assert self.pragma(sqlite_file, "journal_mode") == "wal"
+        assert self.pragma(sqlite_file, "synchronous") == 1
+        assert self.pragma(sqlite_file, "busy_timeout") == 5000
+
+    def test_pragmas_come_from_settings(self, sqlite_file, settings):
+        settings.SQLITE_PRAGMAS = {
+            "journal_mode": "DELETE",
+            "synchronous": "FULL",
+            "busy_timeout": 100,
+        }
+        assert self.pragma(sqlite_file, "journal_mode") == "delete"
+        assert self.pragma(sqlite_file, "synchronous") == 2
+        assert self.pragma(sqlite_file, "busy_timeout") == 100
@@ -0,0 +1,132 @@
+import runpy
+from pathlib import Path
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+GUNICORN_CONF = Path(__file__).resolve().parent.parent / "gunicorn.conf.py"
+
+
+class TestProductionSettings:
+    @pytest.fixture
+    def env(self, monkeypatch):
+        monkeypatch.setenv("SECRET_KEY", "production-secret")
+        monkeypatch.setenv("ALLOWED_HOSTS", "example.com, api.example.com")
+        monkeypatch.setenv("REDIS_URL", "redis://redis:6379/0")
+        monkeypatch.delenv("HTTPS", raising=False)
+        return monkeypatch
+
+    def test_settings_come_from_environment(self, env):
+        settings = runpy.run_module("ToDoApp.settings_production")
+        assert settings["DEBUG"] is False
+        assert settings["SECRET_KEY"] == "production-secret"
+        assert settings["ALLOWED_HOSTS"] == ["example.com", "api.example.com"]
+        assert settings["MIDDLEWARE"][1] == (
+            "whitenoise.middleware.WhiteNoiseMiddleware"
+        )
+        assert "SESSION_COOKIE_SECURE" not in settings
+
+        env.setenv("HTTPS", "1")
+        settings = runpy.run_module("ToDoApp.settings_production")
+        assert settings["SESSION_COOKIE_SECURE"] is True
+
+    @pytest.mark.parametrize(
+        "name", ["SECRET_KEY", "ALLOWED_HOSTS", "REDIS_URL"]
+    )
+    def test_required_settings(self, env, name):
+        env.setenv(name, "")
+        with pytest.raises(ImproperlyConfigured, match=name):
+            runpy.run_module("ToDoApp.settings_production")
+
+
+class TestDatabaseSettings:
+    @pytest.fixture
+    def env(self, monkeypatch):
+        for name in [
+            "DATABASE_CONN_MAX_AGE",
+            "DATABASE_POOL_MAX_SIZE",
+            "DATABASE_POOL_MIN_SIZE",
+            "SQLITE_PATH",
+            "SQLITE_TRANSACTION_MODE",
+            "SQLITE_REPLICA_PATH",
+            "POSTGRES_REPLICA_HOST",
+            "SERVER_INTERFACE",
+        ]:
+            monkeypatch.delenv(name, raising=False)
+        return monkeypatch
+
+    def test_sqlite_by_default(self, env):
+        env.delenv("DATABASE_ENGINE", raising=False)
+        env.setenv("SQLITE_PATH", "/data/db.sqlite3")
+        settings = runpy.run_module("ToDoApp.settings")
+        database = settings["DATABASES"]["default"]
+        assert database["ENGINE"] == "django.db.backends.sqlite3"
+        assert database["NAME"] == "/data/db.sqlite3"
+        assert database["CONN_MAX_AGE"] == 60
+        assert database["OPTIONS"]["transaction_mode"] == "IMMEDIATE"
+        assert settings["SQLITE_PRAGMAS"]["journal_mode"] == "WAL"
+        assert settings["REPLICA_DATABASE"] is None
+
+    def test_asgi_connections_are_not_persistent(self, env):
+        env.setenv("SERVER_INTERFACE", "asgi")
+        for engine in ["sqlite", "postgres"]:
+            env.setenv("DATABASE_ENGINE", engine)
+            settings = runpy.run_module("ToDoApp.settings")
+            assert settings["DATABASES"]["default"]["CONN_MAX_AGE"] == 0
+
+        env.setenv("DATABASE_CONN_MAX_AGE", "60")
+        with pytest.raises(ImproperlyConfigured, match="ASGI"):
+            runpy.run_module("ToDoApp.settings")
+
+    def test_replica(self, env):
+        env.delenv("DATABASE_ENGINE", raising=False)
+        env.setenv("SQLITE_REPLICA_PATH", "/data/replica.sqlite3")
+        settings = runpy.run_module("ToDoApp.settings")
+        assert settings["REPLICA_DATABASE"] == "replica"
+        replica = settings["DATABASES"]["replica"]
+        assert replica["NAME"] == "/data/replica.sqlite3"
+        assert replica["TEST"] == {"MIRROR": "default"}
+
+        env.setenv("DATABASE_ENGINE", "postgres")
+        env.setenv("POSTGRES_REPLICA_HOST", "replica.example.com")
+        settings = runpy.run_module("ToDoApp.settings")
+        replica = settings["DATABASES"]["replica"]
+        assert replica["HOST"] == "replica.example.com"
+        assert replica["NAME"] == settings["DATABASES"]["default"]["NAME"]
+
+    def test_postgres(self, env):
+        env.setenv("DATABASE_ENGINE", "postgres")
+        env.setenv("POSTGRES_HOST", "db.example.com")
+        settings = runpy.run_module("ToDoApp.settings")
+        database = settings["DATABASES"]["default"]
+        assert database["ENGINE"] == "django.db.backends.postgresql"
+        assert database["HOST"] == "db.example.com"
+        assert database["CONN_MAX_AGE"] == 60
+        assert database["CONN_HEALTH_CHECKS"] is True
+        assert "pool" not in database["OPTIONS"]
+
+        # Pooled connections cannot be persistent.
+        env.setenv("DATABASE_POOL_MAX_SIZE", "10")
+        settings = runpy.run_module("ToDoApp.settings")
+        database = settings["DATABASES"]["default"]
+        assert database["CONN_MAX_AGE"] == 0
+        assert database["OPTIONS"]["pool"] == {"min_size": 1, "max_size": 10}
+
+
+class TestGunicornConfig:
+    def test_workers_are_sized_from_cpus(self, monkeypatch):
+        monkeypatch.delenv("GUNICORN_WORKERS", raising=False)
+        monkeypatch.delenv("GUNICORN_WORKER_CLASS", raising=False)
+        config = runpy.run_path(str(GUNICORN_CONF))
+        cpus = config["get_cpu_count"]()
+        assert config["workers"] == cpus * 2 + 1
+        assert config["max_requests"] > 0
+        assert 0 < config["max_requests_jitter"] < config["max_requests"]
+
+        monkeypatch.setenv(
+            "GUNICORN_WORKER_CLASS", "uvicorn_worker.UvicornWorker"
+        )
+        assert runpy.run_path(str(GUNICORN_CONF))["workers"] == cpus
+
+        monkeypatch.setenv("GUNICORN_WORKERS", "7")
+        assert runpy.run_path(str(GUNICORN_CONF))["workers"] == 7
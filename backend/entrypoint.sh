@@ -0,0 +1,35 @@
+#!/bin/sh
+# Container entry point. A command given to the container (e.g. the
+# worker's `python manage.py send_queued_emails --loop`) is run as is,
+# otherwise the server of SERVER_PROFILE is started:
+#
+# - development (default): runserver with DEBUG and autoreload.
+# - production: gunicorn with ToDoApp.settings_production and
+#   gunicorn.conf.py, serving ToDoApp.wsgi.
+# - production-asgi: the same with uvicorn workers serving ToDoApp.asgi.
+set -e
+
+if [ "$#" -gt 0 ]; then
+    exec "$@"
+fi
+
+case "${SERVER_PROFILE:-development}" in
+    development)
+        exec python manage.py runserver 0.0.0.0:8000
+        ;;
+    production)
+        export DJANGO_SETTINGS_MODULE=ToDoApp.settings_production
+        python manage.py collectstatic --noinput --verbosity 0
+        exec gunicorn ToDoApp.wsgi:application
+        ;;
+    production-asgi)
+        export DJANGO_SETTINGS_MODULE=ToDoApp.settings_production
+        export GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker
+        python manage.py collectstatic --noinput --verbosity 0
+        exec gunicorn ToDoApp.asgi:application
+        ;;
+    *)
+        echo "Unknown SERVER_PROFILE: $SERVER_PROFILE" >&2
+        exit 1
+        ;;
+esac
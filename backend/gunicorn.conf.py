@@ -0,0 +1,61 @@
+"""
+Gunicorn configuration of the production profile, see entrypoint.sh.
+
+Gunicorn reads this file from the working directory. Every setting can
+be overridden from the environment:
+
+- GUNICORN_BIND: address to listen on, "0.0.0.0:8000".
+- GUNICORN_WORKER_CLASS: "sync" for WSGI, or
+  "uvicorn_worker.UvicornWorker" to serve ToDoApp.asgi.
+- GUNICORN_WORKERS: worker processes. By default 2 per CPU plus one for
+  sync workers, whose requests block them while they wait for the
+  database, and one per CPU for async workers.
+- GUNICORN_MAX_REQUESTS, GUNICORN_MAX_REQUESTS_JITTER: requests after
+  which a worker is replaced by a fresh one, bounding the memory it can
+  accumulate. The jitter keeps the workers from restarting together.
+- GUNICORN_TIMEOUT: seconds a worker may take for a request before it is
+  killed and replaced.
+"""
+
+import os
+
+
+def get_cpu_count():
+    # The CPUs this process may run on, which respects container cpusets.
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def get_default_workers(worker_class, cpus):
+    if worker_class == "sync":
+        return cpus * 2 + 1
+    return cpus
+
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+workers = int(
+    os.environ.get(
+        "GUNICORN_WORKERS",
+        get_default_workers(worker_class, get_cpu_count()),
+    )
+)
+
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(
+    os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10)
+)
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = timeout
+keepalive = 5
+
+# Load the application before forking, so that the workers share its
+# memory and a broken deployment fails at startup.
+preload_app = True
+# Worker heartbeats on a tmpfs; /tmp can be slow in containers.
+worker_tmp_dir = "/dev/shm"
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
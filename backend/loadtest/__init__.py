@@ -0,0 +1,38 @@
+"""
+Load-testing harness replaying scripted user journeys over HTTP.
+
+Virtual users sign up through the registration API, confirm the link
+from their verification email, log in with a token or a JWT and then
+list, create, complete and restore tasks, see `loadtest.journeys`.
+Verification emails are received by an in-process SMTP server,
+`loadtest.smtp.SMTPSink`, instead of smtp4dev.
+
+    python manage.py loadtest --url http://127.0.0.1:8000 --users 200 \\
+        --concurrency 20 --send-emails
+
+`--send-emails` sends the outbox from the load test process, which must
+then use the server's database. Otherwise run the server's
+`send_queued_emails` worker with EMAIL_HOST and EMAIL_PORT pointing at
+`--smtp-host` and `--smtp-port`. The account views are throttled per
+client address; start the server under test with
+DISABLE_AUTH_THROTTLING=1.
+
+The report gives throughput, error rate, latency percentiles and a
+latency histogram per endpoint.
+
+`--api async` runs the task steps against the async task API instead of
+the DRF one. To compare the async views under ASGI with the sync views
+under WSGI, load both servers with the same seeded users, e.g.
+
+    python manage.py seed_tasks --users 50 --tasks 1000
+    uvicorn ToDoApp.asgi:application --port 8001 --lifespan off
+    python manage.py loadtest --url http://127.0.0.1:8001 --api async \\
+        --journey seeded --users 50 --concurrency 50
+    python manage.py runserver 8000 --noreload
+    python manage.py loadtest --url http://127.0.0.1:8000 --api sync \\
+        --journey seeded --users 50 --concurrency 50
+
+Server profiles are compared the same way, starting the server with
+`SERVER_PROFILE=production ./entrypoint.sh` (see entrypoint.sh) instead
+of runserver.
+"""
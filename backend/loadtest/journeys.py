@@ -0,0 +1,211 @@
+import http.client
+import json
+import re
+import time
+from urllib.parse import urlsplit
+
+from django.urls import reverse
+
+VERIFICATION_LINK = re.compile(r"/verify/confirm/(?P<token>[^/\"'\s<]+)/")
+TASK_STEPS = ["list_tasks", "create_task", "complete_task", "restore_task"]
+
+# URL names of the task steps in the DRF (sync) and the async task API.
+TASK_URLS = {
+    "sync": {
+        "list": "ToDo:tasks-list",
+        "complete": "ToDo:tasks-tasks-complete",
+        "restore": "ToDo:tasks-tasks-restore",
+    },
+    "async": {
+        "list": "ToDo:async-tasks-list",
+        "complete": "ToDo:async-tasks-complete",
+        "restore": "ToDo:async-tasks-restore",
+    },
+}
+
+# Steps run once before the task steps are repeated.
+JOURNEYS = {
+    # Sign up, follow the emailed verification link and log in.
+    "signup": ["register", "verify", "login"],
+    # Log in as a user created by `manage.py seed_tasks`.
+    "seeded": ["login"],
+}
+
+
+# Methods safe to send again when the connection drops, as the server may
+# have handled the first attempt.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE"}
+
+
+class JourneyError(Exception):
+    pass
+
+
+class Client:
+    """
+    JSON API client of one virtual user, keeping its connection alive.
+
+    Every request is timed and recorded in `stats` under `name`.
+    """
+
+    def __init__(self, base_url, stats, timeout=30):
+        url = urlsplit(base_url)
+        self.connection_class = (
+            http.client.HTTPSConnection
+            if url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.netloc = url.netloc
+        self.stats = stats
+        self.timeout = timeout
+        self.connection = None
+        self.headers = {"Accept": "application/json"}
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def request(self, name, method, path, data=None):
+        headers = dict(self.headers)
+        body = None
+        if data is not None:
+            body = json.dumps(data).encode()
+            headers["Content-Type"] = "application/json"
+
+        start = time.perf_counter()
+        try:
+            response = self.send(method, path, body, headers)
+            content = response.read()
+        except (OSError, http.client.HTTPException) as error:
+            self.stats.record(name, 0, time.perf_counter() - start)
+            self.close()
+            raise JourneyError(f"{name}: {error}") from error
+        self.stats.record(name, response.status, time.perf_counter() - start)
+
+        if not 200 <= response.status < 300:
+            raise JourneyError(f"{name}: {response.status} {content[:200]}")
+        return json.loads(content) if content else None
+
+    def send(self, method, path, body, headers):
+        reused = self.connection is not None
+        if not reused:
+            self.connection = self.connection_class(
+                self.netloc, timeout=self.timeout
+            )
+        try:
+            self.connection.request(method, path, body, headers)
+            return self.connection.getresponse()
+        except (
+            http.client.RemoteDisconnected,
+            BrokenPipeError,
+            ConnectionResetError,
+        ):
+            # The server closed the kept-alive connection, e.g. because
+            # the worker was recycled. Like HTTP clients do, retry once on
+            # a new connection, unless the request may have been handled
+            # already and sending it again would repeat its effect.
+            self.close()
+            if not reused or method not in IDEMPOTENT_METHODS:
+                raise
+            return self.send(method, path, body, headers)
+
+
+class Journey:
+    """
+    Scripted session of one virtual user.
+
+    `steps` are method names run in order, then `TASK_STEPS` (list,
+    create, complete and restore a task) are repeated `iterations`
+    times against the `api` given by `TASK_URLS`. Journeys stop at the
+    first failed request.
+    """
+
+    def __init__(
+        self,
+        client,
+        email,
+        password,
+        steps,
+        iterations=5,
+        auth="token",
+        api="sync",
+        sink=None,
+        email_timeout=30,
+    ):
+        self.client = client
+        self.email = email
+        self.password = password
+        self.steps = [*steps, *TASK_STEPS * iterations]
+        self.auth = auth
+        self.urls = TASK_URLS[api]
+        self.sink = sink
+        self.email_timeout = email_timeout
+        self.task = None
+
+    def run(self):
+        for step in self.steps:
+            getattr(self, step)()
+
+    def request(self, method, url_name, data=None, **kwargs):
+        path = reverse(url_name, kwargs=kwargs or None)
+        return self.client.request(f"{method} {url_name}", method, path, data)
+
+    def register(self):
+        self.request(
+            "POST",
+            "Account:API:token-registeration",
+            {
+                "email": self.email,
+                "password": self.password,
+                "password1": self.password,
+            },
+        )
+
+    def verify(self):
+        start = time.perf_counter()
+        message = self.sink.wait_for(self.email, self.email_timeout)
+        status = 250 if message is not None else 0
+        # Delivery time, from the registration response to the inbox.
+        self.client.stats.record(
+            "SMTP verification email", status, time.perf_counter() - start
+        )
+        if message is None:
+            raise JourneyError(f"No verification email for {self.email}")
+
+        body = message.get_body(("html", "plain")).get_content()
+        match = VERIFICATION_LINK.search(body)
+        if match is None:
+            raise JourneyError("No verification link in the email")
+        self.request(
+            "GET", "Account:API:verification-confirm", token=match["token"]
+        )
+
+    def login(self):
+        credentials = {"email": self.email, "password": self.password}
+        if self.auth == "jwt":
+            data = self.request("POST", "Account:API:jwt-create", credentials)
+            self.client.headers["Authorization"] = f"Bearer {data['access']}"
+        else:
+            data = self.request("POST", "Account:API:token-login", credentials)
+            self.client.headers["Authorization"] = f"Token {data['token']}"
+
+    def list_tasks(self):
+        self.request("GET", self.urls["list"])
+
+    def create_task(self):
+        self.task = self.request(
+            "POST",
+            self.urls["list"],
+            {
+                "title": "Load test task",
+                "description": "Created by the load test.",
+                "due_date": "2030-01-01T12:00",
+            },
+        )
+
+    def complete_task(self):
+        self.request("PATCH", self.urls["complete"], pk=self.task["id"])
+
+    def restore_task(self):
+        self.request("PATCH", self.urls["restore"], pk=self.task["id"])
@@ -0,0 +1,114 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import DatabaseError, connections
+from Account.outbox import send_queued_emails
+from ToDo.seeding import TaskSeeder
+from .journeys import JOURNEYS, Client, Journey, JourneyError
+from .stats import Stats
+
+logger = logging.getLogger(__name__)
+
+
+class LoadTest:
+    """
+    Run `users` journeys against `base_url`, `concurrency` at a time.
+
+    "signup" journeys register new users and need `sink` to receive the
+    verification emails. "seeded" journeys log in as the users created
+    by `manage.py seed_tasks --seed <seed>`, whose password is
+    `password`. `api` selects the task endpoints, see `TASK_URLS`.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        journey="signup",
+        concurrency=10,
+        iterations=5,
+        auth="token",
+        api="sync",
+        sink=None,
+        seed=0,
+        password="load@1234*",
+        timeout=30,
+    ):
+        self.base_url = base_url
+        self.journey = journey
+        self.concurrency = concurrency
+        self.iterations = iterations
+        self.auth = auth
+        self.api = api
+        self.sink = sink
+        self.seed = seed
+        self.password = password
+        self.timeout = timeout
+        self.run_id = uuid.uuid4().hex[:8]
+        self.stats = Stats()
+
+    def get_email(self, index):
+        if self.journey == "seeded":
+            return TaskSeeder.email_format.format(seed=self.seed, index=index)
+        return f"loadtest-{self.run_id}-{index}@example.com"
+
+    def run(self, users) -> Stats:
+        with ThreadPoolExecutor(self.concurrency) as pool:
+            for _ in pool.map(self.run_journey, range(users)):
+                pass
+        self.stats.finish()
+        return self.stats
+
+    def run_journey(self, index):
+        client = Client(self.base_url, self.stats, self.timeout)
+        journey = Journey(
+            client,
+            self.get_email(index),
+            self.password,
+            JOURNEYS[self.journey],
+            iterations=self.iterations,
+            auth=self.auth,
+            api=self.api,
+            sink=self.sink,
+            email_timeout=self.timeout,
+        )
+        try:
+            journey.run()
+        except JourneyError:
+            self.stats.record_journey(completed=False)
+        else:
+            self.stats.record_journey(completed=True)
+        finally:
+            client.close()
+
+
+class OutboxRelay(threading.Thread):
+    """
+    Send the queued emails while a load test runs, for when it shares
+    its database with the server under test and no worker is running.
+    """
+
+    def __init__(self, interval=0.2, batch_size=100):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.batch_size = batch_size
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.is_set():
+                try:
+                    sent, failed = send_queued_emails(self.batch_size)
+                except DatabaseError as error:
+                    # SQLite may be locked by the server under test.
+                    logger.warning("Sending queued emails failed: %s", error)
+                    sent = failed = 0
+                if sent + failed < self.batch_size:
+                    self.stopped.wait(self.interval)
+        finally:
+            connections.close_all()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
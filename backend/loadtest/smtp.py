@@ -0,0 +1,115 @@
+import socketserver
+import threading
+from collections import defaultdict, deque
+from email import message_from_bytes, policy
+from email.utils import parseaddr
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP for Django's SMTP backend: no TLS and no AUTH.
+    """
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 loadtest SMTP sink")
+        recipients = []
+        while line := self.rfile.readline():
+            command, _, argument = line.decode().strip().partition(" ")
+            command = command.upper()
+            if command in ("HELO", "EHLO"):
+                self.reply("250 loadtest")
+            elif command in ("MAIL", "RSET"):
+                recipients = []
+                self.reply("250 OK")
+            elif command == "RCPT":
+                recipients.append(parseaddr(argument.partition(":")[2])[1])
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                self.server.sink.deliver(recipients, self.read_data())
+                recipients = []
+                self.reply("250 OK")
+            elif command == "NOOP":
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+    def read_data(self):
+        lines = []
+        while line := self.rfile.readline():
+            if line == b".\r\n":
+                break
+            # Lines starting with a dot are escaped with another one.
+            lines.append(line[1:] if line.startswith(b"..") else line)
+        return b"".join(lines)
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class SMTPSink:
+    """
+    In-process SMTP server keeping the messages it receives in memory.
+
+    It stands in for smtp4dev during load tests, so that journeys can
+    wait for the emails sent to their user and follow their links.
+    Port 0 picks a free port, see `address`.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.server = SMTPServer((host, port), SMTPHandler)
+        self.server.sink = self
+        self.messages = defaultdict(deque)
+        self.received = 0
+        self.condition = threading.Condition()
+        self.thread = None
+
+    @property
+    def address(self):
+        return self.server.server_address[:2]
+
+    def start(self):
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def deliver(self, recipients, data):
+        message = message_from_bytes(data, policy=policy.default)
+        with self.condition:
+            for recipient in recipients:
+                self.messages[recipient.lower()].append(message)
+            self.received += 1
+            self.condition.notify_all()
+
+    def wait_for(self, recipient, timeout=None):
+        """
+        Return the oldest unread message to `recipient`, waiting up to
+        `timeout` seconds for one, or None.
+        """
+        recipient = recipient.lower()
+        with self.condition:
+            if self.condition.wait_for(
+                lambda: self.messages[recipient], timeout
+            ):
+                return self.messages[recipient].popleft()
+        return None
@@ -0,0 +1,101 @@
+import statistics
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+# Upper bounds of the latency histogram buckets, in milliseconds.
+BUCKETS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf")]
+
+
+class EndpointStats:
+    def __init__(self):
+        self.durations = []
+        self.statuses = Counter()
+        self.errors = 0
+
+    def add(self, status, duration, error):
+        self.durations.append(duration * 1000)
+        self.statuses[status] += 1
+        self.errors += error
+
+    def get_percentiles(self):
+        if len(self.durations) < 2:
+            return self.durations * 99
+        return statistics.quantiles(self.durations, n=100, method="inclusive")
+
+    def get_histogram(self):
+        counts = [0] * len(BUCKETS)
+        for duration in self.durations:
+            counts[bisect_left(BUCKETS, duration)] += 1
+        return list(zip(BUCKETS, counts))
+
+
+class Stats:
+    """
+    Thread-safe collector of the requests made by a load test.
+
+    Requests are grouped by name; any request without a 2xx/3xx status,
+    including connection errors (status 0), counts as an error.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+        self.journeys = Counter()
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, name, status, duration):
+        error = not 200 <= status < 400
+        with self.lock:
+            if name not in self.endpoints:
+                self.endpoints[name] = EndpointStats()
+            self.endpoints[name].add(status, duration, error)
+
+    def record_journey(self, completed):
+        with self.lock:
+            self.journeys["completed" if completed else "failed"] += 1
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def report(self, write):
+        elapsed = self.elapsed
+        requests = sum(len(e.durations) for e in self.endpoints.values())
+        write(
+            f"{requests} requests in {elapsed:.1f} s "
+            f"({requests / elapsed:.1f}/s), "
+            f"{self.journeys['completed']} journeys completed, "
+            f"{self.journeys['failed']} failed"
+        )
+        write(
+            f"{'endpoint':<44} {'reqs':>6} {'req/s':>7} {'errors':>7} "
+            f"{'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+        )
+        for name, endpoint in self.endpoints.items():
+            percentiles = endpoint.get_percentiles()
+            count = len(endpoint.durations)
+            write(
+                f"{name:<44} {count:>6} {count / elapsed:>7.1f} "
+                f"{endpoint.errors / count:>7.1%} "
+                f"{percentiles[49]:>8.1f} {percentiles[89]:>8.1f} "
+                f"{percentiles[98]:>8.1f} {max(endpoint.durations):>8.1f}"
+            )
+        write("Latency histograms (ms)")
+        for name, endpoint in self.endpoints.items():
+            statuses = ", ".join(
+                f"{status or 'failed'}: {count}"
+                for status, count in sorted(endpoint.statuses.items())
+            )
+            write(f"  {name} ({statuses})")
+            histogram = endpoint.get_histogram()
+            most = max(count for bucket, count in histogram)
+            for bucket, count in histogram:
+                if count:
+                    bar = "#" * max(1, round(40 * count / most))
+                    write(f"    <= {bucket:>6} {bar:<40} {count}")
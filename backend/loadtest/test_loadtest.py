@@ -0,0 +1,97 @@
+import http.client
+import smtplib
+
+import pytest
+from django.urls import reverse
+from .journeys import TASK_STEPS, Client, JourneyError
+from .runner import LoadTest, OutboxRelay
+from .smtp import SMTPSink
+from .stats import Stats
+
+
+@pytest.fixture
+def sink(settings):
+    with SMTPSink() as sink:
+        host, port = sink.address
+        settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+        settings.EMAIL_HOST = host
+        settings.EMAIL_PORT = port
+        yield sink
+
+
+class TestSMTPSink:
+    def test_receives_messages(self, sink: SMTPSink):
+        with smtplib.SMTP(*sink.address) as client:
+            client.sendmail(
+                "from@example.com",
+                ["To@example.com"],
+                "Subject: Hello\r\n\r\n.leading dot\r\nbody\r\n",
+            )
+        message = sink.wait_for("to@example.com", timeout=5)
+        assert message["Subject"] == "Hello"
+        assert message.get_content().splitlines() == [".leading dot", "body"]
+        assert sink.wait_for("to@example.com", timeout=0) is None
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLoadTest:
+    @pytest.mark.parametrize("api", ["sync", "async"])
+    def test_signup_journeys(self, live_server, sink: SMTPSink, api):
+        # One journey at a time: the in-memory test database does not
+        # wait for locks held by concurrent writers.
+        load_test = LoadTest(
+            live_server.url, concurrency=1, iterations=1, api=api, sink=sink
+        )
+        relay = OutboxRelay(interval=0.05)
+        relay.start()
+        try:
+            stats = load_test.run(2)
+        finally:
+            relay.stop()
+
+        assert stats.journeys == {"completed": 2}
+        assert sink.received == 2
+        assert len(stats.endpoints) == 4 + len(TASK_STEPS)
+        for endpoint in stats.endpoints.values():
+            assert len(endpoint.durations) == 2
+            assert endpoint.errors == 0
+
+    def test_failed_requests_are_errors(self, live_server):
+        load_test = LoadTest(live_server.url, journey="seeded", seed=-1)
+        stats = load_test.run(1)
+
+        assert stats.journeys == {"failed": 1}
+        [endpoint] = stats.endpoints.values()
+        assert endpoint.statuses == {400: 1}
+        assert endpoint.errors == 1
+
+    def test_closed_connections_are_retried(self, live_server):
+        stats = Stats()
+        client = Client(live_server.url, stats)
+        path = reverse("ToDo:api-root")
+        client.request("api-root", "GET", path)
+        connection = client.connection
+
+        def closed():
+            raise http.client.RemoteDisconnected("closed")
+
+        connection.getresponse = closed
+        client.request("api-root", "GET", path)
+        assert client.connection is not connection
+        assert stats.endpoints["api-root"].statuses == {200: 2}
+
+    def test_closed_connections_are_not_retried_for_posts(self, live_server):
+        stats = Stats()
+        client = Client(live_server.url, stats)
+        path = reverse("ToDo:api-root")
+        client.request("api-root", "GET", path)
+
+        def closed():
+            raise http.client.RemoteDisconnected("closed")
+
+        client.connection.getresponse = closed
+        with pytest.raises(JourneyError):
+            client.request("api-root", "POST", path, {})
+        assert client.connection is None
+        assert stats.endpoints["api-root"].statuses == {200: 1, 0: 1}
+        assert stats.endpoints["api-root"].errors == 1
@@ -0,0 +1,23 @@
+"""
+Performance regression suite.
+
+Every route of the ToDo and Account URLconfs is requested against
+seeded datasets, see `perf.endpoints`. Each request must stay within its
+declared maximum number of queries, the same for every dataset size, and
+its p50 latency and query count are compared with `perf/baseline.json`.
+The p99 latency is only reported: with a few dozen samples it is the
+slowest single request, too noisy to gate on.
+
+The suite is excluded from the default test run:
+
+    pytest -m perf perf/
+
+Environment variables:
+
+- PERF_DATASETS: comma separated tasks per user, "10,1000,100000".
+- PERF_SAMPLES: timed requests per endpoint and dataset, 20.
+- PERF_TOLERANCE: allowed relative latency regression, 0.5.
+- PERF_SLACK_MS: allowed absolute latency regression in ms, 10.
+- PERF_UPDATE_BASELINE: set to 1 to write the results to the baseline
+  instead of comparing with it.
+"""
@@ -0,0 +1,84 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from django.db import transaction
+from django.test import override_settings
+from .datasets import Dataset
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+results_key = pytest.StashKey[dict]()
+
+
+def get_dataset_sizes():
+    sizes = os.environ.get("PERF_DATASETS", "10,1000,100000")
+    return [int(size) for size in sizes.split(",")]
+
+
+def pytest_configure(config):
+    config.stash[results_key] = {}
+
+
+@pytest.fixture(scope="session")
+def perf_settings():
+    # Password reset confirmation checks a reCAPTCHA.
+    with override_settings(
+        DRF_RECAPTCHA_TESTING=True, DRF_RECAPTCHA_TESTING_PASS=True
+    ):
+        yield
+
+
+@pytest.fixture(scope="module", params=get_dataset_sizes(), ids=str)
+def dataset(request, perf_settings, django_db_setup, django_db_blocker):
+    """
+    Seed a dataset once for all the tests using it.
+
+    It is created in a transaction that is rolled back afterwards; every
+    test runs in a savepoint of its own inside it.
+    """
+    with django_db_blocker.unblock():
+        with transaction.atomic():
+            yield Dataset(request.param)
+            transaction.set_rollback(True)
+
+
+@pytest.fixture
+def perf_results(request):
+    return request.config.stash[results_key]
+
+
+@pytest.fixture(scope="session")
+def perf_baseline():
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())
+
+
+def pytest_sessionfinish(session):
+    results = session.config.stash.get(results_key, {})
+    if not results or os.environ.get("PERF_UPDATE_BASELINE") != "1":
+        return
+    baseline = {}
+    if BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text())
+    for size, endpoints in results.items():
+        baseline.setdefault(size, {}).update(endpoints)
+    BASELINE_PATH.write_text(
+        json.dumps(baseline, indent=2, sort_keys=True) + "\n"
+    )
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash.get(results_key, {})
+    if not results:
+        return
+    terminalreporter.section("performance")
+    for size, endpoints in sorted(results.items(), key=lambda i: int(i[0])):
+        terminalreporter.write_line(f"{size} tasks per user")
+        for name, result in endpoints.items():
+            terminalreporter.write_line(
+                f"  {name:<48} {result['queries']:>3} queries "
+                f"p50 {result['p50_ms']:>8.2f} ms "
+                f"p99 {result['p99_ms']:>8.2f} ms"
+            )
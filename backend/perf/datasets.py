@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from Account.models import User
+from ToDo.models import Task
+from ToDo.seeding import TaskSeeder
+
+PASSWORD = "perf@1234*"
+
+
+class Dataset:
+    """
+    Users and tasks the endpoints are measured against.
+
+    `owner` has `size` tasks, `account` is used by the endpoints that
+    change a user (passwords, logout) and `unverified` by the
+    verification endpoints.
+    """
+
+    def __init__(self, size, seed=0):
+        self.size = size
+        self.now = timezone.now()
+        self.seeder = TaskSeeder(seed, password=PASSWORD, now=self.now)
+        self.password = self.seeder.password
+        self.owner = self.create_user("owner", is_verified=True)
+        self.account = self.create_user("account", is_verified=True)
+        self.unverified = self.create_user("unverified")
+        self.token = Token.objects.create(user=self.account)
+        self.create_tasks()
+        self.analyze()
+
+    def create_user(self, role, is_verified=False):
+        user = User(
+            email=f"perf-{role}-{self.size}@example.com",
+            password=self.password,
+            is_verified=is_verified,
+        )
+        user.save()
+        return user
+
+    def create_tasks(self):
+        self.seeder.create_tasks([(0, self.owner.pk)], self.size)
+        task_ids = Task.objects.for_user(self.owner).values_list(
+            "pk", flat=True
+        )
+        self.task_ids = list(task_ids.order_by("pk"))
+
+    def analyze(self):
+        """
+        Collect planner statistics, as a maintained database would have.
+
+        Without them SQLite assumes an index equality matches a handful of
+        rows, which makes it join full-text matches per task.
+        """
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+    def reset_account(self):
+        """
+        Restore the password of `account`, which some endpoints change,
+        and the token version that changing it bumps.
+        """
+        User.objects.filter(pk=self.account.pk).update(
+            password=self.password, token_version=self.account.token_version
+        )
+
+    def reset_unverified(self):
+        User.objects.filter(pk=self.unverified.pk).update(is_verified=False)
+
+    def reset_token(self):
+        Token.objects.filter(user=self.account).delete()
+        self.token = Token.objects.create(user=self.account)
+
+    def get_user(self, role):
+        return User.objects.get(pk=getattr(self, role).pk)
+
+    def create_task(self, completed=False):
+        return Task.objects.create(
+            user=self.owner,
+            title="Perf Task",
+            description="Created for a single request.",
+            due_date=self.now + timedelta(days=1),
+            completed=completed,
+        )
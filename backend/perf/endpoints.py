@@ -0,0 +1,456 @@
+from itertools import count
+
+from rest_framework_simplejwt.tokens import RefreshToken
+from Account.tokens import TokenGenerator
+from .datasets import PASSWORD
+
+NEW_PASSWORD = "perf@5678*"
+_unique = count()
+
+
+class Endpoint:
+    """
+    A request measured by the performance suite.
+
+    `kwargs` and `data` are the URL arguments and the request data, or
+    callables building them from the dataset, and `setup` is called with
+    the dataset before every request. None of them are timed. `auth` is
+    how the client authenticates as the dataset's `user`: "session",
+    "jwt", "token" or None.
+
+    `max_queries` is the most queries the request may run. It must not
+    depend on the size of the dataset.
+    """
+
+    def __init__(
+        self,
+        name,
+        method="get",
+        status=200,
+        max_queries=0,
+        auth=None,
+        user="owner",
+        kwargs=None,
+        data=None,
+        query="",
+        format=None,
+        setup=None,
+        label="",
+    ):
+        self.name = name
+        self.method = method
+        self.status = status
+        self.max_queries = max_queries
+        self.auth = auth
+        self.user = user
+        self.kwargs = kwargs
+        self.data = data
+        self.query = query
+        self.format = format
+        self.setup = setup
+        self.label = label
+
+    def __str__(self):
+        label = f" {self.label}" if self.label else ""
+        return f"{self.method.upper()} {self.name}{label}"
+
+    def get_kwargs(self, dataset):
+        return self.kwargs(dataset) if callable(self.kwargs) else self.kwargs
+
+    def get_data(self, dataset):
+        return self.data(dataset) if callable(self.data) else self.data
+
+
+def new_task(dataset):
+    return {"pk": dataset.create_task().pk}
+
+
+def new_completed_task(dataset):
+    return {"pk": dataset.create_task(completed=True).pk}
+
+
+def first_task(dataset):
+    return {"pk": dataset.task_ids[0]}
+
+
+def task_data(dataset):
+    return {
+        "title": "Perf Task",
+        "description": "Written by the performance suite.",
+        "due_date": "2030-01-01T12:00",
+    }
+
+
+def bulk_task_data(dataset):
+    return [task_data(dataset) for _ in range(50)]
+
+
+def bulk_ids(dataset):
+    return {"ids": dataset.task_ids[:100]}
+
+
+def new_email(dataset):
+    return f"perf-new-{next(_unique)}@example.com"
+
+
+def signup_data(dataset):
+    return {
+        "email": new_email(dataset),
+        "password1": PASSWORD,
+        "password2": PASSWORD,
+    }
+
+
+def registration_data(dataset):
+    return {
+        "email": new_email(dataset),
+        "password": PASSWORD,
+        "password1": PASSWORD,
+    }
+
+
+def account_credentials(dataset):
+    return {"email": dataset.account.email, "password": PASSWORD}
+
+
+def reset_password(dataset):
+    dataset.reset_account()
+
+
+def unverify(dataset):
+    dataset.reset_unverified()
+
+
+def verification_token(dataset):
+    token = TokenGenerator.make_token(dataset.unverified, "verification")
+    return {"token": token}
+
+
+def reset_token(dataset):
+    token = TokenGenerator.make_token(dataset.account, "password_reset")
+    return {"token": token}
+
+
+ENDPOINTS = [
+    # ToDo
+    Endpoint("ToDo:tasks", auth="session", max_queries=4),
+    Endpoint(
+        "ToDo:tasks",
+        auth="session",
+        query="page=2",
+        label="page 2",
+        max_queries=4,
+    ),
+    Endpoint(
+        "ToDo:task_complete",
+        "post",
+        302,
+        auth="session",
+        kwargs=new_task,
+        max_queries=4,
+    ),
+    Endpoint(
+        "ToDo:task_restore",
+        "post",
+        302,
+        auth="session",
+        kwargs=new_completed_task,
+        max_queries=4,
+    ),
+    Endpoint("ToDo:task_create", auth="session", max_queries=2),
+    Endpoint(
+        "ToDo:task_create",
+        "post",
+        302,
+        auth="session",
+        data=task_data,
+        max_queries=3,
+    ),
+    Endpoint(
+        "ToDo:task_update", auth="session", kwargs=first_task, max_queries=3
+    ),
+    Endpoint(
+        "ToDo:task_update",
+        "post",
+        302,
+        auth="session",
+        kwargs=first_task,
+        data=task_data,
+        max_queries=4,
+    ),
+    Endpoint(
+        "ToDo:task_delete",
+        "post",
+        302,
+        auth="session",
+        kwargs=new_task,
+        max_queries=5,
+    ),
+    # ToDo API
+    Endpoint("ToDo:api-root"),
+    Endpoint("ToDo:tasks-list", auth="jwt", max_queries=3),
+    Endpoint(
+        "ToDo:tasks-list",
+        auth="jwt",
+        query="search=report&ordering=due_date",
+        label="search",
+        max_queries=3,
+    ),
+    Endpoint(
+        "ToDo:tasks-list",
+        auth="jwt",
+        query="cursor=&page_size=50",
+        label="keyset",
+        max_queries=2,
+    ),
+    Endpoint(
+        "ToDo:tasks-list",
+        "post",
+        201,
+        auth="jwt",
+        data=task_data,
+        format="json",
+        max_queries=2,
+    ),
+    Endpoint(
+        "ToDo:tasks-detail", auth="jwt", kwargs=first_task, max_queries=3
+    ),
+    Endpoint(
+        "ToDo:tasks-detail",
+        "patch",
+        auth="jwt",
+        kwargs=first_task,
+        data={"title": "Patched"},
+        format="json",
+        max_queries=6,
+    ),
+    Endpoint(
+        "ToDo:tasks-detail",
+        "delete",
+        204,
+        auth="jwt",
+        kwargs=new_task,
+        max_queries=4,
+    ),
+    Endpoint(
+        "ToDo:tasks-tasks-complete",
+        "patch",
+        auth="jwt",
+        kwargs=new_task,
+        max_queries=3,
+    ),
+    Endpoint(
+        "ToDo:tasks-tasks-restore",
+        "patch",
+        auth="jwt",
+        kwargs=new_completed_task,
+        max_queries=3,
+    ),
+    Endpoint(
+        "ToDo:tasks-tasks-bulk",
+        "post",
+        201,
+        auth="jwt",
+        data=bulk_task_data,
+        format="json",
+        max_queries=4,
+    ),
+    Endpoint(
+        "ToDo:tasks-tasks-bulk-complete",
+        "patch",
+        auth="jwt",
+        data=bulk_ids,
+        format="json",
+        max_queries=4,
+    ),
+    Endpoint(
+        "ToDo:tasks-tasks-bulk-restore",
+        "patch",
+        auth="jwt",
+        data=bulk_ids,
+        format="json",
+        max_queries=4,
+    ),
+    Endpoint(
+        "ToDo:tasks-tasks-changes",
+        auth="jwt",
+        query="page_size=100",
+        max_queries=4,
+    ),
+    Endpoint("ToDo:async-tasks-list", auth="jwt", max_queries=3),
+    Endpoint(
+        "ToDo:async-tasks-list",
+        "post",
+        201,
+        auth="jwt",
+        data=task_data,
+        format="json",
+        max_queries=2,
+    ),
+    Endpoint(
+        "ToDo:async-tasks-detail", auth="jwt", kwargs=first_task, max_queries=2
+    ),
+    Endpoint(
+        "ToDo:async-tasks-complete",
+        "patch",
+        auth="jwt",
+        kwargs=new_task,
+        max_queries=3,
+    ),
+    Endpoint(
+        "ToDo:async-tasks-restore",
+        "patch",
+        auth="jwt",
+        kwargs=new_completed_task,
+        max_queries=3,
+    ),
+    # Account
+    Endpoint("Account:login"),
+    Endpoint(
+        "Account:login",
+        "post",
+        302,
+        data=account_credentials,
+        max_queries=9,
+    ),
+    Endpoint(
+        "Account:logout",
+        "post",
+        302,
+        auth="session",
+        user="account",
+        max_queries=4,
+    ),
+    Endpoint("Account:signup"),
+    Endpoint("Account:signup", "post", 302, data=signup_data, max_queries=11),
+    Endpoint(
+        "Account:change-password",
+        auth="session",
+        user="account",
+        max_queries=2,
+    ),
+    Endpoint("Account:reset-password"),
+    Endpoint(
+        "Account:reset-password",
+        "post",
+        302,
+        data=lambda dataset: {"email": dataset.account.email},
+        max_queries=7,
+    ),
+    Endpoint("Account:reset-password-done"),
+    Endpoint(
+        "Account:reset-password-confirm", kwargs=reset_token, max_queries=1
+    ),
+    Endpoint("Account:reset-password-complete"),
+    Endpoint(
+        "Account:verification-resend",
+        auth="session",
+        user="unverified",
+        max_queries=3,
+    ),
+    Endpoint(
+        "Account:verification-confirm",
+        kwargs=verification_token,
+        setup=unverify,
+        max_queries=2,
+    ),
+    Endpoint("Account:verification-required"),
+    Endpoint("Account:captcha"),
+    # Account API
+    Endpoint(
+        "Account:API:token-registeration",
+        "post",
+        201,
+        data=registration_data,
+        format="json",
+        max_queries=7,
+    ),
+    Endpoint(
+        "Account:API:token-login",
+        "post",
+        data=account_credentials,
+        format="json",
+        max_queries=2,
+    ),
+    Endpoint(
+        "Account:API:token-logout",
+        "post",
+        204,
+        auth="token",
+        user="account",
+        setup=lambda dataset: dataset.reset_token(),
+        max_queries=3,
+    ),
+    Endpoint(
+        "Account:API:jwt-create",
+        "post",
+        data=account_credentials,
+        format="json",
+        max_queries=2,
+    ),
+    Endpoint(
+        "Account:API:jwt-refresh",
+        "post",
+        data=lambda dataset: {
+            "refresh": str(RefreshToken.for_user(dataset.account))
+        },
+        format="json",
+        max_queries=1,
+    ),
+    Endpoint(
+        "Account:API:jwt-verify",
+        "post",
+        data=lambda dataset: {
+            "token": str(RefreshToken.for_user(dataset.account).access_token)
+        },
+        format="json",
+    ),
+    Endpoint(
+        "Account:API:change-password",
+        "post",
+        auth="jwt",
+        user="account",
+        data={
+            "old_password": PASSWORD,
+            "new_password": NEW_PASSWORD,
+            "new_password1": NEW_PASSWORD,
+        },
+        format="json",
+        setup=reset_password,
+        max_queries=2,
+    ),
+    Endpoint(
+        "Account:API:reset-password",
+        "post",
+        data=lambda dataset: {"email": dataset.account.email},
+        format="json",
+        max_queries=2,
+    ),
+    Endpoint(
+        "Account:API:reset-password-confirm",
+        "post",
+        kwargs=reset_token,
+        data={
+            "new_password": NEW_PASSWORD,
+            "new_password1": NEW_PASSWORD,
+            "captcha": "perf",
+        },
+        format="json",
+        setup=reset_password,
+        max_queries=3,
+    ),
+    Endpoint(
+        "Account:API:verification-resend",
+        "post",
+        data=lambda dataset: {"email": dataset.unverified.email},
+        format="json",
+        setup=unverify,
+        max_queries=2,
+    ),
+    Endpoint(
+        "Account:API:verification-confirm",
+        kwargs=verification_token,
+        setup=unverify,
+        max_queries=2,
+    ),
+]
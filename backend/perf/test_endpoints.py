@@ -0,0 +1,121 @@
+import os
+import statistics
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from Account.api.v1 import urls as account_api_urls
+from Account import urls as account_urls
+from ToDo.api.v1 import urls as todo_api_urls
+from ToDo import urls as todo_urls
+from .endpoints import ENDPOINTS
+
+pytestmark = [pytest.mark.perf, pytest.mark.django_db]
+
+# Percentiles need at least two samples.
+SAMPLES = max(int(os.environ.get("PERF_SAMPLES", 20)), 2)
+TOLERANCE = float(os.environ.get("PERF_TOLERANCE", 0.5))
+SLACK_MS = float(os.environ.get("PERF_SLACK_MS", 10))
+
+
+def get_route_names(patterns, namespace):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            nested = namespace
+            if pattern.namespace:
+                nested = f"{namespace}:{pattern.namespace}"
+            yield from get_route_names(pattern.url_patterns, nested)
+        elif pattern.name:
+            yield f"{namespace}:{pattern.name}"
+
+
+def test_every_route_is_measured():
+    routes = {
+        *get_route_names(todo_urls.urlpatterns, "ToDo"),
+        *get_route_names(todo_api_urls.urlpatterns, "ToDo"),
+        *get_route_names(account_urls.urlpatterns, "Account"),
+        *get_route_names(account_api_urls.urlpatterns, "Account:API"),
+    }
+    measured = {endpoint.name for endpoint in ENDPOINTS}
+    assert routes - measured == set()
+
+
+def get_client(dataset, endpoint):
+    client = APIClient()
+    if endpoint.auth == "session":
+        client.force_login(dataset.get_user(endpoint.user))
+    elif endpoint.auth == "jwt":
+        # Issued for every request, some endpoints revoke the user's JWTs.
+        token = RefreshToken.for_user(dataset.get_user(endpoint.user))
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+    elif endpoint.auth == "token":
+        client.credentials(HTTP_AUTHORIZATION=f"Token {dataset.token.key}")
+    return client
+
+
+def request(dataset, endpoint):
+    """
+    Make one request with empty caches and return its duration and the
+    number of queries it ran.
+    """
+    if endpoint.setup is not None:
+        endpoint.setup(dataset)
+    client = get_client(dataset, endpoint)
+    url = reverse(endpoint.name, kwargs=endpoint.get_kwargs(dataset))
+    if endpoint.query:
+        url = f"{url}?{endpoint.query}"
+    data = endpoint.get_data(dataset)
+    method = getattr(client, endpoint.method)
+    cache.clear()
+
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        response = method(url, data, format=endpoint.format)
+        duration = time.perf_counter() - start
+
+    assert response.status_code == endpoint.status, getattr(
+        response, "data", response.content[:500]
+    )
+    return duration, queries
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS, ids=str)
+def test_endpoint(dataset, endpoint, perf_results, perf_baseline):
+    # The first request warms up imports and templates and is not timed.
+    request(dataset, endpoint)
+    durations = []
+    max_queries = []
+    for _ in range(SAMPLES):
+        duration, queries = request(dataset, endpoint)
+        durations.append(duration * 1000)
+        if len(queries) > len(max_queries):
+            max_queries = queries
+
+    percentiles = statistics.quantiles(durations, n=100, method="inclusive")
+    result = {
+        "queries": len(max_queries),
+        "p50_ms": round(percentiles[49], 2),
+        "p99_ms": round(percentiles[98], 2),
+    }
+    size = str(dataset.size)
+    perf_results.setdefault(size, {})[str(endpoint)] = result
+
+    sql = "\n".join(query["sql"][:200] for query in max_queries)
+    assert len(max_queries) <= endpoint.max_queries, sql
+
+    if os.environ.get("PERF_UPDATE_BASELINE") == "1":
+        return
+    baseline = perf_baseline.get(size, {}).get(str(endpoint))
+    if baseline is None:
+        return
+    assert result["queries"] <= baseline["queries"], sql
+    # p99 is report-only, see the module docstring of `perf`.
+    limit = baseline["p50_ms"] * (1 + TOLERANCE) + SLACK_MS
+    assert (
+        result["p50_ms"] <= limit
+    ), f"p50_ms regressed from {baseline['p50_ms']} to {result['p50_ms']} ms"